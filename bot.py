@@ -10,6 +10,7 @@ from telegram.ext import Application, CommandHandler, ApplicationBuilder
 from configs import config
 from handlers import all_handlers
 from registries import config_registry
+from services.update_scheduler import ChatOrderedUpdateProcessor
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +58,14 @@ class TelegramBot:
 
         await self._shutdown()
 
-        self.tg_app = ApplicationBuilder().token(token_value).build()
+        self.tg_app = (
+            ApplicationBuilder()
+            .token(token_value)
+            .concurrent_updates(
+                ChatOrderedUpdateProcessor(config.bot_update_workers, config.bot_max_pending_updates)
+            )
+            .build()
+        )
         self.tg_app.add_handler(CommandHandler("start", start))
         self.tg_app.add_handlers(all_handlers)
 
@@ -146,7 +154,8 @@ class TelegramBot:
             raise RuntimeError("Telegram application updater is not available")
 
         if not self.tg_app.updater.running:
-            await self.tg_app.updater.start_polling()
+            # chat_member updates are opt-in; they keep cached admin lists current.
+            await self.tg_app.updater.start_polling(allowed_updates=Update.ALL_TYPES)
 
         self._mode = "polling"
         logger.info("Telegram bot configured to use polling mode")
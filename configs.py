@@ -9,6 +9,9 @@ db_config_declare = {
     'enable_on_new_group': False,
     'pixiv_cache_to_telegram': True,
     'super_user': '1285315854',
+    'history_retention_group_days': '0',
+    'history_retention_private_days': '0',
+    'history_archive_enabled': False,
 }
 
 
@@ -22,6 +25,24 @@ class __Config:
         self.db_name = os.getenv('DATABASE_NAME')
         self.db_prefix = os.getenv('DATABASE_PREFIX')
         self.external_url = os.getenv('EXTERNAL_URL')
+        self.job_workers = int(os.getenv('JOB_WORKERS', '2'))
+        self.db_pool_size = int(os.getenv('DATABASE_POOL_SIZE', '10'))
+        self.db_max_overflow = int(os.getenv('DATABASE_MAX_OVERFLOW', '20'))
+        self.db_pool_timeout = float(os.getenv('DATABASE_POOL_TIMEOUT', '30'))
+        self.db_pool_recycle = int(os.getenv('DATABASE_POOL_RECYCLE', '3600'))
+        self.db_pool_pre_ping = os.getenv('DATABASE_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes', 'on')
+        self.db_echo = os.getenv('DATABASE_ECHO', 'false').lower() in ('1', 'true', 'yes', 'on')
+        self.db_slow_query_ms = float(os.getenv('DATABASE_SLOW_QUERY_MS', '500'))
+        self.db_slow_query_sample_rate = float(os.getenv('DATABASE_SLOW_QUERY_SAMPLE_RATE', '1.0'))
+        self.db_replica_host = os.getenv('DATABASE_REPLICA_HOST') or None
+        self.db_replica_port = int(os.getenv('DATABASE_REPLICA_PORT') or self.db_port)
+        self.db_replica_username = os.getenv('DATABASE_REPLICA_USERNAME') or self.db_username
+        self.db_replica_password = os.getenv('DATABASE_REPLICA_PASSWORD') or self.db_password
+        self.db_replica_max_lag = float(os.getenv('DATABASE_REPLICA_MAX_LAG_SECONDS', '30'))
+        self.db_replica_check_interval = float(os.getenv('DATABASE_REPLICA_CHECK_SECONDS', '10'))
+        self.history_search_index_size = int(os.getenv('HISTORY_SEARCH_INDEX_SIZE', '50000'))
+        self.bot_update_workers = int(os.getenv('BOT_UPDATE_WORKERS', '8'))
+        self.bot_max_pending_updates = int(os.getenv('BOT_MAX_PENDING_UPDATES', '1024'))
 
 
 config = __Config()
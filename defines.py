@@ -86,3 +86,13 @@ class GroupChatMode(Enum):
     SEPARATED = "Separated"
     # 所有群成员共享聊天记录
     MIXED = "Mixed"
+
+
+class JobStatus(Enum):
+    """
+    后台任务状态
+    """
+    PENDING = "Pending"
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
@@ -6,7 +6,8 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
 from handlers.callback_handlers.panel_utils import build_callback_data, get_panel_command_message_id
-from registries import active_message_handler_registry, config_registry
+from registries import config_registry
+from services import handler_state
 from services.telegram_cache import telegram_cache_manager
 
 from .panel import refresh_bot_config_panel
@@ -105,7 +106,7 @@ async def handle_cache(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd:
         return
 
     if action == "set_ttl":
-        await active_message_handler_registry.set(
+        await handler_state.set(
             user_id=update.effective_user.id,
             handler_id=f"set_cache_ttl:{update.effective_message.message_id}",
         )
@@ -117,7 +118,7 @@ async def handle_cache(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd:
         return
 
     if action == "set_redis":
-        await active_message_handler_registry.set(
+        await handler_state.set(
             user_id=update.effective_user.id,
             handler_id=f"set_cache_redis:{update.effective_message.message_id}",
         )
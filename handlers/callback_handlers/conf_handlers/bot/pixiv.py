@@ -6,8 +6,8 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
 from handlers.callback_handlers.panel_utils import build_callback_data, get_panel_command_message_id
-from registries import active_message_handler_registry, config_registry
-from services import pixiv
+from registries import config_registry
+from services import handler_state, pixiv
 
 from .panel import refresh_bot_config_panel
 
@@ -110,7 +110,7 @@ async def handle_pixiv(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd:
 
     if action == "add":
         base_handler_id = f"set_pixiv_token:add:{panel_message_id}:0"
-        await active_message_handler_registry.set(
+        await handler_state.set(
             user_id=user.id,
             handler_id=base_handler_id,
         )
@@ -118,7 +118,7 @@ async def handle_pixiv(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd:
         prompt_message = await context.bot.send_message(chat_id=chat.id, text=_PROMPT_ADD)
         prompt_message_id = getattr(prompt_message, "message_id", None)
         if prompt_message_id:
-            await active_message_handler_registry.set(
+            await handler_state.set(
                 user_id=user.id,
                 handler_id=f"{base_handler_id}:{prompt_message_id}",
             )
@@ -142,7 +142,7 @@ async def handle_pixiv(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd:
     if action == "update" and len(cmd) >= 2:
         token_id = cmd[1]
         base_handler_id = f"set_pixiv_token:update:{panel_message_id}:{token_id}"
-        await active_message_handler_registry.set(
+        await handler_state.set(
             user_id=user.id,
             handler_id=base_handler_id,
         )
@@ -150,7 +150,7 @@ async def handle_pixiv(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd:
         prompt_message = await context.bot.send_message(chat_id=chat.id, text=_PROMPT_UPDATE)
         prompt_message_id = getattr(prompt_message, "message_id", None)
         if prompt_message_id:
-            await active_message_handler_registry.set(
+            await handler_state.set(
                 user_id=user.id,
                 handler_id=f"{base_handler_id}:{prompt_message_id}",
             )
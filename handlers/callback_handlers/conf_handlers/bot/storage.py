@@ -7,6 +7,7 @@ from telegram.ext import ContextTypes
 
 from handlers.callback_handlers.panel_utils import build_callback_data, get_panel_command_message_id
 from registries import config_registry
+from services import storage_service
 
 from .panel import refresh_bot_config_panel
 
@@ -14,6 +15,7 @@ _STORAGE_OPTIONS = [
     ("local", "本地存储"),
     ("backblaze", "Backblaze B2"),
     ("webdav", "WebDAV"),
+    ("s3", "S3 兼容存储"),
     ("disabled", "禁用存储"),
 ]
 
@@ -73,6 +75,7 @@ async def handle_storage(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd
             return
 
         await config_registry.update_config("storage_service_use", choice)
+        storage_service.invalidate()
         await query.answer(f"已切换到 {_storage_label(choice)}")
         await refresh_bot_config_panel(
             context,
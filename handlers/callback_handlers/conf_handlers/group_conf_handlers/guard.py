@@ -7,8 +7,7 @@ import logging
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from registries import active_message_handler_registry
-from services import group_guard
+from services import group_guard, handler_state
 
 from .panel import refresh_group_config_panel
 
@@ -220,7 +219,7 @@ async def _request_timeout_input(
     user_id: int,
     group_id: int,
 ) -> None:
-    await active_message_handler_registry.set(
+    await handler_state.set(
         user_id=user_id,
         group_id=group_id,
         handler_id=f"guard_set_timeout:{panel_message_id}",
@@ -244,7 +243,7 @@ async def _request_message_input(
     user_id: int,
     group_id: int,
 ) -> None:
-    await active_message_handler_registry.set(
+    await handler_state.set(
         user_id=user_id,
         group_id=group_id,
         handler_id=f"guard_set_message:{panel_message_id}",
@@ -295,7 +294,7 @@ async def _handle_keyword_actions(
         return
 
     if action == "add":
-        await active_message_handler_registry.set(
+        await handler_state.set(
             user_id=user.id,
             group_id=group_id,
             handler_id=f"guard_add_keyword:{panel_message_id}",
@@ -311,7 +310,7 @@ async def _handle_keyword_actions(
         return
 
     if action == "remove":
-        await active_message_handler_registry.set(
+        await handler_state.set(
             user_id=user.id,
             group_id=group_id,
             handler_id=f"guard_remove_keyword:{panel_message_id}",
@@ -5,7 +5,7 @@ from __future__ import annotations
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from registries import active_message_handler_registry
+from services import handler_state
 
 from .panel import refresh_user_config_panel
 
@@ -26,7 +26,7 @@ async def handle_nick(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd: l
     panel_message_id = update.effective_message.message_id
 
     if action == "edit":
-        await active_message_handler_registry.set(
+        await handler_state.set(
             user_id=user_id,
             handler_id=f"set_user_nickname:{panel_message_id}",
         )
@@ -35,7 +35,7 @@ async def handle_nick(update: Update, context: ContextTypes.DEFAULT_TYPE, cmd: l
         return
 
     if action == "cancel":
-        await active_message_handler_registry.delete(user_id=user_id)
+        await handler_state.delete(user_id=user_id)
         await query.answer("已取消")
         await refresh_user_config_panel(
             context,
@@ -2,7 +2,7 @@
 from telegram.ext import ContextTypes
 
 from handlers.callback_handlers.panel_utils import close_panel
-from registries import active_message_handler_registry
+from services import handler_state
 
 from .chat_toggle import handle_chat_toggle
 from .nick import handle_nick
@@ -40,7 +40,7 @@ async def user_conf_handler_func(update: Update, context: ContextTypes.DEFAULT_T
         action = cmd[1]
         command_message_id = _parse_command_message_id(cmd)
         if action == "refresh":
-            await active_message_handler_registry.delete(user_id=update.effective_user.id)
+            await handler_state.delete(user_id=update.effective_user.id)
             await refresh_user_config_panel(
                 context,
                 chat_id=update.effective_chat.id,
@@ -8,6 +8,7 @@ from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 
 from registries import illust_registry
+from services import telegram_delivery
 from services.image_service import ImageResource, get_image_resource
 from services.original_image_manager import (
     MAX_ATTEMPTS,
@@ -117,11 +118,23 @@ async def _send_original_image(bot, resource: ImageResource, chat_id: int) -> No
             )
             await _clear_cached_original_id(illustration, page_id, resource.file_id)
         else:
+            telegram_delivery.record("document", telegram_delivery.MODE_FILE_ID)
             return
 
-    document_file = BytesIO(await resource.fetcher(resource.filename, resource.link))
-    document_file.name = resource.filename
-    sent_message = await bot.send_document(chat_id=chat_id, document=document_file)
+    sent_message = None
+    public_url = await telegram_delivery.delivery_url(resource.link, kind="document")
+    if public_url is not None:
+        sent_message = await telegram_delivery.send_via_url(
+            lambda url: bot.send_document(chat_id=chat_id, document=url),
+            public_url,
+            kind="document",
+        )
+
+    if sent_message is None:
+        document_file = BytesIO(await resource.fetcher(resource.filename, resource.link))
+        document_file.name = resource.filename
+        sent_message = await bot.send_document(chat_id=chat_id, document=document_file)
+        telegram_delivery.record("document", telegram_delivery.MODE_UPLOAD)
 
     document = sent_message.document
     if document and document.file_id:
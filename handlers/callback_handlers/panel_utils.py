@@ -9,7 +9,7 @@ from telegram import Update
 from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 
-from registries import active_message_handler_registry
+from services import handler_state
 
 logger = logging.getLogger(__name__)
 
@@ -82,7 +82,7 @@ async def close_panel(
     resolved_command_id = _parse_command_id(command_message_id, context, panel_message_id)
 
     if user_id is not None:
-        await active_message_handler_registry.delete(user_id=user_id)
+        await handler_state.delete(user_id=user_id)
 
     if panel_message_id is not None:
         unregister_panel(context, panel_message_id)
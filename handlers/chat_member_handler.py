@@ -0,0 +1,48 @@
+"""Keep cached administrator lists in sync with chat_member updates."""
+
+from __future__ import annotations
+
+import logging
+
+from telegram import ChatMember, ChatMemberUpdated, Update
+from telegram.ext import ChatMemberHandler, ContextTypes
+
+from registries import group_registry
+from services.telegram_cache import apply_admin_change
+from utils import is_group_type
+
+logger = logging.getLogger(__name__)
+
+_ADMIN_STATUSES = {ChatMember.ADMINISTRATOR, ChatMember.OWNER}
+
+
+def _is_admin(member: ChatMember | None) -> bool:
+    return member is not None and member.status in _ADMIN_STATUSES
+
+
+async def handle_chat_member_update(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    change: ChatMemberUpdated | None = update.chat_member or update.my_chat_member
+    if change is None or not is_group_type(change.chat.type):
+        return
+
+    was_admin = _is_admin(change.old_chat_member)
+    is_admin = _is_admin(change.new_chat_member)
+    if was_admin == is_admin:
+        return
+
+    chat_id = change.chat.id
+    user_id = change.new_chat_member.user.id
+    logger.debug(
+        "Chat %s member %s is %s an administrator",
+        chat_id,
+        user_id,
+        "now" if is_admin else "no longer",
+    )
+    await apply_admin_change(chat_id, user_id, is_admin=is_admin)
+    await group_registry.set_group_admin(chat_id, user_id, is_admin)
+
+
+chat_member_handler = ChatMemberHandler(
+    handle_chat_member_update,
+    ChatMemberHandler.ANY_CHAT_MEMBER,
+)
@@ -7,7 +7,7 @@ from telegram.ext import ContextTypes
 from services.permissions import has_super_user_access
 from services import pixiv
 from services.command_history import command_logger
-from services.illustration_importer import import_illustration
+from services.import_jobs import enqueue_pixiv_import
 from handlers.registry import bot_handler
 
 logger = logging.getLogger(__name__)
@@ -22,20 +22,6 @@ def _build_chat_candidates(update: Update) -> list[int]:
     return candidates
 
 
-def _format_page_summary(
-    index: int, *, storage: bool, photo: bool, document: bool, cache_enabled: bool
-) -> str:
-    storage_status = "成功" if storage else "失败"
-    photo_status = "已缓存" if photo else ("缺失" if cache_enabled else "待发送缓存")
-    document_status = "已缓存" if document else ("缺失" if cache_enabled else "待发送缓存")
-    return (
-        f" - 第{index + 1} 页："
-        f"存储{storage_status}；"
-        f"PhotoID{photo_status}；"
-        f"DocumentID{document_status}"
-    )
-
-
 @bot_handler(commands=["addpixiv"])
 @command_logger("addpixiv")
 async def add_pixiv_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -64,37 +50,27 @@ async def add_pixiv_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.effective_message.reply_text("您没有权限使用此命令。")
         return
 
-    status_message = await update.effective_message.reply_text("正在导入插画，请稍候…")
+    status_message = await update.effective_message.reply_text("正在将插画加入导入队列…")
     chat_candidates = _build_chat_candidates(update)
 
     try:
-        result = await import_illustration(
+        job, created = await enqueue_pixiv_import(
             pixiv_id,
-            bot=context.bot,
             telegram_chat_ids=chat_candidates,
+            status_chat_id=status_message.chat_id,
+            status_message_id=status_message.message_id,
         )
-    except Exception as exc:  # pragma: no cover - network interaction
-        logger.exception("Failed to import Pixiv illustration %s", pixiv_id)
+    except Exception as exc:  # pragma: no cover - database interaction
+        logger.exception("Failed to enqueue Pixiv illustration import %s", pixiv_id)
         await status_message.edit_text(f"导入失败：{exc}")
         return
 
-    illustration = result.illustration
-    header = (
-        f"插画 {illustration.title or illustration.id} (Pixiv {illustration.id}) "
-        f"已{'新增' if result.created else '更新'}。"
-    )
-    summary_lines = [header, f"共处理 {len(result.pages)} 张图片。"]
-    if not result.telegram_cache_enabled:
-        summary_lines.append("当前配置为导入阶段不缓存，首次发送时将自动在 Telegram 缓存文件 ID。")
-    for page in result.pages:
-        summary_lines.append(
-            _format_page_summary(
-                page.index,
-                storage=bool(page.storage_url),
-                photo=bool(page.compressed_file_id),
-                document=bool(page.original_file_id),
-                cache_enabled=result.telegram_cache_enabled,
-            )
+    if not created:
+        await status_message.edit_text(
+            f"Pixiv {pixiv_id} 已在导入队列中（任务 #{job.id}），完成后将在原状态消息中更新。"
         )
+        return
 
-    await status_message.edit_text("\n".join(summary_lines))
+    await status_message.edit_text(
+        f"已加入导入队列（任务 #{job.id}），导入完成后将更新此消息。"
+    )
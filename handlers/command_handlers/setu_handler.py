@@ -4,7 +4,7 @@ import logging
 from io import BytesIO
 from typing import Sequence
 
-from telegram import Update
+from telegram import Message, Update
 from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 
@@ -14,7 +14,9 @@ from exps import UserBlockedError, GroupBlockedError
 from utils import is_group_type, ensure_list_length
 
 from registries import user_registry, group_registry, illust_registry
+from services import telegram_delivery
 from services.command_history import command_logger
+from services.file_service import get_cached_path
 from services.image_service import ImageResource, get_image_resource
 from services.storage_service import use as use_storage
 from services.original_image_manager import (
@@ -193,11 +195,50 @@ async def setu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
                 illust.compressed_file_ids = ids
                 await illust_registry.save_illustration(illust)
         else:
+            telegram_delivery.record("photo", telegram_delivery.MODE_FILE_ID)
             if request_state is not None:
                 request_state.message_id = sent_message.id
                 await register_request(context.bot, request_state)
             return
 
+    public_url = await telegram_delivery.delivery_url(resource.link, kind="photo")
+    if public_url is not None:
+        sent_message = await telegram_delivery.send_via_url(
+            lambda url: context.bot.send_photo(photo=url, **send_kwargs),
+            public_url,
+            kind="photo",
+        )
+
+    if sent_message is None:
+        sent_message = await _upload_photo(context, resource, send_kwargs)
+
+    if request_state is not None:
+        request_state.message_id = sent_message.id
+        await register_request(context.bot, request_state)
+
+    photo_sizes = sent_message.photo or []
+    if not photo_sizes:
+        return
+
+    cached_id = photo_sizes[-1].file_id
+    if not cached_id:
+        return
+
+    ids = ensure_list_length(getattr(illust, "compressed_file_ids", None), illust.page_count)
+    if ids[resource.page_id] == cached_id:
+        return
+
+    ids[resource.page_id] = cached_id
+    illust.compressed_file_ids = ids
+    await illust_registry.save_illustration(illust)
+
+
+async def _upload_photo(
+    context: ContextTypes.DEFAULT_TYPE,
+    resource: ImageResource,
+    send_kwargs: dict[str, object],
+) -> Message:
+    illust = resource.illustration
     file_bytes = await resource.fetcher(resource.filename, resource.link)
 
     storage = await use_storage()
@@ -207,11 +248,19 @@ async def setu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if not existing_url:
             storage_folder = storage.join_path("pixiv", str(illust.id))
             try:
-                storage_url = await storage.upload(
-                    file_bytes,
-                    resource.filename,
-                    sub_folder=storage_folder,
-                )
+                cached_path = get_cached_path(resource.filename)
+                if cached_path is not None:
+                    storage_url = await storage.upload_file(
+                        cached_path,
+                        resource.filename,
+                        sub_folder=storage_folder,
+                    )
+                else:
+                    storage_url = await storage.upload(
+                        file_bytes,
+                        resource.filename,
+                        sub_folder=storage_folder,
+                    )
             except Exception as exc:
                 logger.warning("Failed to upload image to storage: %s", exc)
             else:
@@ -225,23 +274,5 @@ async def setu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     image_file = BytesIO(file_bytes)
     image_file.name = resource.filename
     sent_message = await context.bot.send_photo(photo=image_file, **send_kwargs)
-
-    if request_state is not None:
-        request_state.message_id = sent_message.id
-        await register_request(context.bot, request_state)
-
-    photo_sizes = sent_message.photo or []
-    if not photo_sizes:
-        return
-
-    cached_id = photo_sizes[-1].file_id
-    if not cached_id:
-        return
-
-    ids = ensure_list_length(getattr(illust, "compressed_file_ids", None), illust.page_count)
-    if ids[resource.page_id] == cached_id:
-        return
-
-    ids[resource.page_id] = cached_id
-    illust.compressed_file_ids = ids
-    await illust_registry.save_illustration(illust)
+    telegram_delivery.record("photo", telegram_delivery.MODE_UPLOAD)
+    return sent_message
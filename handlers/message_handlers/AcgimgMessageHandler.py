@@ -12,11 +12,18 @@ class AcgimgMessageHandler:
         callback: Callable[[Update, Any], Awaitable[object]],
         no_parallel: bool = True,
         block: bool = False,
+        state_prefix: Optional[str] = None,
+        state_scope: str = "user",
     ):
         self.filters = filters
         self.callback = callback
         self.block = block
         self.no_parallel = no_parallel
+        # Stateful handlers only run while the user's active handler key starts
+        # with ``state_prefix``; the key lives in the global scope ("user") or
+        # is bound to the current chat ("chat").
+        self.state_prefix = state_prefix
+        self.state_scope = state_scope
 
     def check_update(self, update: object) -> Optional[Union[bool, dict[str, list[Any]]]]:
         """Determines whether an update should be passed to this handler's :attr:`callback`.
@@ -11,8 +11,7 @@ from telegram.ext import ContextTypes, filters
 from handlers.callback_handlers.conf_handlers.group_conf_handlers.panel import (
     refresh_group_config_panel,
 )
-from registries import active_message_handler_registry
-from services import group_guard
+from services import group_guard, handler_state
 from handlers.registry import message_handler
 
 logger = logging.getLogger(__name__)
@@ -21,7 +20,7 @@ _HANDLER_PREFIX = "guard_add_keyword"
 _CANCEL_TOKENS = {"-", "取消", "cancel"}
 
 
-@message_handler(filters=filters.TEXT & ~filters.COMMAND)
+@message_handler(filters=filters.TEXT & ~filters.COMMAND, state_prefix=_HANDLER_PREFIX, state_scope="chat")
 async def guard_add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     user = update.effective_user
@@ -30,7 +29,7 @@ async def guard_add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if message is None or user is None or chat is None or not message.text:
         return
 
-    handler_key = await active_message_handler_registry.get(user.id, group_id=chat.id)
+    handler_key = await handler_state.get(user.id, group_id=chat.id)
     if not handler_key or not handler_key.startswith(_HANDLER_PREFIX):
         return
 
@@ -39,7 +38,7 @@ async def guard_add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE)
         panel_message_id = int(metadata)
     except (TypeError, ValueError):
         logger.warning("Guard add keyword metadata missing for user %s", user.id)
-        await active_message_handler_registry.delete(user_id=user.id, group_id=chat.id)
+        await handler_state.delete(user_id=user.id, group_id=chat.id)
         return
 
     submitted = message.text.strip()
@@ -50,7 +49,7 @@ async def guard_add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE)
         logger.debug("Failed to delete guard keyword message for user %s", user.id)
 
     if submitted.lower() in _CANCEL_TOKENS:
-        await active_message_handler_registry.delete(user_id=user.id, group_id=chat.id)
+        await handler_state.delete(user_id=user.id, group_id=chat.id)
         await context.bot.send_message(chat_id=chat.id, text="已取消添加关键字")
         return
 
@@ -85,7 +84,7 @@ async def guard_add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await context.bot.send_message(chat_id=chat.id, text=str(exc))
         return
 
-    await active_message_handler_registry.delete(user_id=user.id, group_id=chat.id)
+    await handler_state.delete(user_id=user.id, group_id=chat.id)
 
     await refresh_group_config_panel(
         context,
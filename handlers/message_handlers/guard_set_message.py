@@ -11,8 +11,7 @@ from telegram.ext import ContextTypes, filters
 from handlers.callback_handlers.conf_handlers.group_conf_handlers.panel import (
     refresh_group_config_panel,
 )
-from registries import active_message_handler_registry
-from services import group_guard
+from services import group_guard, handler_state
 from handlers.registry import message_handler
 
 logger = logging.getLogger(__name__)
@@ -22,7 +21,7 @@ _CANCEL_TOKENS = {"-", "默认", "default", "取消", "cancel"}
 _MAX_LENGTH = 400
 
 
-@message_handler(filters=filters.TEXT & ~filters.COMMAND)
+@message_handler(filters=filters.TEXT & ~filters.COMMAND, state_prefix=_HANDLER_PREFIX, state_scope="chat")
 async def guard_set_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     user = update.effective_user
@@ -31,7 +30,7 @@ async def guard_set_message(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if message is None or user is None or chat is None or not message.text:
         return
 
-    handler_key = await active_message_handler_registry.get(user.id, group_id=chat.id)
+    handler_key = await handler_state.get(user.id, group_id=chat.id)
     if not handler_key or not handler_key.startswith(_HANDLER_PREFIX):
         return
 
@@ -40,7 +39,7 @@ async def guard_set_message(update: Update, context: ContextTypes.DEFAULT_TYPE)
         panel_message_id = int(metadata)
     except (TypeError, ValueError):
         logger.warning("Guard message handler metadata missing for user %s", user.id)
-        await active_message_handler_registry.delete(user_id=user.id, group_id=chat.id)
+        await handler_state.delete(user_id=user.id, group_id=chat.id)
         return
 
     submitted = message.text.strip()
@@ -52,7 +51,7 @@ async def guard_set_message(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     if submitted.lower() in _CANCEL_TOKENS:
         updated = await group_guard.set_verification_message(chat.id, None)
-        await active_message_handler_registry.delete(user_id=user.id, group_id=chat.id)
+        await handler_state.delete(user_id=user.id, group_id=chat.id)
         await refresh_group_config_panel(
             context,
             chat_id=chat.id,
@@ -70,7 +69,7 @@ async def guard_set_message(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
 
     updated = await group_guard.set_verification_message(chat.id, submitted)
-    await active_message_handler_registry.delete(user_id=user.id, group_id=chat.id)
+    await handler_state.delete(user_id=user.id, group_id=chat.id)
 
     await refresh_group_config_panel(
         context,
@@ -10,14 +10,15 @@ from telegram.ext import ContextTypes, filters
 
 from handlers.callback_handlers.conf_handlers.bot.panel import refresh_bot_config_panel
 from handlers.registry import message_handler
-from registries import active_message_handler_registry, config_registry
+from registries import config_registry
+from services import handler_state, storage_service
 
 logger = logging.getLogger(__name__)
 
 _HANDLER_PREFIX = "set_backblaze_appid"
 
 
-@message_handler(filters=filters.TEXT & ~filters.COMMAND)
+@message_handler(filters=filters.TEXT & ~filters.COMMAND, state_prefix=_HANDLER_PREFIX)
 async def set_backblaze_appid(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     user = update.effective_user
@@ -25,7 +26,7 @@ async def set_backblaze_appid(update: Update, context: ContextTypes.DEFAULT_TYPE
     if message is None or user is None or not message.text:
         return
 
-    handler_key = await active_message_handler_registry.get(user.id)
+    handler_key = await handler_state.get(user.id)
     if not handler_key or not handler_key.startswith(_HANDLER_PREFIX):
         return
 
@@ -46,6 +47,7 @@ async def set_backblaze_appid(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     try:
         await config_registry.update_config("backblaze_app_id", submitted)
+        storage_service.invalidate_for_key("backblaze_app_id")
     except Exception:  # noqa: BLE001
         logger.exception("Failed to update Backblaze App ID for user %s", user.id)
         await context.bot.send_message(
@@ -55,7 +57,7 @@ async def set_backblaze_appid(update: Update, context: ContextTypes.DEFAULT_TYPE
     else:
         update_succeeded = True
     finally:
-        await active_message_handler_registry.delete(user_id=user.id)
+        await handler_state.delete(user_id=user.id)
 
     if not update_succeeded:
         return
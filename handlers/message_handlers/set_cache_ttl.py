@@ -9,7 +9,8 @@ from telegram.error import TelegramError
 from telegram.ext import ContextTypes, filters
 
 from handlers.callback_handlers.conf_handlers.bot.panel import refresh_bot_config_panel
-from registries import active_message_handler_registry, config_registry
+from registries import config_registry
+from services import handler_state
 from services.telegram_cache import telegram_cache_manager
 from handlers.registry import message_handler
 
@@ -19,7 +20,7 @@ _HANDLER_PREFIX = "set_cache_ttl"
 _MIN_TTL = 30
 
 
-@message_handler(filters=filters.TEXT & ~filters.COMMAND)
+@message_handler(filters=filters.TEXT & ~filters.COMMAND, state_prefix=_HANDLER_PREFIX)
 async def set_cache_ttl(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     user = update.effective_user
@@ -27,7 +28,7 @@ async def set_cache_ttl(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     if message is None or user is None or not message.text:
         return
 
-    handler_key = await active_message_handler_registry.get(user.id)
+    handler_key = await handler_state.get(user.id)
     if not handler_key or not handler_key.startswith(_HANDLER_PREFIX):
         return
 
@@ -36,7 +37,7 @@ async def set_cache_ttl(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         panel_message_id = int(metadata)
     except (TypeError, ValueError):
         logger.warning("Cache TTL handler metadata missing for user %s", user.id)
-        await active_message_handler_registry.delete(user_id=user.id)
+        await handler_state.delete(user_id=user.id)
         return
 
     submitted = message.text.strip()
@@ -61,7 +62,7 @@ async def set_cache_ttl(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
     await config_registry.set_telegram_cache_ttl(ttl_seconds)
     await telegram_cache_manager.reset()
-    await active_message_handler_registry.delete(user_id=user.id)
+    await handler_state.delete(user_id=user.id)
 
     await refresh_bot_config_panel(
         context,
@@ -7,8 +7,8 @@ import logging
 from telegram import Update
 from telegram.ext import ContextTypes, filters
 
-from registries import active_message_handler_registry, config_registry
-from services import pixiv
+from registries import config_registry
+from services import handler_state, pixiv
 
 from handlers.callback_handlers.conf_handlers.bot.panel import refresh_bot_config_panel
 from handlers.registry import message_handler
@@ -38,7 +38,7 @@ async def _reload_pixiv_state() -> None:
         await pixiv.token_refresh(force=True)
 
 
-@message_handler(filters=filters.TEXT & ~filters.COMMAND)
+@message_handler(filters=filters.TEXT & ~filters.COMMAND, state_prefix=_HANDLER_PREFIX)
 async def set_pixiv_token(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     user = update.effective_user
@@ -46,14 +46,14 @@ async def set_pixiv_token(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if message is None or user is None or not message.text:
         return
 
-    handler_key = await active_message_handler_registry.get(user.id)
+    handler_key = await handler_state.get(user.id)
     if not handler_key or not handler_key.startswith(_HANDLER_PREFIX):
         return
 
     parts = handler_key.split(":")
     if len(parts) < 4:
         logger.warning("Pixiv token handler metadata malformed for user %s: %s", user.id, handler_key)
-        await active_message_handler_registry.delete(user_id=user.id)
+        await handler_state.delete(user_id=user.id)
         return
 
     mode = parts[1]
@@ -65,7 +65,7 @@ async def set_pixiv_token(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         panel_message_id = int(panel_message_id_text)
     except ValueError:
         logger.warning("Invalid panel message id '%s' for user %s", panel_message_id_text, user.id)
-        await active_message_handler_registry.delete(user_id=user.id)
+        await handler_state.delete(user_id=user.id)
         return
 
     token_id = 0
@@ -74,7 +74,7 @@ async def set_pixiv_token(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             token_id = int(token_id_text)
         except ValueError:
             logger.warning("Invalid token id '%s' for user %s", token_id_text, user.id)
-            await active_message_handler_registry.delete(user_id=user.id)
+            await handler_state.delete(user_id=user.id)
             return
 
     prompt_message_id = None
@@ -104,7 +104,7 @@ async def set_pixiv_token(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             logger.exception("Failed to process Pixiv token submission for user %s", user.id)
             feedback = f"操作失败：{exc}"
 
-    await active_message_handler_registry.delete(user_id=user.id)
+    await handler_state.delete(user_id=user.id)
 
     await refresh_bot_config_panel(
         context,
@@ -7,7 +7,8 @@ import logging
 from telegram import Update
 from telegram.ext import ContextTypes, filters
 
-from registries import active_message_handler_registry, user_registry
+from registries import user_registry
+from services import handler_state
 
 from handlers.callback_handlers.conf_handlers.user_conf_handlers.panel import (
     refresh_user_config_panel,
@@ -19,7 +20,7 @@ logger = logging.getLogger(__name__)
 _HANDLER_PREFIX = "set_user_nickname"
 
 
-@message_handler(filters=filters.TEXT & ~filters.COMMAND)
+@message_handler(filters=filters.TEXT & ~filters.COMMAND, state_prefix=_HANDLER_PREFIX)
 async def set_user_nickname(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     message = update.effective_message
     user = update.effective_user
@@ -27,21 +28,21 @@ async def set_user_nickname(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if message is None or user is None or not message.text:
         return
 
-    handler_key = await active_message_handler_registry.get(user.id)
+    handler_key = await handler_state.get(user.id)
     if not handler_key or not handler_key.startswith(_HANDLER_PREFIX):
         return
 
     _, _, metadata = handler_key.partition(":")
     if not metadata:
         logger.warning("Nickname handler metadata missing for user %s", user.id)
-        await active_message_handler_registry.delete(user_id=user.id)
+        await handler_state.delete(user_id=user.id)
         return
 
     try:
         panel_message_id = int(metadata)
     except ValueError:
         logger.warning("Invalid nickname handler metadata '%s' for user %s", metadata, user.id)
-        await active_message_handler_registry.delete(user_id=user.id)
+        await handler_state.delete(user_id=user.id)
         return
 
     submitted = message.text.strip()
@@ -51,7 +52,7 @@ async def set_user_nickname(update: Update, context: ContextTypes.DEFAULT_TYPE)
         new_value = submitted
 
     await user_registry.set_nick_name(user.id, new_value)
-    await active_message_handler_registry.delete(user_id=user.id)
+    await handler_state.delete(user_id=user.id)
 
     await refresh_user_config_panel(
         context,
@@ -3,13 +3,14 @@ from __future__ import annotations
 import asyncio
 import logging
 from collections.abc import Awaitable, Callable, Sequence
-from typing import Any, TypeVar, overload
+from typing import Any, Literal, TypeVar, overload
 
 from telegram import Update
 from telegram.ext import BaseHandler, CommandHandler, MessageHandler, filters as tg_filters, ContextTypes
 from telegram.ext.filters import BaseFilter
 
 from handlers.message_handlers.AcgimgMessageHandler import AcgimgMessageHandler
+from services import handler_state
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,8 @@ MessageCallback = Callable[..., Awaitable[object]]
 
 _registered_handlers: list[BaseHandler] = []
 _registered_message_handlers: list[AcgimgMessageHandler] = []
+# Active handler key prefix -> the stateful handler that consumes it.
+_stateful_handlers: dict[str, AcgimgMessageHandler] = {}
 
 
 @overload
@@ -75,6 +78,8 @@ def message_handler(
         no_parallel: bool = True,
         block: bool = False,
         name: str | None = None,
+        state_prefix: str | None = None,
+        state_scope: Literal["user", "chat"] = "user",
 ) -> Callable[[MessageCallback], MessageCallback]:
     ...
 
@@ -86,8 +91,15 @@ def message_handler(
         no_parallel: bool = True,
         block: bool = False,
         name: str | None = None,
+        state_prefix: str | None = None,
+        state_scope: Literal["user", "chat"] = "user",
 ) -> MessageCallback | Callable[[MessageCallback], MessageCallback]:
-    """Register a message handler callback via decorator usage."""
+    """Register a message handler callback via decorator usage.
+
+    Handlers given a ``state_prefix`` are only invoked while the sender's active
+    handler key (``<prefix>:<metadata>``) selects them, in the global scope or
+    in the current chat depending on ``state_scope``.
+    """
 
     def register(callback: MessageCallback) -> MessageCallback:
         handler_name = name or getattr(callback, "__message_handler_name__", None) or callback.__name__
@@ -99,7 +111,15 @@ def message_handler(
             callback=callback,
             no_parallel=no_parallel,
             block=block,
+            state_prefix=state_prefix,
+            state_scope=state_scope,
         )
+        if state_prefix is not None:
+            if ":" in state_prefix:
+                raise ValueError(f"State prefix must not contain ':': {state_prefix!r}")
+            if state_prefix in _stateful_handlers:
+                raise ValueError(f"State prefix already registered: {state_prefix!r}")
+            _stateful_handlers[state_prefix] = handler
         logger.error(f"Registered message handler {handler.callback}")
         _registered_message_handlers.append(handler)
         setattr(callback, "__message_handler_name__", handler_name)
@@ -117,10 +137,43 @@ def iter_message_handlers() -> list[AcgimgMessageHandler]:
 
 
 async def message_handler_foreach(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Register a callback for each registered message handler."""
-
+    """Run every stateless message handler and the stateful one the sender is in."""
+
+    handlers = iter_message_handlers()
+    user = update.effective_user
+    chat = update.effective_chat
+    wants_state = user is not None and any(
+        handler.state_prefix is not None and handler.check_update(update) for handler in handlers
+    )
+    if not wants_state:
+        await _dispatch(handlers, set(), update, context)
+        return
+
+    chat_id = chat.id if chat is not None else 0
+    # One lookup per update; the handlers' own registry reads are served from it.
+    async with handler_state.pinned(user.id, chat_id) as keys:
+        selected: set[AcgimgMessageHandler] = set()
+        for (_, group_id), handler_key in keys.items():
+            if not handler_key:
+                continue
+            handler = _stateful_handlers.get(handler_key.partition(":")[0])
+            if handler is None:
+                continue
+            if (handler.state_scope == "user") == (group_id == 0):
+                selected.add(handler)
+        await _dispatch(handlers, selected, update, context)
+
+
+async def _dispatch(
+        handlers: Sequence[AcgimgMessageHandler],
+        selected: set[AcgimgMessageHandler],
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+) -> None:
     pending_list = list()
-    for handler in iter_message_handlers():
+    for handler in handlers:
+        if handler.state_prefix is not None and handler not in selected:
+            continue
         logging.info("Checking message handler: %s", handler.callback)
         if handler.check_update(update):
             if handler.no_parallel:
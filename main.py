@@ -13,12 +13,17 @@ from bot import tg_bot
 
 from contextlib import asynccontextmanager
 from registries import engine, config_registry
-from routers import configs as config_routes, dashboard, groups, private, commands
+from routers import configs as config_routes, dashboard, groups, private, commands, jobs, metrics, history
 import uvicorn
 
 from configs import config, db_config_declare
 from registries.config_registry import init_database_config
-from services import pixiv, storage_service, schema_migrator
+from services import handler_state, pixiv, storage_service, schema_migrator
+from services.history_retention import schedule_retention
+from services.history_search import history_search
+from services.history_writer import history_writer
+from services.job_queue import job_worker_pool
+from services.metrics import register_provider
 from utils.logging_config import setup_logging
 
 setup_logging()
@@ -36,6 +41,7 @@ async def lifespan(app: FastAPI):
     try:
         # Tasks to run during application startup
         await engine.create_all()
+        register_provider("db_pool", engine.pool_stats)
         await schema_migrator.ensure_schema_migrations(engine.engine)
         await storage_service.ensure_storage_config_defaults()
         storage = await storage_service.use()
@@ -57,13 +63,45 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to initialize database configurations: {e}")
 
+        job_worker_pool.start(config.job_workers, bot_provider=lambda: tg_bot.tg_bot)
+        history_writer.start()
+        history_search.start()
+        try:
+            await handler_state.purge_abandoned()
+        except Exception:
+            logger.exception("Failed to purge abandoned message handler prompts")
+        try:
+            await schedule_retention()
+        except Exception:
+            logger.exception("Failed to schedule chat history retention")
+
         logger.warning("Bot started")
         yield
     finally:
+        try:
+            await job_worker_pool.stop()
+        except Exception:
+            logger.exception("Error while stopping background job workers")
+        try:
+            await storage_service.close_all()
+        except Exception:
+            logger.exception("Error while closing storage providers")
         try:
             await tg_bot.shutdown()
         except Exception:
             logger.exception("Error while shutting down Telegram bot")
+        try:
+            await history_search.stop()
+        except Exception:
+            logger.exception("Error while stopping the history search index")
+        try:
+            await history_writer.stop()
+        except Exception:
+            logger.exception("Error while flushing chat history")
+        try:
+            await engine.dispose()
+        except Exception:
+            logger.exception("Error while disposing database engines")
 
 
 app = FastAPI(lifespan=lifespan)
@@ -74,6 +112,9 @@ for router in (
     private.router,
     config_routes.router,
     commands.router,
+    jobs.router,
+    metrics.router,
+    history.router,
 ):
     app.include_router(router)
 
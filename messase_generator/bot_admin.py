@@ -37,6 +37,7 @@ def _storage_label(current: str | None) -> str:
         "local": "本地存储",
         "backblaze": "Backblaze B2",
         "webdav": "WebDAV",
+        "s3": "S3 兼容存储",
         "disabled": "已禁用",
         "none": "未设置",
     }
@@ -59,6 +60,10 @@ def _webdav_ready(config) -> bool:
     return bool(config.endpoint and config.username and config.password)
 
 
+def _s3_ready(config) -> bool:
+    return bool(config.endpoint and config.access_key and config.secret_key and config.bucket)
+
+
 def _local_ready(config) -> bool:
     return bool(config.root_path)
 
@@ -80,6 +85,7 @@ async def bot_admin(page: int = 1, *, command_message_id: int | None = None) ->
 
     backblaze_config = await config_registry.get_backblaze_config()
     webdav_config = await config_registry.get_webdav_config()
+    s3_config = await config_registry.get_s3_config()
     local_config = await config_registry.get_local_storage_config()
 
     pixiv_tokens = await config_registry.get_pixiv_tokens()
@@ -103,6 +109,7 @@ async def bot_admin(page: int = 1, *, command_message_id: int | None = None) ->
         f"  · 本地存储: {'已配置' if _local_ready(local_config) else '未配置'}",
         f"  · Backblaze B2: {'已配置' if _backblaze_ready(backblaze_config) else '未配置'}",
         f"  · WebDAV: {'已配置' if _webdav_ready(webdav_config) else '未配置'}",
+        f"  · S3: {'已配置' if _s3_ready(s3_config) else '未配置'}",
         "",
         "Pixiv Tokens:",
         f"- 配置数量: {len(pixiv_tokens)}",
@@ -8,6 +8,7 @@ from .illustrations import Illustration, build_illust_from_api_dict
 from .group_chat_history import GroupChatHistory
 from .private_chat_history import PrivateChatHistory
 from .command_history import CommandHistory
+from .background_job import BackgroundJob
 from .group_guard import (
     GroupGuardSettings,
     GroupGuardKeywordRule,
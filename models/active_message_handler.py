@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, Column, ForeignKey, String, Index
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, String, Index
 
 from configs import config as file_config
 from .base import Base
@@ -10,6 +10,7 @@ class ActiveMessageHandler(Base):
     group_id = Column(BigInteger, index=True, primary_key=True)  # 为 `group_id` 添加单列索引
     user_id = Column(BigInteger, index=True, primary_key=True)  # 为 `user_id` 添加单列索引
     handler_id = Column(String(128))
+    updated_at = Column(DateTime, nullable=True, comment='状态最后写入的时间')
 
     # 添加复合索引
     __table_args__ = (
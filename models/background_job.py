@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, Computed, DateTime, Enum, Index, Integer, JSON, String, Text, func
+
+from configs import config as file_config
+from defines import JobStatus
+
+from .base import Base
+
+
+class BackgroundJob(Base):
+    __tablename__ = f"{file_config.db_prefix}background_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True, comment="任务 ID")
+    kind = Column(String(64), nullable=False, index=True, comment="任务类型")
+    dedupe_key = Column(String(128), nullable=True, index=True, comment="去重键，同键的未完成任务只会存在一个")
+    # Holds dedupe_key only while the job is unfinished; the unique index enforces the rule above.
+    active_dedupe_key = Column(
+        String(128),
+        Computed("IF(status IN ('PENDING', 'RUNNING'), dedupe_key, NULL)", persisted=True),
+        unique=True,
+        comment="未完成任务的去重键",
+    )
+    payload = Column(JSON, nullable=True, comment="任务参数")
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING, comment="任务状态")
+    attempts = Column(Integer, nullable=False, default=0, comment="已尝试执行的次数")
+    max_attempts = Column(Integer, nullable=False, default=5, comment="最大尝试次数")
+    run_after = Column(DateTime, nullable=False, server_default=func.now(), comment="最早可执行时间")
+    lease_owner = Column(String(128), nullable=True, comment="持有租约的工作者")
+    lease_expires_at = Column(DateTime, nullable=True, comment="租约过期时间")
+    checkpoint = Column(JSON, nullable=True, comment="任务检查点")
+    result = Column(JSON, nullable=True, comment="任务结果")
+    last_error = Column(Text, nullable=True, comment="最近一次失败的错误信息")
+    created_at = Column(DateTime, nullable=False, server_default=func.now(), comment="创建时间")
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        comment="更新时间",
+    )
+    started_at = Column(DateTime, nullable=True, comment="首次开始执行的时间")
+    finished_at = Column(DateTime, nullable=True, comment="完成时间")
+
+    __table_args__ = (
+        Index("idx_background_jobs_status_run_after", "status", "run_after"),
+        Index("idx_background_jobs_finished_at", "finished_at"),
+    )
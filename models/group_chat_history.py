@@ -16,4 +16,5 @@ class GroupChatHistory(Base):
     file_id = Column(String(128), nullable=True, comment='消息的文件 ID')
     text = Column(Text, nullable=True, comment='消息的文本')
     key_board: list = Column(JSON, nullable=True, comment='消息的键盘')
-    sent_at = Column(DateTime, nullable=False, comment='消息的发送时间')
+    # Part of the key because the table is range-partitioned by month on it.
+    sent_at = Column(DateTime, primary_key=True, nullable=False, comment='消息的发送时间')
@@ -7,4 +7,6 @@ from . import (
     config_registry,
     active_message_handler_registry,
     command_history_registry,
+    chat_history_registry,
+    job_registry,
 )
@@ -1,10 +1,17 @@
+from datetime import datetime, timezone
+
 import sqlalchemy
+from sqlalchemy.dialects.mysql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import ActiveMessageHandler
 from .engine import engine
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 async def delete(user_id: int, group_id: int = 0):
     async with engine.new_session() as session:
         session: AsyncSession = session
@@ -19,40 +26,56 @@ async def delete(user_id: int, group_id: int = 0):
         await session.commit()
 
 
+async def delete_written_before(cutoff: datetime) -> int:
+    """Remove prompts last written before ``cutoff`` (naive UTC); returns the row count."""
+
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        result = await session.execute(
+            sqlalchemy.delete(ActiveMessageHandler)
+            .where(ActiveMessageHandler.updated_at < cutoff)
+        )
+        await session.commit()
+        return result.rowcount or 0
+
+
 async def get(user_id: int, group_id: int = 0) -> str:
+    handler_id, _ = await get_with_timestamp(user_id, group_id)
+    return handler_id
+
+
+async def get_with_timestamp(user_id: int, group_id: int = 0) -> tuple[str | None, datetime | None]:
+    """Return the handler key and when it was written (naive UTC), or ``(None, None)``."""
+
     async with engine.new_session() as session:
         session: AsyncSession = session
-        result = (await session.execute(
-            sqlalchemy.select(ActiveMessageHandler)
+        row = (await session.execute(
+            sqlalchemy.select(ActiveMessageHandler.handler_id, ActiveMessageHandler.updated_at)
             .where(
                 (ActiveMessageHandler.user_id == user_id) &
                 (ActiveMessageHandler.group_id == group_id)
             )
-        )).scalar_one_or_none()
-        return result.handler_id if result else None
+        )).one_or_none()
+        return (row.handler_id, row.updated_at) if row else (None, None)
+
 
-async def set(user_id: int, group_id: int = 0, handler_id: str = ""):
+async def set(user_id: int, group_id: int = 0, handler_id: str = "") -> datetime:
+    """Insert or replace the user's handler key in one statement; returns the write time."""
+
+    updated_at = _utcnow()
     async with engine.new_session() as session:
         session: AsyncSession = session
-        # 检查是否已存在记录
-        existing = (await session.execute(
-            sqlalchemy.select(ActiveMessageHandler)
-            .where(
-                (ActiveMessageHandler.user_id == user_id) &
-                (ActiveMessageHandler.group_id == group_id)
-            )
-        )).scalar_one_or_none()
-
-        if existing:
-            # 如果记录已存在，更新 handler_id
-            existing.handler_id = handler_id
-            await session.commit()
-        else:
-            # 如果记录不存在，插入新记录
-            new_record = ActiveMessageHandler(
-                user_id=user_id,
-                group_id=group_id,
-                handler_id=handler_id
+        stmt = insert(ActiveMessageHandler).values(
+            user_id=user_id,
+            group_id=group_id,
+            handler_id=handler_id,
+            updated_at=updated_at,
+        )
+        await session.execute(
+            stmt.on_duplicate_key_update(
+                handler_id=stmt.inserted.handler_id,
+                updated_at=stmt.inserted.updated_at,
             )
-            session.add(new_record)
-            await session.commit()
+        )
+        await session.commit()
+    return updated_at
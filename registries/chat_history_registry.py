@@ -0,0 +1,147 @@
+"""Bulk persistence helpers for chat history and the profiles it references."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Mapping, NamedTuple, Sequence
+
+from sqlalchemy import desc, func, select, tuple_
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from defines import MessageType
+from models import Group, GroupChatHistory, PrivateChatHistory, User
+
+from .engine import engine
+
+_HISTORY_UPDATE_COLUMNS = ("type", "bot_send", "file_id", "text", "key_board", "sent_at")
+
+
+class HistoryKey(NamedTuple):
+    """Sort key of a history row; newest first, unique within a scope."""
+
+    sent_at: datetime
+    chat_id: int
+    message_id: int
+
+
+def _history_model(scope: str):
+    if scope == "group":
+        return GroupChatHistory, GroupChatHistory.group_id
+    if scope == "private":
+        return PrivateChatHistory, PrivateChatHistory.user_id
+    raise ValueError(f"Unknown history scope: {scope!r}")
+
+
+def _upsert_history(model, rows: Sequence[Mapping[str, Any]]):
+    stmt = insert(model).values(list(rows))
+    return stmt.on_duplicate_key_update(
+        {column: stmt.inserted[column] for column in _HISTORY_UPDATE_COLUMNS}
+    )
+
+
+async def write_chat_batch(
+    *,
+    users: Mapping[int, str | None],
+    groups: Mapping[int, tuple[str | None, list[int] | None]],
+    group_rows: Sequence[Mapping[str, Any]],
+    private_rows: Sequence[Mapping[str, Any]],
+) -> None:
+    """Upsert user/group profiles and history rows in one transaction.
+
+    ``users`` maps user ids to nicknames; ``groups`` maps group ids to
+    ``(title, admin_ids)`` where ``None`` leaves the stored value untouched.
+    """
+
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        if users:
+            stmt = insert(User).values(
+                [{"id": user_id, "nick_name": nick_name} for user_id, nick_name in users.items()]
+            )
+            await session.execute(stmt.on_duplicate_key_update(nick_name=stmt.inserted.nick_name))
+
+        with_admins = [
+            {"id": group_id, "name": name, "admin_ids": admin_ids}
+            for group_id, (name, admin_ids) in groups.items()
+            if admin_ids is not None
+        ]
+        without_admins = [
+            {"id": group_id, "name": name}
+            for group_id, (name, admin_ids) in groups.items()
+            if admin_ids is None
+        ]
+        if with_admins:
+            stmt = insert(Group).values(with_admins)
+            await session.execute(
+                stmt.on_duplicate_key_update(
+                    name=func.coalesce(stmt.inserted.name, Group.name),
+                    admin_ids=stmt.inserted.admin_ids,
+                )
+            )
+        if without_admins:
+            stmt = insert(Group).values(without_admins)
+            await session.execute(
+                stmt.on_duplicate_key_update(name=func.coalesce(stmt.inserted.name, Group.name))
+            )
+
+        if group_rows:
+            await session.execute(_upsert_history(GroupChatHistory, group_rows))
+        if private_rows:
+            await session.execute(_upsert_history(PrivateChatHistory, private_rows))
+        await session.commit()
+
+
+async def search_history(
+    scope: str,
+    needle: str,
+    *,
+    chat_id: int | None = None,
+    user_id: int | None = None,
+    message_type: MessageType | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    not_after: datetime | None = None,
+    before: HistoryKey | None = None,
+    limit: int = 50,
+) -> list[Any]:
+    """Scan ``scope`` history for rows whose text contains ``needle``, newest first.
+
+    ``since`` is inclusive and ``until`` exclusive; ``not_after`` is an
+    inclusive upper bound and ``before`` the keyset cursor of the previous page.
+    """
+
+    model, chat_column = _history_model(scope)
+    stmt = select(model).where(model.text.contains(needle, autoescape=True))
+    if chat_id is not None:
+        stmt = stmt.where(chat_column == chat_id)
+    if user_id is not None:
+        stmt = stmt.where(model.user_id == user_id)
+    if message_type is not None:
+        stmt = stmt.where(model.type == message_type)
+    if since is not None:
+        stmt = stmt.where(model.sent_at >= since)
+    if until is not None:
+        stmt = stmt.where(model.sent_at < until)
+    if not_after is not None:
+        stmt = stmt.where(model.sent_at <= not_after)
+    if before is not None:
+        stmt = stmt.where(tuple_(model.sent_at, chat_column, model.message_id) < tuple(before))
+    stmt = stmt.order_by(desc(model.sent_at), desc(chat_column), desc(model.message_id)).limit(limit)
+
+    async with engine.read_session() as session:
+        return list((await session.execute(stmt)).scalars().all())
+
+
+async def recent_history(scope: str, limit: int) -> list[Any]:
+    """Return the newest ``limit`` rows of ``scope`` history that carry text."""
+
+    model, chat_column = _history_model(scope)
+    stmt = (
+        select(model)
+        .where(model.text.is_not(None))
+        .order_by(desc(model.sent_at), desc(chat_column), desc(model.message_id))
+        .limit(limit)
+    )
+    async with engine.read_session() as session:
+        return list((await session.execute(stmt)).scalars().all())
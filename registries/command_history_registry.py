@@ -61,7 +61,7 @@ async def query_history(
 ) -> tuple[int, list[CommandHistory]]:
     """Retrieve paginated command history entries applying optional filters."""
 
-    async with engine.new_session() as session:
+    async with engine.read_session() as session:
         session: AsyncSession = session
 
         filters = []
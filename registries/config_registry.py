@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from dataclasses import dataclass
-from typing import Literal, cast
+import time
+import uuid
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Literal, Mapping, cast
 
 from sqlalchemy import delete, select, update
 
 from models import Config, PixivToken
 from .engine import engine
 
+# Reserved row whose value changes on every config write; other workers poll
+# it to notice that their snapshot is out of date.
+CONFIG_VERSION_KEY = "__config_version"
+CONFIG_VERSION_CHECK_SECONDS = 2.0
+
+_TRUE_STRINGS = {"true", "1", "yes", "y", "on"}
+_FALSE_STRINGS = {"false", "0", "no", "n", "off"}
+
 
 def _optional_str(value: str | bool | None) -> str | None:
     if value is None:
@@ -19,6 +31,106 @@ def _optional_str(value: str | bool | None) -> str | None:
     return text or None
 
 
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable view of the whole config table at one version."""
+
+    version: str | None
+    values: Mapping[str, str | bool | None] = field(default_factory=dict)
+
+    def get(self, key: str) -> str | bool | None:
+        return self.values.get(key)
+
+    def get_str(self, key: str) -> str | None:
+        return _optional_str(self.values.get(key))
+
+    def get_bool(self, key: str, default: bool | None = None) -> bool | None:
+        value = self.values.get(key)
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            lowered = value.strip().lower()
+            if lowered in _TRUE_STRINGS:
+                return True
+            if lowered in _FALSE_STRINGS:
+                return False
+        return default
+
+    def get_int(self, key: str, default: int, *, minimum: int | None = None) -> int:
+        value = self.values.get(key)
+        if isinstance(value, bool):
+            return default
+        try:
+            numeric = int(str(value).strip())
+        except (TypeError, ValueError):
+            return default
+        return numeric if minimum is None else max(numeric, minimum)
+
+
+_snapshot: ConfigSnapshot | None = None
+_snapshot_checked_at = 0.0
+_snapshot_lock = asyncio.Lock()
+
+
+def _row_value(config: Config) -> str | bool | None:
+    if config.value_str is not None:
+        return config.value_str
+    if config.value_bool is not None:
+        return config.value_bool
+    return None
+
+
+async def _read_version() -> str | None:
+    async with engine.new_session() as session:
+        result = await session.execute(
+            select(Config.value_str).where(Config.key == CONFIG_VERSION_KEY)
+        )
+        return result.scalar_one_or_none()
+
+
+async def _load_snapshot() -> ConfigSnapshot:
+    async with engine.new_session() as session:
+        rows = list((await session.execute(select(Config))).scalars())
+    version = next((row.value_str for row in rows if row.key == CONFIG_VERSION_KEY), None)
+    values = {row.key: _row_value(row) for row in rows if row.key != CONFIG_VERSION_KEY}
+    return ConfigSnapshot(version=version, values=MappingProxyType(values))
+
+
+def _recently_checked() -> bool:
+    return time.monotonic() - _snapshot_checked_at < CONFIG_VERSION_CHECK_SECONDS
+
+
+async def get_snapshot() -> ConfigSnapshot:
+    """Return the current config snapshot, reloading it when the version row changed."""
+
+    global _snapshot, _snapshot_checked_at
+
+    snapshot = _snapshot
+    if snapshot is not None and _recently_checked():
+        return snapshot
+
+    async with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is not None and _recently_checked():
+            return snapshot
+        if snapshot is None or await _read_version() != snapshot.version:
+            snapshot = await _load_snapshot()
+            _snapshot = snapshot
+        _snapshot_checked_at = time.monotonic()
+        return snapshot
+
+
+def invalidate_snapshot() -> None:
+    """Drop the local snapshot so the next read reloads the table."""
+
+    global _snapshot
+    _snapshot = None
+
+
+async def _bump_version(session) -> None:
+    await session.merge(Config(key=CONFIG_VERSION_KEY, value_str=uuid.uuid4().hex))
+
+
 @dataclass
 class Token:
     token: str
@@ -90,6 +202,42 @@ class WebDavConfig:
         return cleaned.rstrip("/") or None
 
 
+@dataclass
+class S3Config:
+    endpoint: str | None = None
+    region: str | None = None
+    access_key: str | None = None
+    secret_key: str | None = None
+    bucket: str | None = None
+    base_path: str | None = None
+    public_base_url: str | None = None
+    path_style: bool = True
+    presign_seconds: int = 0
+
+    def __post_init__(self) -> None:
+        self.endpoint = self._normalize_url(self.endpoint)
+        self.region = _optional_str(self.region) or "us-east-1"
+        self.access_key = _optional_str(self.access_key)
+        self.secret_key = _optional_str(self.secret_key)
+        self.bucket = _optional_str(self.bucket)
+        self.base_path = self._normalize_path(self.base_path)
+        self.public_base_url = self._normalize_url(self.public_base_url)
+
+    @staticmethod
+    def _normalize_path(path: str | None) -> str | None:
+        cleaned = _optional_str(path)
+        if cleaned is None:
+            return None
+        return cleaned.replace("\\", "/").strip("/") or None
+
+    @staticmethod
+    def _normalize_url(url: str | None) -> str | None:
+        cleaned = _optional_str(url)
+        if cleaned is None:
+            return None
+        return cleaned.rstrip("/") or None
+
+
 @dataclass
 class LocalStorageConfig:
     root_path: str | None = None
@@ -122,7 +270,9 @@ async def add_config(config: Config, default: str | bool) -> None:
 
     async with engine.new_session() as session:
         await session.merge(config)
+        await _bump_version(session)
         await session.commit()
+    invalidate_snapshot()
 
 
 async def update_config(key: str, value: str | bool) -> None:
@@ -132,7 +282,9 @@ async def update_config(key: str, value: str | bool) -> None:
 
     async with engine.new_session() as session:
         await session.merge(config)
+        await _bump_version(session)
         await session.commit()
+    invalidate_snapshot()
 
 
 async def get_configs(key: str) -> list[Config]:
@@ -148,14 +300,19 @@ async def get_config_detail(key: str) -> Config | None:
 
 
 async def get_config(key: str) -> str | bool | None:
-    config = await get_config_detail(key)
-    if config is None:
-        return None
-    if config.value_str is not None:
-        return config.value_str
-    if config.value_bool is not None:
-        return config.value_bool
-    return None
+    return (await get_snapshot()).get(key)
+
+
+async def get_str_config(key: str) -> str | None:
+    return (await get_snapshot()).get_str(key)
+
+
+async def get_bool_config(key: str, default: bool | None = None) -> bool | None:
+    return (await get_snapshot()).get_bool(key, default)
+
+
+async def get_int_config(key: str, default: int, *, minimum: int | None = None) -> int:
+    return (await get_snapshot()).get_int(key, default, minimum=minimum)
 
 
 async def get_bot_tokens() -> list[Token]:
@@ -172,7 +329,9 @@ async def get_bot_tokens() -> list[Token]:
             )
             async with engine.new_session() as session:
                 await session.merge(record)
+                await _bump_version(session)
                 await session.commit()
+            invalidate_snapshot()
             configs = await get_configs("bot_token")
     return [
         Token(
@@ -207,7 +366,9 @@ async def get_pixiv_tokens() -> list[Token]:
                     migrated = True
 
         if migrated:
+            await _bump_version(session)
             await session.commit()
+            invalidate_snapshot()
             result = await session.execute(select(PixivToken).order_by(PixivToken.id))
             records = list(result.scalars())
 
@@ -280,26 +441,13 @@ def _normalize_cache_backend(value: str | bool | None) -> Literal["memory", "red
     return "memory"
 
 
-def _coerce_positive_int(value: str | bool | None, *, default: int, minimum: int) -> int:
-    if isinstance(value, bool):
-        return default
-    try:
-        numeric = int(str(value))
-    except (TypeError, ValueError):
-        return default
-    return max(numeric, minimum)
-
-
 async def get_telegram_cache_config() -> TelegramCacheConfig:
-    backend_value = await get_config("telegram_cache_backend")
-    ttl_value = await get_config("telegram_cache_ttl_seconds")
-    redis_url_value = await get_config("telegram_cache_redis_url")
-
-    backend = _normalize_cache_backend(backend_value)
-    ttl_seconds = _coerce_positive_int(ttl_value, default=300, minimum=30)
-    redis_url = _optional_str(redis_url_value)
-
-    return TelegramCacheConfig(backend=backend, ttl_seconds=ttl_seconds, redis_url=redis_url)
+    snapshot = await get_snapshot()
+    return TelegramCacheConfig(
+        backend=_normalize_cache_backend(snapshot.get("telegram_cache_backend")),
+        ttl_seconds=snapshot.get_int("telegram_cache_ttl_seconds", 300, minimum=30),
+        redis_url=snapshot.get_str("telegram_cache_redis_url"),
+    )
 
 
 async def set_telegram_cache_backend(backend: str) -> None:
@@ -322,36 +470,54 @@ async def set_telegram_cache_redis_url(url: str | None) -> None:
 
 
 async def get_backblaze_config() -> BackBlazeConfig:
+    snapshot = await get_snapshot()
     return BackBlazeConfig(
-        app_id=_optional_str(await get_config("backblaze_app_id")),
-        app_key=_optional_str(await get_config("backblaze_app_key")),
-        bucket_name=_optional_str(await get_config("backblaze_bucket_name")),
-        base_path=_optional_str(await get_config("backblaze_base_path")),
-        base_url=_optional_str(await get_config("backblaze_base_url")),
+        app_id=snapshot.get_str("backblaze_app_id"),
+        app_key=snapshot.get_str("backblaze_app_key"),
+        bucket_name=snapshot.get_str("backblaze_bucket_name"),
+        base_path=snapshot.get_str("backblaze_base_path"),
+        base_url=snapshot.get_str("backblaze_base_url"),
     )
 
 
 async def get_webdav_config() -> WebDavConfig:
+    snapshot = await get_snapshot()
     return WebDavConfig(
-        endpoint=_optional_str(await get_config("webdav_endpoint")),
-        username=_optional_str(await get_config("webdav_username")),
-        password=_optional_str(await get_config("webdav_password")),
-        base_path=_optional_str(await get_config("webdav_base_path")),
-        public_base_url=_optional_str(await get_config("webdav_public_url")),
+        endpoint=snapshot.get_str("webdav_endpoint"),
+        username=snapshot.get_str("webdav_username"),
+        password=snapshot.get_str("webdav_password"),
+        base_path=snapshot.get_str("webdav_base_path"),
+        public_base_url=snapshot.get_str("webdav_public_url"),
+    )
+
+
+async def get_s3_config() -> S3Config:
+    snapshot = await get_snapshot()
+    return S3Config(
+        endpoint=snapshot.get_str("s3_endpoint"),
+        region=snapshot.get_str("s3_region"),
+        access_key=snapshot.get_str("s3_access_key"),
+        secret_key=snapshot.get_str("s3_secret_key"),
+        bucket=snapshot.get_str("s3_bucket"),
+        base_path=snapshot.get_str("s3_base_path"),
+        public_base_url=snapshot.get_str("s3_public_url"),
+        path_style=snapshot.get_bool("s3_path_style", True) is not False,
+        presign_seconds=snapshot.get_int("s3_presign_seconds", 0, minimum=0),
     )
 
 
 async def get_local_storage_config() -> LocalStorageConfig:
+    snapshot = await get_snapshot()
     return LocalStorageConfig(
-        root_path=_optional_str(await get_config("local_storage_root")),
-        base_url=_optional_str(await get_config("local_storage_base_url")),
+        root_path=snapshot.get_str("local_storage_root"),
+        base_url=snapshot.get_str("local_storage_base_url"),
     )
 
 
 async def init_database_config(db_config_declare: dict[str, str | bool]) -> None:
+    snapshot = await get_snapshot()
     for key, default in db_config_declare.items():
-        existing_config = await get_config_detail(key)
-        if existing_config:
+        if key in snapshot.values:
             continue
         config = Config(
             key=key,
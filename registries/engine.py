@@ -1,31 +1,192 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+
 from singleton_class_decorator import singleton
-from sqlalchemy import select, update, create_engine, func, delete
+from sqlalchemy import select, update, create_engine, func, delete, event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncAttrs, async_sessionmaker, AsyncSession, AsyncConnection
 from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from configs import config as config_file
 from models import Base
 
+logger = logging.getLogger(__name__)
+
+_SLOW_QUERY_PREVIEW_LENGTH = 500
+
+
+class _PoolStats:
+    """Counters shared by the pool and statement event hooks."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.queries = 0
+        self.slow_queries = 0
+
+    def record_checkout(self, waited: float) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.checkout_wait_total += waited
+            self.checkout_wait_max = max(self.checkout_wait_max, waited)
+
+    def record_query(self, elapsed: float, slow: bool) -> None:
+        with self.lock:
+            self.queries += 1
+            if slow:
+                self.slow_queries += 1
+
+
+_stats = _PoolStats()
+
+
+class _TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _stats.record_checkout(time.perf_counter() - started)
+
+
+# The start time lives on the execution context, which is discarded with the
+# statement, so failed statements leave nothing behind on the pooled connection.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_slow_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    slow = elapsed * 1000 >= config_file.db_slow_query_ms
+    _stats.record_query(elapsed, slow)
+    if slow and random.random() < config_file.db_slow_query_sample_rate:
+        logger.warning(
+            "Slow query (%.1f ms): %s",
+            elapsed * 1000,
+            " ".join(statement.split())[:_SLOW_QUERY_PREVIEW_LENGTH],
+        )
+
+
+def _database_url(host: str, port: int, username: str, password: str) -> str:
+    return (f"mariadb+asyncmy://{username}:{password}@{host}:{port}/"
+            f"{config_file.db_name}?charset=utf8mb4")
+
+
+def _create_engine(url: str):
+    engine = create_async_engine(
+        url,
+        echo=config_file.db_echo,
+        poolclass=_TimedQueuePool,
+        pool_size=config_file.db_pool_size,
+        max_overflow=config_file.db_max_overflow,
+        pool_timeout=config_file.db_pool_timeout,
+        pool_recycle=config_file.db_pool_recycle,
+        pool_pre_ping=config_file.db_pool_pre_ping,
+    )
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
 
 @singleton
 class Engine:
     def __init__(self):
         self.engine = None
+        self.replica_engine = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._session_factory_no_expire: async_sessionmaker[AsyncSession] | None = None
+        self._replica_session_factory: async_sessionmaker[AsyncSession] | None = None
+        self._replica_lag: float | None = None
+        self._replica_usable = False
+        self._replica_checked_at = 0.0
+        self._replica_check: asyncio.Task[None] | None = None
 
     def create(self):
-        url = (f"mariadb+asyncmy://{config_file.db_username}:"
-               f"{config_file.db_password}@{config_file.db_host}:{config_file.db_port}/"
-               f"{config_file.db_name}?charset=utf8mb4")
-        self.engine = create_async_engine(
-            url,
-            echo=True,
-            echo_pool=True,
-            pool_recycle=3600
+        url = _database_url(
+            config_file.db_host,
+            config_file.db_port,
+            config_file.db_username,
+            config_file.db_password,
         )
+        self.engine = _create_engine(url)
+        self._session_factory = async_sessionmaker(self.engine, expire_on_commit=True)
+        self._session_factory_no_expire = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        if config_file.db_replica_host:
+            replica_url = _database_url(
+                config_file.db_replica_host,
+                config_file.db_replica_port,
+                config_file.db_replica_username,
+                config_file.db_replica_password,
+            )
+            self.replica_engine = _create_engine(replica_url)
+            self._replica_session_factory = async_sessionmaker(self.replica_engine, expire_on_commit=True)
 
     def new_session(self) -> AsyncSession:
-        async_session = async_sessionmaker(self.engine, expire_on_commit=True)
-        return async_session()
+        return self._session_factory()
+
+    def read_session(self) -> AsyncSession:
+        """Session for read-only admin and analytics queries.
+
+        Uses the replica when one is configured and its last lag check was
+        within ``DATABASE_REPLICA_MAX_LAG_SECONDS``; otherwise the primary.
+        Writes and bot-path reads must keep using :meth:`new_session`.
+        """
+
+        if self._replica_session_factory is None:
+            return self.new_session()
+        self._schedule_replica_check()
+        if self._replica_usable:
+            return self._replica_session_factory()
+        return self.new_session()
+
+    def _schedule_replica_check(self) -> None:
+        if time.monotonic() - self._replica_checked_at < config_file.db_replica_check_interval:
+            return
+        if self._replica_check is not None and not self._replica_check.done():
+            return
+        self._replica_check = asyncio.get_running_loop().create_task(self._check_replica())
+
+    async def _check_replica(self) -> None:
+        try:
+            async with self.replica_engine.connect() as conn:
+                row = (await conn.execute(text("SHOW SLAVE STATUS"))).mappings().first()
+        except Exception as exc:
+            logger.warning("Read replica unavailable, using the primary: %s", exc)
+            self._replica_lag = None
+            self._replica_usable = False
+        else:
+            if row is None:
+                # Replication was never configured or was reset; the data may be arbitrarily stale.
+                logger.warning("Read replica reports no replication status, using the primary")
+                lag = None
+            else:
+                lag = row.get("Seconds_Behind_Master")
+            self._replica_lag = None if lag is None else float(lag)
+            usable = (
+                self._replica_lag is not None
+                and self._replica_lag <= config_file.db_replica_max_lag
+            )
+            if usable != self._replica_usable:
+                logger.warning(
+                    "Read replica %s (lag: %s s)",
+                    "back in use" if usable else "lagging or stopped, using the primary",
+                    self._replica_lag,
+                )
+            self._replica_usable = usable
+        finally:
+            self._replica_checked_at = time.monotonic()
 
     async def create_all(self):
         if self.engine is None:
@@ -34,9 +195,45 @@ class Engine:
             conn: AsyncConnection = conn
             await conn.run_sync(Base.metadata.create_all)
 
+    async def dispose(self) -> None:
+        if self._replica_check is not None:
+            self._replica_check.cancel()
+        for candidate in (self.replica_engine, self.engine):
+            if candidate is not None:
+                await candidate.dispose()
+
     def new_session_no_expire_on_commit(self):
-        async_session = async_sessionmaker(self.engine, expire_on_commit=False)
-        return async_session
+        return self._session_factory_no_expire
+
+    def pool_stats(self) -> dict[str, int | float]:
+        """Pool occupancy and checkout latency, for ``/api/metrics``."""
+
+        result: dict[str, int | float] = {}
+        if self.engine is not None:
+            pool = self.engine.pool
+            result.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        with _stats.lock:
+            checkouts = _stats.checkouts
+            average_wait = _stats.checkout_wait_total / checkouts if checkouts else 0.0
+            result.update(
+                checkouts=checkouts,
+                checkout_wait_avg_ms=round(average_wait * 1000, 2),
+                checkout_wait_max_ms=round(_stats.checkout_wait_max * 1000, 2),
+                queries=_stats.queries,
+                slow_queries=_stats.slow_queries,
+            )
+        if self.replica_engine is not None:
+            result.update(
+                replica_in_use=int(self._replica_usable),
+                replica_lag_seconds=self._replica_lag if self._replica_lag is not None else -1,
+                replica_checked_out=self.replica_engine.pool.checkedout(),
+            )
+        return result
 
 
 engine = Engine()
@@ -50,3 +50,22 @@ async def set_group_allow_setu(group_id: int, allow: bool) -> None:
         )
         await session.commit()
 
+
+
+async def set_group_admin(group_id: int, user_id: int, is_admin: bool) -> bool:
+    """Add or remove ``user_id`` in a known group's admin list; returns whether it changed."""
+
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        group = await session.get(Group, group_id)
+        if group is None:
+            return False
+        current = [int(admin_id) for admin_id in group.admin_ids or []]
+        if (user_id in current) == is_admin:
+            return False
+        updated = [admin_id for admin_id in current if admin_id != user_id]
+        if is_admin:
+            updated.append(user_id)
+        group.admin_ids = updated
+        await session.commit()
+        return True
@@ -49,3 +49,15 @@ async def save_illustration(illust: Illustration) -> Illustration:
         await session.commit()
         await session.refresh(merged)
         return merged
+
+
+async def list_illustrations_after(last_id: str | None, limit: int = 100) -> list[Illustration]:
+    """Return illustrations ordered by id, starting after ``last_id`` (keyset pagination)."""
+
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        stmt = select(Illustration).order_by(Illustration.id).limit(limit)
+        if last_id is not None:
+            stmt = stmt.where(Illustration.id > last_id)
+        result = await session.execute(stmt)
+        return list(result.scalars())
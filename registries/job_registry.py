@@ -0,0 +1,400 @@
+"""Persistence helpers for the background job queue."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
+
+from sqlalchemy import and_, desc, func, literal_column, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from defines import JobStatus
+from models import BackgroundJob
+
+from .engine import engine
+
+_ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING)
+
+
+@dataclass(slots=True)
+class JobInfo:
+    id: int
+    kind: str
+    dedupe_key: str | None
+    payload: dict[str, Any]
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_after: datetime | None
+    lease_owner: str | None
+    lease_expires_at: datetime | None
+    checkpoint: dict[str, Any]
+    result: dict[str, Any] | None
+    last_error: str | None
+    created_at: datetime | None
+    updated_at: datetime | None
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+@dataclass(slots=True)
+class JobStats:
+    counts: dict[str, int]
+    window_seconds: int
+    succeeded_in_window: int
+    failed_in_window: int
+    average_duration_seconds: float | None
+
+
+def _utcnow() -> datetime:
+    """Return a naive UTC timestamp matching the ``DateTime`` columns."""
+
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _to_info(record: BackgroundJob) -> JobInfo:
+    return JobInfo(
+        id=record.id,
+        kind=record.kind,
+        dedupe_key=record.dedupe_key,
+        payload=dict(record.payload or {}),
+        status=record.status,
+        attempts=int(record.attempts or 0),
+        max_attempts=int(record.max_attempts or 1),
+        run_after=record.run_after,
+        lease_owner=record.lease_owner,
+        lease_expires_at=record.lease_expires_at,
+        checkpoint=dict(record.checkpoint or {}),
+        result=dict(record.result) if record.result is not None else None,
+        last_error=record.last_error,
+        created_at=record.created_at,
+        updated_at=record.updated_at,
+        started_at=record.started_at,
+        finished_at=record.finished_at,
+    )
+
+
+async def enqueue_job(
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    dedupe_key: str | None = None,
+    max_attempts: int = 5,
+    delay_seconds: float = 0,
+) -> tuple[JobInfo, bool]:
+    """Insert a job unless an unfinished job with the same ``dedupe_key`` exists.
+
+    Returns the job together with a flag telling whether it was newly created.
+    """
+
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        # The unique active_dedupe_key index makes concurrent enqueues of one key
+        # collide; the loser returns the winner's job.
+        for _ in range(2):
+            if dedupe_key:
+                existing = await _active_job(session, dedupe_key)
+                if existing is not None:
+                    return _to_info(existing), False
+
+            now = _utcnow()
+            record = BackgroundJob(
+                kind=kind,
+                dedupe_key=dedupe_key,
+                payload=payload or {},
+                status=JobStatus.PENDING,
+                attempts=0,
+                max_attempts=max(1, max_attempts),
+                run_after=now + timedelta(seconds=max(0.0, delay_seconds)),
+                checkpoint={},
+                created_at=now,
+                updated_at=now,
+            )
+            session.add(record)
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                if not dedupe_key:
+                    raise
+                continue
+            await session.refresh(record)
+            return _to_info(record), True
+
+        existing = await _active_job(session, dedupe_key)
+        if existing is None:
+            raise RuntimeError(f"Could not enqueue job with dedupe key {dedupe_key!r}")
+        return _to_info(existing), False
+
+
+async def _active_job(session: AsyncSession, dedupe_key: str) -> BackgroundJob | None:
+    return (
+        await session.execute(
+            select(BackgroundJob)
+            .where(
+                (BackgroundJob.dedupe_key == dedupe_key)
+                & BackgroundJob.status.in_(_ACTIVE_STATUSES)
+            )
+            .order_by(BackgroundJob.id)
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+
+
+async def lease_jobs(
+    kinds: Sequence[str],
+    worker_id: str,
+    *,
+    limit: int = 1,
+    lease_seconds: int = 300,
+) -> list[JobInfo]:
+    """Claim runnable jobs for ``worker_id``.
+
+    Pending jobs whose ``run_after`` has passed and running jobs whose lease
+    expired (the previous worker died) are both eligible. Rows are locked with
+    ``SKIP LOCKED`` so concurrent workers never claim the same job. Expired
+    jobs that already used all their attempts are marked failed instead, so a
+    job that keeps killing its worker is not retried forever.
+    """
+
+    if not kinds:
+        return []
+
+    now = _utcnow()
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        await session.execute(
+            update(BackgroundJob)
+            .where(
+                BackgroundJob.kind.in_(list(kinds)),
+                BackgroundJob.status == JobStatus.RUNNING,
+                BackgroundJob.lease_expires_at < now,
+                BackgroundJob.attempts >= BackgroundJob.max_attempts,
+            )
+            .values(
+                status=JobStatus.FAILED,
+                last_error="Lease expired after the final attempt",
+                lease_owner=None,
+                lease_expires_at=None,
+                finished_at=now,
+                updated_at=now,
+            )
+        )
+        await session.commit()
+
+        stmt = (
+            select(BackgroundJob)
+            .where(
+                BackgroundJob.kind.in_(list(kinds)),
+                or_(
+                    and_(
+                        BackgroundJob.status == JobStatus.PENDING,
+                        BackgroundJob.run_after <= now,
+                    ),
+                    and_(
+                        BackgroundJob.status == JobStatus.RUNNING,
+                        BackgroundJob.lease_expires_at < now,
+                        BackgroundJob.attempts < BackgroundJob.max_attempts,
+                    ),
+                ),
+            )
+            .order_by(BackgroundJob.run_after, BackgroundJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        records = list((await session.execute(stmt)).scalars())
+        if not records:
+            return []
+
+        lease_until = now + timedelta(seconds=lease_seconds)
+        for record in records:
+            record.status = JobStatus.RUNNING
+            record.lease_owner = worker_id
+            record.lease_expires_at = lease_until
+            record.attempts = int(record.attempts or 0) + 1
+            record.updated_at = now
+            if record.started_at is None:
+                record.started_at = now
+
+        leased = [_to_info(record) for record in records]
+        await session.commit()
+        return leased
+
+
+async def renew_lease(job_id: int, worker_id: str, *, lease_seconds: int = 300) -> bool:
+    """Extend the lease held by ``worker_id``; returns ``False`` if it was lost."""
+
+    now = _utcnow()
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        result = await session.execute(
+            update(BackgroundJob)
+            .where(
+                (BackgroundJob.id == job_id)
+                & (BackgroundJob.lease_owner == worker_id)
+                & (BackgroundJob.status == JobStatus.RUNNING)
+            )
+            .values(lease_expires_at=now + timedelta(seconds=lease_seconds), updated_at=now)
+        )
+        await session.commit()
+        return bool(result.rowcount)
+
+
+async def save_checkpoint(job_id: int, worker_id: str, checkpoint: dict[str, Any]) -> bool:
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        result = await session.execute(
+            update(BackgroundJob)
+            .where(
+                (BackgroundJob.id == job_id)
+                & (BackgroundJob.lease_owner == worker_id)
+                & (BackgroundJob.status == JobStatus.RUNNING)
+            )
+            .values(checkpoint=checkpoint, updated_at=_utcnow())
+        )
+        await session.commit()
+        return bool(result.rowcount)
+
+
+async def complete_job(job_id: int, worker_id: str, result: dict[str, Any] | None = None) -> bool:
+    now = _utcnow()
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        outcome = await session.execute(
+            update(BackgroundJob)
+            .where((BackgroundJob.id == job_id) & (BackgroundJob.lease_owner == worker_id))
+            .values(
+                status=JobStatus.SUCCEEDED,
+                result=result,
+                last_error=None,
+                lease_owner=None,
+                lease_expires_at=None,
+                finished_at=now,
+                updated_at=now,
+            )
+        )
+        await session.commit()
+        return bool(outcome.rowcount)
+
+
+async def fail_job(
+    job_id: int,
+    worker_id: str,
+    error: str,
+    *,
+    retry_in_seconds: float | None,
+) -> bool:
+    """Record a failed attempt.
+
+    When ``retry_in_seconds`` is ``None`` the job is marked as permanently
+    failed, otherwise it is rescheduled as pending after the given delay.
+    """
+
+    now = _utcnow()
+    values: dict[str, Any] = {
+        "last_error": error,
+        "lease_owner": None,
+        "lease_expires_at": None,
+        "updated_at": now,
+    }
+    if retry_in_seconds is None:
+        values.update(status=JobStatus.FAILED, finished_at=now)
+    else:
+        values.update(
+            status=JobStatus.PENDING,
+            run_after=now + timedelta(seconds=max(0.0, retry_in_seconds)),
+        )
+
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        outcome = await session.execute(
+            update(BackgroundJob)
+            .where((BackgroundJob.id == job_id) & (BackgroundJob.lease_owner == worker_id))
+            .values(**values)
+        )
+        await session.commit()
+        return bool(outcome.rowcount)
+
+
+async def get_job(job_id: int) -> JobInfo | None:
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        record = await session.get(BackgroundJob, job_id)
+        return _to_info(record) if record is not None else None
+
+
+async def list_jobs(
+    *,
+    status: JobStatus | None = None,
+    kind: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> tuple[int, list[JobInfo]]:
+    filters = []
+    if status is not None:
+        filters.append(BackgroundJob.status == status)
+    if kind:
+        filters.append(BackgroundJob.kind == kind)
+
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        stmt = select(BackgroundJob)
+        count_stmt = select(func.count()).select_from(BackgroundJob)
+        if filters:
+            stmt = stmt.where(and_(*filters))
+            count_stmt = count_stmt.where(and_(*filters))
+        stmt = stmt.order_by(desc(BackgroundJob.id)).limit(limit).offset(offset)
+
+        items = [_to_info(record) for record in (await session.execute(stmt)).scalars()]
+        total = (await session.execute(count_stmt)).scalar_one()
+        return total, items
+
+
+async def get_job_stats(*, window_seconds: int = 3600) -> JobStats:
+    since = _utcnow() - timedelta(seconds=window_seconds)
+    async with engine.new_session() as session:
+        session: AsyncSession = session
+        rows = (
+            await session.execute(
+                select(BackgroundJob.status, func.count()).group_by(BackgroundJob.status)
+            )
+        ).all()
+        counts = {status.value: 0 for status in JobStatus}
+        for status, count in rows:
+            counts[status.value] = int(count)
+
+        finished = (
+            await session.execute(
+                select(BackgroundJob.status, func.count())
+                .where(BackgroundJob.finished_at >= since)
+                .group_by(BackgroundJob.status)
+            )
+        ).all()
+        finished_counts = {status: int(count) for status, count in finished}
+
+        average_duration = (
+            await session.execute(
+                select(
+                    func.avg(
+                        func.timestampdiff(
+                            literal_column("SECOND"),
+                            BackgroundJob.started_at,
+                            BackgroundJob.finished_at,
+                        )
+                    )
+                ).where(
+                    (BackgroundJob.status == JobStatus.SUCCEEDED)
+                    & (BackgroundJob.finished_at >= since)
+                )
+            )
+        ).scalar()
+
+    return JobStats(
+        counts=counts,
+        window_seconds=window_seconds,
+        succeeded_in_window=finished_counts.get(JobStatus.SUCCEEDED, 0),
+        failed_in_window=finished_counts.get(JobStatus.FAILED, 0),
+        average_duration_seconds=float(average_duration) if average_duration is not None else None,
+    )
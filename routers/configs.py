@@ -8,6 +8,8 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, ConfigDict
 
 from registries import config_registry
+from services import storage_service
+from services.storage_service.config_defaults import STORAGE_CONFIG_DEFAULTS
 
 router = APIRouter(prefix="/api/config", tags=["config"])
 
@@ -27,6 +29,19 @@ class FeatureFlagUpdate(BaseModel):
     value: bool
 
 
+class StorageSetting(BaseModel):
+    key: str
+    value: str | None
+    secret: bool
+
+
+class StorageSettingUpdate(BaseModel):
+    value: str
+
+
+_SECRET_STORAGE_KEYS = {"backblaze_app_key", "webdav_password", "s3_secret_key"}
+
+
 class FeatureFlagResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -34,21 +49,6 @@ class FeatureFlagResponse(BaseModel):
     placeholders: list[FeatureFlag]
 
 
-async def _get_bool_config(key: str, default: bool | None = None) -> bool | None:
-    value = await config_registry.get_config(key)
-    if value is None:
-        return default
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, str):
-        lowered = value.lower()
-        if lowered in {"true", "1", "yes", "y", "on"}:
-            return True
-        if lowered in {"false", "0", "no", "n", "off"}:
-            return False
-    return default
-
-
 @router.get("/features", response_model=FeatureFlagResponse)
 async def get_feature_flags() -> FeatureFlagResponse:
     """Return active feature flags and placeholder configuration entries."""
@@ -82,7 +82,7 @@ async def get_feature_flags() -> FeatureFlagResponse:
 
     features: list[FeatureFlag] = []
     for definition in feature_definitions:
-        value = await _get_bool_config(definition["key"], definition["default"])
+        value = await config_registry.get_bool_config(definition["key"], definition["default"])
         features.append(
             FeatureFlag(
                 key=definition["key"],
@@ -134,7 +134,7 @@ async def update_feature_flag(key: str, payload: FeatureFlagUpdate) -> FeatureFl
 
     await config_registry.update_config(key, payload.value)
 
-    value = await _get_bool_config(key, payload.value)
+    value = await config_registry.get_bool_config(key, payload.value)
     labels = {
         "allow_r18g": ("允许 R18G", "控制全局是否允许在内容推荐中出现 R18G 资源。", "内容安全"),
         "enable_on_new_group": (
@@ -158,3 +158,33 @@ async def update_feature_flag(key: str, payload: FeatureFlagUpdate) -> FeatureFl
         editable=True,
         category=category,
     )
+
+
+def _storage_setting(key: str, value: str | bool | None) -> StorageSetting:
+    secret = key in _SECRET_STORAGE_KEYS
+    text = None if value is None else str(value)
+    if secret and text:
+        text = "******"
+    return StorageSetting(key=key, value=text, secret=secret)
+
+
+@router.get("/storage", response_model=list[StorageSetting])
+async def get_storage_settings() -> list[StorageSetting]:
+    """Return storage backend settings; secrets are masked."""
+
+    return [
+        _storage_setting(key, await config_registry.get_config(key))
+        for key in STORAGE_CONFIG_DEFAULTS
+    ]
+
+
+@router.put("/storage/{key}", response_model=StorageSetting)
+async def update_storage_setting(key: str, payload: StorageSettingUpdate) -> StorageSetting:
+    """Update a storage setting; the active provider is swapped without a restart."""
+
+    if key not in STORAGE_CONFIG_DEFAULTS:
+        raise HTTPException(status_code=404, detail="Storage setting not found")
+
+    await config_registry.update_config(key, payload.value.strip())
+    storage_service.invalidate_for_key(key)
+    return _storage_setting(key, await config_registry.get_config(key))
@@ -45,7 +45,7 @@ class DashboardSummary(BaseModel):
 async def get_dashboard_summary(limit: int = 10) -> DashboardSummary:
     """Return summarized metrics and latest activity for the dashboard view."""
 
-    async with engine.new_session() as session:
+    async with engine.read_session() as session:
         total_groups = (await session.execute(select(func.count(Group.id)))).scalar_one()
         active_groups = (
             await session.execute(select(func.count(Group.id)).where(Group.enable.is_(True)))
@@ -122,7 +122,7 @@ async def list_groups(
 ) -> GroupListResponse:
     """List groups with aggregated metadata for the administrative UI."""
 
-    async with engine.new_session() as session:
+    async with engine.read_session() as session:
         stmt = (
             select(
                 Group,
@@ -167,7 +167,7 @@ async def list_groups(
 async def get_group_detail(group_id: int, recent_limit: int = Query(default=20, ge=1, le=50)) -> GroupDetail:
     """Retrieve detailed configuration and recent history for a group."""
 
-    async with engine.new_session() as session:
+    async with engine.read_session() as session:
         group = await session.get(Group, group_id)
         if group is None:
             raise HTTPException(status_code=404, detail="Group not found")
@@ -292,7 +292,7 @@ async def get_group_history(
 ) -> list[ChatMessage]:
     """Return a paginated slice of group chat history."""
 
-    async with engine.new_session() as session:
+    async with engine.read_session() as session:
         stmt = select(GroupChatHistory).where(GroupChatHistory.group_id == group_id)
         if before is not None:
             stmt = stmt.where(GroupChatHistory.sent_at < before)
@@ -0,0 +1,67 @@
+"""Search endpoint over group and private chat history."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, ConfigDict
+
+from defines import MessageType
+from services.history_search import history_search
+
+router = APIRouter(prefix="/api/history", tags=["history"])
+
+
+class SearchHitEntry(BaseModel):
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
+
+    chat_id: int
+    message_id: int
+    user_id: int
+    type: MessageType
+    bot_send: bool
+    text: str
+    sent_at: datetime
+
+
+class SearchResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[SearchHitEntry]
+    next_cursor: str | None
+    source: str
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search_history(
+    q: str = Query(min_length=1, max_length=200, description="Text the message must contain"),
+    scope: Literal["group", "private"] = Query(default="group"),
+    group_id: int | None = Query(default=None, description="Restrict to one group (group scope)"),
+    user_id: int | None = Query(default=None, description="Restrict to one sender"),
+    type: MessageType | None = Query(default=None, description="Restrict to one message type"),
+    since: datetime | None = Query(default=None, description="Messages sent at or after"),
+    until: datetime | None = Query(default=None, description="Messages sent before"),
+    cursor: str | None = Query(default=None, description="next_cursor of the previous page"),
+    limit: int = Query(default=50, ge=1, le=200),
+) -> SearchResponse:
+    """Return messages containing ``q``, newest first, with keyset pagination."""
+
+    if scope == "private" and group_id is not None:
+        raise HTTPException(status_code=400, detail="group_id only applies to group history")
+    try:
+        page = await history_search.search(
+            scope,
+            q,
+            chat_id=group_id,
+            user_id=user_id,
+            message_type=type,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return SearchResponse.model_validate(page)
@@ -0,0 +1,113 @@
+"""Endpoints for inspecting the background job queue."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, ConfigDict
+
+from defines import JobStatus
+from registries import job_registry
+from services import history_retention
+from services.storage_service import replication
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+class JobEntry(BaseModel):
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
+
+    id: int
+    kind: str
+    dedupe_key: str | None
+    payload: dict[str, Any]
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_after: datetime | None
+    lease_owner: str | None
+    lease_expires_at: datetime | None
+    checkpoint: dict[str, Any]
+    result: dict[str, Any] | None
+    last_error: str | None
+    created_at: datetime | None
+    updated_at: datetime | None
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+class JobListResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    total: int
+    items: list[JobEntry]
+
+
+class JobStatsResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    counts: dict[str, int]
+    window_seconds: int
+    succeeded_in_window: int
+    failed_in_window: int
+    throughput_per_minute: float
+    average_duration_seconds: float | None
+
+
+@router.get("", response_model=JobListResponse)
+async def list_jobs(
+    status: JobStatus | None = Query(default=None, description="Filter by job status"),
+    kind: str | None = Query(default=None, description="Filter by job kind"),
+    limit: int = Query(default=25, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+) -> JobListResponse:
+    """Return background jobs, newest first."""
+
+    total, items = await job_registry.list_jobs(status=status, kind=kind, limit=limit, offset=offset)
+    return JobListResponse(total=total, items=items)
+
+
+@router.get("/stats", response_model=JobStatsResponse)
+async def get_job_stats(
+    window_seconds: int = Query(default=3600, ge=60, le=7 * 24 * 3600),
+) -> JobStatsResponse:
+    """Return queue depth per status and completion throughput for the window."""
+
+    stats = await job_registry.get_job_stats(window_seconds=window_seconds)
+    throughput = stats.succeeded_in_window / (stats.window_seconds / 60)
+    return JobStatsResponse(
+        counts=stats.counts,
+        window_seconds=stats.window_seconds,
+        succeeded_in_window=stats.succeeded_in_window,
+        failed_in_window=stats.failed_in_window,
+        throughput_per_minute=round(throughput, 3),
+        average_duration_seconds=stats.average_duration_seconds,
+    )
+
+
+@router.get("/{job_id}", response_model=JobEntry)
+async def get_job(job_id: int) -> JobEntry:
+    """Return a single background job."""
+
+    job = await job_registry.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobEntry.model_validate(job)
+
+
+@router.post("/storage-reconcile", response_model=JobEntry)
+async def start_storage_reconcile() -> JobEntry:
+    """Queue a scan that backfills objects missing from storage replicas."""
+
+    job, _ = await replication.enqueue_reconcile()
+    return JobEntry.model_validate(job)
+
+
+@router.post("/history-retention", response_model=JobEntry)
+async def start_history_retention() -> JobEntry:
+    """Queue today's chat history retention run if it is not already pending."""
+
+    job, _ = await history_retention.schedule_retention()
+    return JobEntry.model_validate(job)
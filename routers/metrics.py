@@ -0,0 +1,18 @@
+"""Endpoint exposing in-process runtime metrics."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from services import metrics
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics() -> dict[str, dict[str, Any]]:
+    """Return every counter group collected since the process started."""
+
+    return metrics.snapshot()
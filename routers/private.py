@@ -107,7 +107,7 @@ async def list_private_users(
 ) -> PrivateUserListResponse:
     """List private users along with message statistics."""
 
-    async with engine.new_session() as session:
+    async with engine.read_session() as session:
         stmt = (
             select(
                 User,
@@ -150,7 +150,7 @@ async def get_private_user(
 ) -> PrivateUserDetail:
     """Retrieve detail and recent activity for a single user."""
 
-    async with engine.new_session() as session:
+    async with engine.read_session() as session:
         user = await session.get(User, user_id)
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
@@ -265,7 +265,7 @@ async def get_private_history(
 ) -> list[PrivateMessage]:
     """Return a slice of private chat history for a user."""
 
-    async with engine.new_session() as session:
+    async with engine.read_session() as session:
         stmt = select(PrivateChatHistory).where(PrivateChatHistory.user_id == user_id)
         if before is not None:
             stmt = stmt.where(PrivateChatHistory.sent_at < before)
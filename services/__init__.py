@@ -3,5 +3,7 @@
     storage_service,
     schema_migrator,
     group_guard,
+    job_queue,
+    metrics,
 )
 from .pixiv_service import pixiv
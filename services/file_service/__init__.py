@@ -1,2 +1,2 @@
 from .download_file import download_file
-from .get_file import get_file, get_image
+from .get_file import get_cached_path, get_file, get_file_path, get_image
@@ -8,7 +8,7 @@ from . import file_lock
 from .conf import file_path
 
 
-async def download_file(filename: str, url: str, replace: bool = False):
+async def download_file(filename: str, url: str, replace: bool = False, retries: int = 5):
     dict_lock, lock = file_lock.get_lock(filename)
     file_url = file_path + filename
     async with dict_lock.reader_lock:
@@ -18,7 +18,6 @@ async def download_file(filename: str, url: str, replace: bool = False):
                     raise FileExistsError
                 else:
                     os.remove(file_url)
-            retries = 5
             attempt = 0
             while attempt < retries:
                 try:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import logging
 import os
+import time
 from pathlib import Path
 from urllib.parse import urlparse
 
 import aiofiles
-from registries import config_registry
+import aiohttp
+from services import metrics
 
 from . import file_lock
 from .download_file import download_file
@@ -14,29 +17,29 @@ from .conf import file_path
 from PIL import Image
 
 
+logger = logging.getLogger(__name__)
+
 CACHE_ROOT = Path(file_path).expanduser()
 CACHE_ROOT.mkdir(parents=True, exist_ok=True)
 
-
-_LOCAL_STORAGE_ROOT: Path | None = None
+METRICS_GROUP = "image_source"
+TIER_CACHE = "cache"
+TIER_STORAGE = "storage"
+TIER_ORIGIN = "origin"
+# Our own copies get fewer retries so a broken backend fails over quickly.
+FAILOVER_RETRIES = 2
+ORIGIN_RETRIES = 5
 
 
 async def _get_local_storage_root() -> Path | None:
-    global _LOCAL_STORAGE_ROOT
-    if _LOCAL_STORAGE_ROOT is not None:
-        return _LOCAL_STORAGE_ROOT
+    # The provider caches its root and reloads it when the storage registry is invalidated.
+    from services.storage_service import local_storage
+
     try:
-        config = await config_registry.get_local_storage_config()
+        await local_storage.ensure_ready()
     except Exception:
         return None
-    root_value = config.root_path or "storage"
-    root_path = Path(root_value).expanduser()
-    if not root_path.is_absolute():
-        root_path = (Path.cwd() / root_path).resolve()
-    else:
-        root_path = root_path.resolve()
-    _LOCAL_STORAGE_ROOT = root_path
-    return _LOCAL_STORAGE_ROOT
+    return local_storage.root_path
 
 
 async def _resolve_local_path(path: Path) -> Path:
@@ -56,18 +59,41 @@ async def _copy_local_file(source: Path, destination: Path) -> None:
             await dst.write(chunk)
 
 
-async def _ensure_cached_file(filename: str, url: str | None) -> Path:
-    cache_path = CACHE_ROOT / filename
-    if cache_path.exists():
-        return cache_path
+def _source_tier(url: str) -> str:
+    host = urlparse(url).hostname or ""
+    if host == "pximg.net" or host.endswith(".pximg.net"):
+        return TIER_ORIGIN
+    return TIER_STORAGE
 
-    if url is None:
-        raise FileNotFoundError("没有可用的文件来源")
 
+async def _active_storage():
+    """Return the configured storage provider, or ``None`` if it cannot be used for reads."""
+
+    from services.storage_service import use
+
+    try:
+        storage = await use()
+        if storage is not None:
+            await storage.ensure_ready()
+    except Exception as exc:
+        logger.warning("Storage provider unavailable for reads: %s", exc)
+        return None
+    return storage
+
+
+def _is_missing(exc: Exception) -> bool:
+    """A replica that has not received the object yet is not unhealthy."""
+
+    if isinstance(exc, FileNotFoundError):
+        return True
+    return isinstance(exc, aiohttp.ClientResponseError) and exc.status == 404
+
+
+async def _fetch_into_cache(filename: str, url: str, cache_path: Path, *, retries: int) -> Path:
     parsed = urlparse(url)
     if parsed.scheme in {"http", "https"}:
         try:
-            await download_file(filename, url)
+            await download_file(filename, url, retries=retries)
         except FileExistsError:
             pass
         return cache_path
@@ -92,6 +118,68 @@ async def _ensure_cached_file(filename: str, url: str | None) -> Path:
 
     return cache_path
 
+
+async def _ensure_cached_file(filename: str, url: str | None, origin_url: str | None = None) -> Path:
+    """Materialise ``filename`` in the disk cache, trying each source tier in turn.
+
+    Tiers are the disk cache, our own storage copy (``url``) and the Pixiv
+    origin (``origin_url``). A failing tier is counted and skipped, so Pixiv is
+    only contacted when none of our copies can be read.
+    """
+
+    cache_path = CACHE_ROOT / filename
+    if cache_path.exists():
+        metrics.increment(METRICS_GROUP, f"{TIER_CACHE}_hit")
+        return cache_path
+    metrics.increment(METRICS_GROUP, f"{TIER_CACHE}_miss")
+
+    from services.storage_service import ReplicatedStorage
+
+    replicated: ReplicatedStorage | None = None
+    sources: list[tuple[str, str, str | None]] = []
+    if url:
+        tier = _source_tier(url)
+        storage = await _active_storage() if tier == TIER_STORAGE else None
+        if isinstance(storage, ReplicatedStorage):
+            replicated = storage
+            sources.extend((tier, item.url, item.member) for item in replicated.read_candidates(url))
+        elif storage is not None and storage.object_key(url) is not None:
+            sources.append((tier, storage.read_url(url), None))
+        else:
+            sources.append((tier, url, None))
+    if origin_url and origin_url != url:
+        sources.append((TIER_ORIGIN, origin_url, None))
+    if not sources:
+        raise FileNotFoundError("没有可用的文件来源")
+
+    last_error: Exception | None = None
+    for index, (tier, source, member) in enumerate(sources):
+        is_last = index == len(sources) - 1
+        started = time.monotonic()
+        try:
+            path = await _fetch_into_cache(
+                filename,
+                source,
+                cache_path,
+                retries=ORIGIN_RETRIES if is_last else FAILOVER_RETRIES,
+            )
+        except Exception as exc:
+            metrics.increment(METRICS_GROUP, f"{tier}_error")
+            if replicated is not None and member is not None and not _is_missing(exc):
+                replicated.record_read(member, time.monotonic() - started, ok=False)
+            last_error = exc
+            if not is_last:
+                logger.warning("Image source %s failed for %s, failing over: %s", tier, filename, exc)
+            continue
+        if replicated is not None and member is not None:
+            replicated.record_read(member, time.monotonic() - started, ok=True)
+        metrics.increment(METRICS_GROUP, f"{tier}_hit")
+        return path
+
+    assert last_error is not None
+    raise last_error
+
+
 def _prepare_for_webp(image: Image.Image) -> Image.Image:
     """Return an RGBA copy ready for WebP encoding."""
     if image.mode == "RGBA":
@@ -143,8 +231,21 @@ def compress_image(infile, target_size_mb=10, step=5, quality=95) -> str:
     # print(f"Image compressed to {quality}% and saved as '{outfile}'")
 
 
-async def get_image(filename: str, url: str = None) -> bytes | None:
-    cache_path = await _ensure_cached_file(filename, url)
+def get_cached_path(filename: str) -> Path | None:
+    """Return the on-disk cache path for ``filename`` if it has been fetched."""
+
+    cache_path = CACHE_ROOT / filename
+    return cache_path if cache_path.exists() else None
+
+
+async def get_file_path(filename: str, url: str = None, *, origin_url: str | None = None) -> Path:
+    """Like :func:`get_file` but return the disk-cache path instead of the bytes."""
+
+    return await _ensure_cached_file(filename, url, origin_url)
+
+
+async def get_image(filename: str, url: str = None, *, origin_url: str | None = None) -> bytes | None:
+    cache_path = await _ensure_cached_file(filename, url, origin_url)
     dict_lock, lock = file_lock.get_lock(filename)
     async with dict_lock.reader_lock:
         async with lock:
@@ -155,8 +256,8 @@ async def get_image(filename: str, url: str = None) -> bytes | None:
                 return await f.read()
 
 
-async def get_file(filename: str, url: str = None) -> bytes | None:
-    cache_path = await _ensure_cached_file(filename, url)
+async def get_file(filename: str, url: str = None, *, origin_url: str | None = None) -> bytes | None:
+    cache_path = await _ensure_cached_file(filename, url, origin_url)
     dict_lock, lock = file_lock.get_lock(filename)
     async with dict_lock.reader_lock:
         async with lock:
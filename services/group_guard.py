@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 import random
 import re
 import string
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Iterable
 
 from sqlalchemy import delete, select
@@ -18,6 +17,7 @@ from models import (
     GroupGuardSettings,
 )
 from registries import engine
+from services.telegram_cache import cached_value, invalidate_value
 
 logger = logging.getLogger(__name__)
 
@@ -56,23 +56,14 @@ class PendingVerification:
         return current >= expires
 
 
-_SETTINGS_CACHE_TTL = timedelta(seconds=30)
-_KEYWORD_CACHE_TTL = timedelta(seconds=30)
+_SETTINGS_CACHE_NAMESPACE = "guard_settings"
+_SETTINGS_CACHE_TTL_SECONDS = 30
+_KEYWORD_CACHE_NAMESPACE = "guard_keywords"
+_KEYWORD_CACHE_TTL_SECONDS = 30
 MAX_KEYWORD_PATTERN_LENGTH = 512
 
-_settings_cache: dict[int, tuple[GuardSettings, datetime]] = {}
-_keyword_cache: dict[int, tuple[list[KeywordRule], datetime]] = {}
-_cache_lock = asyncio.Lock()
-
-
-async def get_guard_settings(group_id: int) -> GuardSettings:
-    async with _cache_lock:
-        cached = _settings_cache.get(group_id)
-        if cached:
-            value, stored_at = cached
-            if datetime.now(timezone.utc) - stored_at <= _SETTINGS_CACHE_TTL:
-                return value
 
+async def _load_guard_settings(group_id: int) -> GuardSettings:
     async with engine.new_session() as session:
         session = session  # type: AsyncSession
         record = await session.get(GroupGuardSettings, group_id)
@@ -82,7 +73,7 @@ async def get_guard_settings(group_id: int) -> GuardSettings:
             await session.commit()
             await session.refresh(record)
 
-        settings = GuardSettings(
+        return GuardSettings(
             group_id=record.group_id,
             verification_enabled=bool(record.verification_enabled),
             verification_timeout=int(record.verification_timeout or 60),
@@ -91,15 +82,19 @@ async def get_guard_settings(group_id: int) -> GuardSettings:
             kick_on_timeout=bool(record.kick_on_timeout),
         )
 
-    async with _cache_lock:
-        _settings_cache[group_id] = (settings, datetime.now(timezone.utc))
 
-    return settings
+async def get_guard_settings(group_id: int) -> GuardSettings:
+    return await cached_value(
+        _SETTINGS_CACHE_NAMESPACE,
+        group_id,
+        lambda: _load_guard_settings(group_id),
+        ttl_seconds=_SETTINGS_CACHE_TTL_SECONDS,
+        decode=lambda data: GuardSettings(**data),
+    )
 
 
 async def _invalidate_settings_cache(group_id: int) -> None:
-    async with _cache_lock:
-        _settings_cache.pop(group_id, None)
+    await invalidate_value(_SETTINGS_CACHE_NAMESPACE, group_id)
 
 
 async def set_verification_enabled(group_id: int, enabled: bool) -> GuardSettings:
@@ -170,20 +165,13 @@ async def set_kick_on_timeout(group_id: int, enabled: bool) -> GuardSettings:
     return await get_guard_settings(group_id)
 
 
-async def list_keyword_rules(group_id: int) -> list[KeywordRule]:
-    async with _cache_lock:
-        cached = _keyword_cache.get(group_id)
-        if cached:
-            value, stored_at = cached
-            if datetime.now(timezone.utc) - stored_at <= _KEYWORD_CACHE_TTL:
-                return list(value)
-
+async def _load_keyword_rules(group_id: int) -> list[KeywordRule]:
     async with engine.new_session() as session:
         session = session  # type: AsyncSession
         result = await session.execute(
             select(GroupGuardKeywordRule).where(GroupGuardKeywordRule.group_id == group_id)
         )
-        rules = [
+        return [
             KeywordRule(
                 id=rule.id,
                 pattern=rule.pattern,
@@ -193,15 +181,20 @@ async def list_keyword_rules(group_id: int) -> list[KeywordRule]:
             for rule in result.scalars().all()
         ]
 
-    async with _cache_lock:
-        _keyword_cache[group_id] = (rules, datetime.now(timezone.utc))
 
+async def list_keyword_rules(group_id: int) -> list[KeywordRule]:
+    rules = await cached_value(
+        _KEYWORD_CACHE_NAMESPACE,
+        group_id,
+        lambda: _load_keyword_rules(group_id),
+        ttl_seconds=_KEYWORD_CACHE_TTL_SECONDS,
+        decode=lambda rows: [KeywordRule(**row) for row in rows],
+    )
     return list(rules)
 
 
 async def _invalidate_keyword_cache(group_id: int) -> None:
-    async with _cache_lock:
-        _keyword_cache.pop(group_id, None)
+    await invalidate_value(_KEYWORD_CACHE_NAMESPACE, group_id)
 
 
 async def add_keyword_rule(
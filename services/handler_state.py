@@ -0,0 +1,137 @@
+"""Cached store for the active message handler (pending prompt) of each user.
+
+Reads go through the shared Telegram cache, in memory with the optional Redis
+tier, and absent state is cached too, so ordinary chat never reaches the
+database. Writes go to the database first and then replace the cached value.
+Prompts left unanswered for ``PROMPT_TTL_SECONDS`` are treated as abandoned.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+
+from registries import active_message_handler_registry
+from services import metrics
+from services.telegram_cache import cached_value, store_value
+
+logger = logging.getLogger(__name__)
+
+METRICS_GROUP = "handler_state"
+_CACHE_NAMESPACE = "handler_state"
+PROMPT_TTL_SECONDS = 1800
+# Cached state is re-read from the database at least this often.
+CACHE_TTL_SECONDS = 600
+
+# Handler keys resolved for the update being dispatched, keyed by (user_id, group_id).
+_pinned: ContextVar[dict[tuple[int, int], str | None] | None] = ContextVar(
+    "handler_state", default=None
+)
+
+
+def _cache_key(user_id: int, group_id: int) -> str:
+    return f"{user_id}:{group_id}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _cached_form(handler_id: str | None, updated_at: datetime | None) -> list | None:
+    if not handler_id:
+        return None
+    written = updated_at or _utcnow()
+    return [handler_id, (written + timedelta(seconds=PROMPT_TTL_SECONDS)).isoformat()]
+
+
+async def _load(user_id: int, group_id: int) -> list | None:
+    metrics.increment(METRICS_GROUP, "db_reads")
+    handler_id, updated_at = await active_message_handler_registry.get_with_timestamp(user_id, group_id)
+    # Rows from before updated_at was tracked count as written now.
+    return _cached_form(handler_id, updated_at)
+
+
+async def _read(user_id: int, group_id: int) -> str | None:
+    cached = await cached_value(
+        _CACHE_NAMESPACE,
+        _cache_key(user_id, group_id),
+        lambda: _load(user_id, group_id),
+        ttl_seconds=CACHE_TTL_SECONDS,
+    )
+    if cached is None:
+        return None
+    handler_id, expires_at = cached
+    if datetime.fromisoformat(expires_at) <= _utcnow():
+        logger.info("Discarding abandoned prompt %s of user %s", handler_id, user_id)
+        metrics.increment(METRICS_GROUP, "expired")
+        await delete(user_id, group_id)
+        return None
+    return handler_id
+
+
+async def get(user_id: int, group_id: int = 0) -> str | None:
+    keys = _pinned.get()
+    if keys is not None and (user_id, group_id) in keys:
+        return keys[(user_id, group_id)]
+    return await _read(user_id, group_id)
+
+
+async def set(user_id: int, group_id: int = 0, handler_id: str = "") -> None:
+    updated_at = await active_message_handler_registry.set(
+        user_id=user_id, group_id=group_id, handler_id=handler_id
+    )
+    await store_value(
+        _CACHE_NAMESPACE,
+        _cache_key(user_id, group_id),
+        _cached_form(handler_id, updated_at),
+        ttl_seconds=CACHE_TTL_SECONDS,
+    )
+    _update_pinned(user_id, group_id, handler_id or None)
+
+
+async def delete(user_id: int, group_id: int = 0) -> None:
+    await active_message_handler_registry.delete(user_id=user_id, group_id=group_id)
+    # Cache the absence so the next message does not go back to the database.
+    await store_value(
+        _CACHE_NAMESPACE, _cache_key(user_id, group_id), None, ttl_seconds=CACHE_TTL_SECONDS
+    )
+    _update_pinned(user_id, group_id, None)
+
+
+def _update_pinned(user_id: int, group_id: int, handler_id: str | None) -> None:
+    keys = _pinned.get()
+    if keys is not None and (user_id, group_id) in keys:
+        keys[(user_id, group_id)] = handler_id
+
+
+@asynccontextmanager
+async def pinned(user_id: int, chat_id: int) -> AsyncIterator[dict[tuple[int, int], str | None]]:
+    """Resolve the user's handler keys for ``chat_id`` and the global scope once.
+
+    Inside the block :func:`get` is answered from the resolved keys and
+    :func:`set`/:func:`delete` keep them current.
+    """
+
+    keys = {(user_id, group_id): await _read(user_id, group_id) for group_id in {0, chat_id}}
+    token = _pinned.set(keys)
+    try:
+        yield keys
+    finally:
+        _pinned.reset(token)
+
+
+async def purge_abandoned() -> int:
+    """Delete prompts older than the TTL; cached copies expire on their own."""
+
+    removed = await active_message_handler_registry.delete_written_before(
+        _utcnow() - timedelta(seconds=PROMPT_TTL_SECONDS)
+    )
+    if removed:
+        logger.info("Removed %d abandoned message handler prompt(s)", removed)
+    return removed
+
+
+__all__ = ["delete", "get", "pinned", "purge_abandoned", "set"]
@@ -0,0 +1,171 @@
+"""Expire old chat history, optionally archiving it to storage first."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, inspect, select
+
+from models import GroupChatHistory, PrivateChatHistory
+from registries import config_registry, engine
+from registries.job_registry import JobInfo
+from services import metrics, schema_migrator, storage_service
+from services.history_search import history_search
+from services.job_queue import JobContext, PermanentJobError, enqueue, job_handler
+
+logger = logging.getLogger(__name__)
+
+RETENTION_JOB = "history_retention"
+RUN_INTERVAL = timedelta(days=1)
+METRICS_GROUP = "history_retention"
+DELETE_BATCH_SIZE = 5_000
+# Pause between delete batches so replication and the bot's writes keep up.
+DELETE_PAUSE_SECONDS = 0.5
+ARCHIVE_BATCH_SIZE = 5_000
+ARCHIVE_FOLDER = "archive/chat_history"
+
+# scope -> (model, history table suffix, retention config key)
+_SCOPES = {
+    "group": (GroupChatHistory, "group_chat_history", "history_retention_group_days"),
+    "private": (PrivateChatHistory, "private_chat_history", "history_retention_private_days"),
+}
+
+
+async def schedule_retention(run_on: date | None = None) -> tuple[JobInfo, bool]:
+    """Queue the retention run for ``run_on`` (today by default); one job per day."""
+
+    now = datetime.now(timezone.utc)
+    run_on = run_on or now.date()
+    start = datetime.combine(run_on, datetime.min.time(), timezone.utc)
+    return await enqueue(
+        RETENTION_JOB,
+        {},
+        dedupe_key=f"{RETENTION_JOB}:{run_on.isoformat()}",
+        max_attempts=3,
+        delay_seconds=max((start - now).total_seconds(), 0),
+    )
+
+
+def _row_to_json(row: Any) -> str:
+    values: dict[str, Any] = {}
+    for column in inspect(row).mapper.column_attrs:
+        value = getattr(row, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Enum):
+            value = value.value
+        values[column.key] = value
+    return json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+
+
+async def _archive(scope: str, model, cutoff: datetime) -> int:
+    """Export rows older than ``cutoff`` as gzipped NDJSON to storage; returns the row count."""
+
+    storage = await storage_service.use()
+    if storage is None:
+        raise PermanentJobError("已启用聊天记录归档，但未配置存储服务")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / f"{scope}-before-{cutoff:%Y%m%d%H%M%S}.ndjson.gz"
+        count = 0
+        with gzip.open(path, "wt", encoding="utf-8") as archive:
+            async with engine.new_session() as session:
+                result = await session.stream_scalars(
+                    select(model)
+                    .where(model.sent_at < cutoff)
+                    .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+                )
+                async for rows in result.partitions():
+                    chunk = "".join(_row_to_json(row) + "\n" for row in rows)
+                    await asyncio.to_thread(archive.write, chunk)
+                    count += len(rows)
+        if count:
+            await storage.upload_file(path, path.name, ARCHIVE_FOLDER)
+    metrics.increment(METRICS_GROUP, "rows_archived", count)
+    return count
+
+
+async def _delete_expired(model, cutoff: datetime) -> int:
+    deleted = 0
+    while True:
+        async with engine.new_session() as session:
+            result = await session.execute(
+                delete(model)
+                .where(model.sent_at < cutoff)
+                .with_dialect_options(mysql_limit=DELETE_BATCH_SIZE)
+            )
+            await session.commit()
+        deleted += result.rowcount or 0
+        if (result.rowcount or 0) < DELETE_BATCH_SIZE:
+            break
+        await asyncio.sleep(DELETE_PAUSE_SECONDS)
+    metrics.increment(METRICS_GROUP, "rows_deleted", deleted)
+    return deleted
+
+
+async def _expire_scope(scope: str, cutoff: datetime, *, archive: bool) -> dict[str, Any]:
+    model, table, _ = _SCOPES[scope]
+    archived = await _archive(scope, model, cutoff) if archive else 0
+
+    # Whole months past the cutoff go with a metadata-only partition drop.
+    partitions = await schema_migrator.list_history_partitions(engine.engine, table)
+    expired = [
+        partition.name
+        for partition in partitions
+        if partition.upper_bound is not None and partition.upper_bound <= cutoff.date()
+    ]
+    await schema_migrator.drop_history_partitions(engine.engine, table, expired)
+    metrics.increment(METRICS_GROUP, "partitions_dropped", len(expired))
+
+    # The month straddling the cutoff (or an unpartitioned table) is trimmed in batches.
+    deleted = await _delete_expired(model, cutoff)
+    history_search.discard_before(scope, cutoff)
+    logger.info(
+        "Expired %s chat history before %s: %d partition(s) dropped, %d row(s) deleted, %d archived",
+        scope,
+        cutoff,
+        len(expired),
+        deleted,
+        archived,
+    )
+    return {
+        "cutoff": cutoff.isoformat(),
+        "partitions_dropped": expired,
+        "rows_deleted": deleted,
+        "rows_archived": archived,
+    }
+
+
+@job_handler(RETENTION_JOB)
+async def run_retention(context: JobContext) -> dict[str, Any]:
+    # Queue tomorrow's run first so a failing run does not end the schedule.
+    await schedule_retention(datetime.now(timezone.utc).date() + RUN_INTERVAL)
+    await schema_migrator.ensure_history_partitions(engine.engine)
+
+    snapshot = await config_registry.get_snapshot()
+    archive = bool(snapshot.get_bool("history_archive_enabled", False))
+    done: list[str] = list(context.checkpoint.get("done") or [])
+    summary: dict[str, Any] = dict(context.checkpoint.get("summary") or {})
+
+    for scope, (_, _, config_key) in _SCOPES.items():
+        if scope in done:
+            continue
+        days = snapshot.get_int(config_key, 0, minimum=0)
+        if days:
+            # sent_at is stored as naive UTC.
+            cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+            summary[scope] = await _expire_scope(scope, cutoff, archive=archive)
+        done.append(scope)
+        await context.save_checkpoint(done=done, summary=summary)
+    return summary
+
+
+__all__ = ["RETENTION_JOB", "run_retention", "schedule_retention"]
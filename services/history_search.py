@@ -0,0 +1,384 @@
+"""Substring search over chat history backed by an in-process bigram index.
+
+The newest ``HISTORY_SEARCH_INDEX_SIZE`` text messages of each scope are kept
+in memory, loaded at startup and fed by the history writer. Searches inside
+that window never touch the database; older pages fall back to a keyset scan.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import heapq
+import logging
+import time
+import unicodedata
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Sequence
+
+from configs import config as file_config
+from defines import MessageType
+from registries import chat_history_registry
+from registries.chat_history_registry import HistoryKey
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+METRICS_GROUP = "history_search"
+SCOPES = ("group", "private")
+# Latency percentiles are computed over this many recent searches.
+LATENCY_WINDOW = 1024
+# Posting lists are rebuilt once this share of their entries points at removed messages.
+_COMPACT_RATIO = 0.5
+
+
+@dataclass(slots=True)
+class SearchHit:
+    chat_id: int
+    message_id: int
+    user_id: int
+    type: MessageType
+    bot_send: bool
+    text: str
+    sent_at: datetime
+
+    @property
+    def key(self) -> HistoryKey:
+        return HistoryKey(self.sent_at, self.chat_id, self.message_id)
+
+
+@dataclass(slots=True)
+class SearchPage:
+    items: list[SearchHit]
+    next_cursor: str | None
+    source: str
+
+
+def _fold(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def _bigrams(folded: str) -> set[str]:
+    return {folded[index:index + 2] for index in range(len(folded) - 1)}
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_cursor(key: HistoryKey) -> str:
+    raw = f"{key.sent_at.isoformat()}|{key.chat_id}|{key.message_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> HistoryKey:
+    """Parse a cursor produced by :func:`encode_cursor`; raises ``ValueError`` if malformed."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sent_at, chat_id, message_id = raw.split("|")
+        return HistoryKey(datetime.fromisoformat(sent_at), int(chat_id), int(message_id))
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid search cursor") from exc
+
+
+class _BigramIndex:
+    """Bounded index of one scope's newest messages.
+
+    ``horizon`` is the newest ``sent_at`` that has been evicted: the index is
+    complete for messages after it. ``None`` means nothing was ever evicted.
+    """
+
+    def __init__(self, max_messages: int) -> None:
+        self.max_messages = max_messages
+        self.horizon: datetime | None = None
+        self.ready = False
+        self._next_id = 0
+        self._hits: dict[int, SearchHit] = {}
+        self._folded: dict[int, str] = {}
+        self._ids: dict[tuple[int, int], int] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._by_age: list[tuple[datetime, int]] = []
+        self._stale_postings = 0
+        self._live_postings = 0
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return key in self._ids
+
+    def add(self, hit: SearchHit) -> None:
+        if self.horizon is not None and hit.sent_at <= self.horizon:
+            return
+        previous = self._ids.get((hit.chat_id, hit.message_id))
+        if previous is not None:
+            # Edited messages are re-logged under the same key.
+            self._remove(previous)
+
+        doc_id = self._next_id
+        self._next_id += 1
+        folded = _fold(hit.text)
+        self._hits[doc_id] = hit
+        self._folded[doc_id] = folded
+        self._ids[(hit.chat_id, hit.message_id)] = doc_id
+        grams = _bigrams(folded)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(doc_id)
+        self._live_postings += len(grams)
+        heapq.heappush(self._by_age, (hit.sent_at, doc_id))
+
+        while len(self._hits) > self.max_messages:
+            sent_at, oldest = heapq.heappop(self._by_age)
+            if oldest in self._hits:
+                self._remove(oldest)
+                self.horizon = sent_at if self.horizon is None else max(self.horizon, sent_at)
+        self._maybe_compact()
+
+    def discard_before(self, cutoff: datetime) -> int:
+        """Drop messages sent before ``cutoff``; they no longer exist in the database."""
+
+        removed = 0
+        while self._by_age and self._by_age[0][0] < cutoff:
+            _, doc_id = heapq.heappop(self._by_age)
+            if doc_id in self._hits:
+                self._remove(doc_id)
+                removed += 1
+        self._maybe_compact()
+        return removed
+
+    def remove(self, chat_id: int, message_id: int) -> bool:
+        """Drop the message if indexed; returns whether it was."""
+
+        doc_id = self._ids.get((chat_id, message_id))
+        if doc_id is None:
+            return False
+        self._remove(doc_id)
+        self._maybe_compact()
+        return True
+
+    def _remove(self, doc_id: int) -> None:
+        hit = self._hits.pop(doc_id)
+        grams = len(_bigrams(self._folded.pop(doc_id)))
+        self._live_postings -= grams
+        self._stale_postings += grams
+        if self._ids.get((hit.chat_id, hit.message_id)) == doc_id:
+            del self._ids[(hit.chat_id, hit.message_id)]
+
+    def _maybe_compact(self) -> None:
+        if self._stale_postings <= (self._stale_postings + self._live_postings) * _COMPACT_RATIO:
+            return
+        self._postings = {}
+        for doc_id, folded in self._folded.items():
+            for gram in _bigrams(folded):
+                self._postings.setdefault(gram, []).append(doc_id)
+        self._by_age = [(hit.sent_at, doc_id) for doc_id, hit in self._hits.items()]
+        heapq.heapify(self._by_age)
+        self._stale_postings = 0
+
+    def search(
+        self,
+        needle: str,
+        *,
+        chat_id: int | None,
+        user_id: int | None,
+        message_type: MessageType | None,
+        since: datetime | None,
+        until: datetime | None,
+        before: HistoryKey | None,
+        limit: int,
+    ) -> list[SearchHit]:
+        folded = _fold(needle)
+        grams = _bigrams(folded)
+        if grams:
+            # The rarest bigram bounds the candidates; the substring check confirms them.
+            candidates: Iterable[int] = min(
+                (self._postings.get(gram, []) for gram in grams), key=len
+            )
+        else:
+            candidates = list(self._hits)
+
+        matches: list[SearchHit] = []
+        for doc_id in candidates:
+            hit = self._hits.get(doc_id)
+            if hit is None or folded not in self._folded[doc_id]:
+                continue
+            if chat_id is not None and hit.chat_id != chat_id:
+                continue
+            if user_id is not None and hit.user_id != user_id:
+                continue
+            if message_type is not None and hit.type != message_type:
+                continue
+            if since is not None and hit.sent_at < since:
+                continue
+            if until is not None and hit.sent_at >= until:
+                continue
+            if self.horizon is not None and hit.sent_at <= self.horizon:
+                continue
+            if before is not None and hit.key >= before:
+                continue
+            matches.append(hit)
+        return heapq.nlargest(limit, matches, key=lambda hit: hit.key)
+
+
+def _row_hit(scope: str, row: Any) -> SearchHit:
+    return SearchHit(
+        chat_id=row.group_id if scope == "group" else row.user_id,
+        message_id=row.message_id,
+        user_id=row.user_id,
+        type=row.type,
+        bot_send=row.bot_send,
+        text=row.text or "",
+        sent_at=_naive_utc(row.sent_at),
+    )
+
+
+class HistorySearch:
+    def __init__(self, max_messages: int) -> None:
+        self.enabled = max_messages > 0
+        self._indexes = {scope: _BigramIndex(max_messages) for scope in SCOPES}
+        self._task: asyncio.Task[None] | None = None
+        self._latencies: dict[str, deque[float]] = {
+            source: deque(maxlen=LATENCY_WINDOW) for source in ("index", "scan")
+        }
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._load(), name="history-search-load")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _load(self) -> None:
+        for scope, index in self._indexes.items():
+            try:
+                rows = await chat_history_registry.recent_history(scope, index.max_messages)
+            except Exception:
+                logger.exception("Failed to load %s history into the search index", scope)
+                continue
+            for row in reversed(rows):
+                hit = _row_hit(scope, row)
+                # Messages indexed live while loading are newer than this snapshot.
+                if (hit.chat_id, hit.message_id) not in index:
+                    index.add(hit)
+            if rows and len(rows) >= index.max_messages:
+                oldest = _naive_utc(rows[-1].sent_at)
+                index.horizon = oldest if index.horizon is None else max(index.horizon, oldest)
+            index.ready = True
+            logger.info("Loaded %d %s message(s) into the search index", len(index), scope)
+
+    def index_rows(self, scope: str, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Add freshly written history rows.
+
+        A row without text removes the message, since an edit may have cleared it.
+        """
+
+        if not self.enabled:
+            return
+        index = self._indexes[scope]
+        chat_column = "group_id" if scope == "group" else "user_id"
+        for row in rows:
+            if not row.get("text"):
+                index.remove(row[chat_column], row["message_id"])
+                continue
+            index.add(
+                SearchHit(
+                    chat_id=row[chat_column],
+                    message_id=row["message_id"],
+                    user_id=row["user_id"],
+                    type=row["type"],
+                    bot_send=row["bot_send"],
+                    text=row["text"],
+                    sent_at=_naive_utc(row["sent_at"]),
+                )
+            )
+
+    def discard_before(self, scope: str, cutoff: datetime) -> None:
+        if self.enabled:
+            self._indexes[scope].discard_before(cutoff)
+
+    async def search(
+        self,
+        scope: str,
+        needle: str,
+        *,
+        chat_id: int | None = None,
+        user_id: int | None = None,
+        message_type: MessageType | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> SearchPage:
+        """Return one page of matches, newest first; raises ``ValueError`` for a bad cursor."""
+
+        started = time.perf_counter()
+        before = decode_cursor(cursor) if cursor else None
+        since = _naive_utc(since) if since is not None else None
+        until = _naive_utc(until) if until is not None else None
+        filters = dict(chat_id=chat_id, user_id=user_id, message_type=message_type, since=since, until=until)
+
+        index = self._indexes[scope]
+        hits: list[SearchHit] = []
+        source = "scan"
+        scan = True
+        not_after: datetime | None = None
+        if self.enabled and index.ready:
+            source = "index"
+            hits = index.search(needle, before=before, limit=limit + 1, **filters)
+            # The index is complete after its horizon; only older rows need a scan.
+            scan = index.horizon is not None
+            not_after = index.horizon
+
+        if scan and len(hits) <= limit:
+            rows = await chat_history_registry.search_history(
+                scope,
+                needle,
+                not_after=not_after,
+                before=before,
+                limit=limit + 1 - len(hits),
+                **filters,
+            )
+            hits.extend(_row_hit(scope, row) for row in rows)
+            if rows and source == "index":
+                source = "index+scan"
+
+        next_cursor = encode_cursor(hits[limit - 1].key) if len(hits) > limit else None
+        self._record(source, time.perf_counter() - started)
+        return SearchPage(items=hits[:limit], next_cursor=next_cursor, source=source)
+
+    def _record(self, source: str, elapsed: float) -> None:
+        metrics.increment(METRICS_GROUP, "queries")
+        # A page that also scanned the database is timed as a scan.
+        self._latencies["index" if source == "index" else "scan"].append(elapsed)
+
+    def stats(self) -> dict[str, Any]:
+        values: dict[str, Any] = {}
+        for source, samples in self._latencies.items():
+            ordered = sorted(samples)
+            if ordered:
+                values[f"{source}_p50_ms"] = round(ordered[len(ordered) // 2] * 1000, 2)
+                values[f"{source}_p95_ms"] = round(ordered[int(len(ordered) * 0.95)] * 1000, 2)
+            values[f"{source}_samples"] = len(ordered)
+        for scope, index in self._indexes.items():
+            values[f"{scope}_indexed"] = len(index)
+            values[f"{scope}_ready"] = index.ready
+        return values
+
+
+history_search = HistorySearch(file_config.history_search_index_size)
+metrics.register_provider(METRICS_GROUP, history_search.stats)
+
+
+__all__ = ["HistorySearch", "SearchHit", "SearchPage", "history_search"]
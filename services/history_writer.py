@@ -0,0 +1,231 @@
+"""Write-behind queue that persists chat history in batches."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from registries import chat_history_registry
+from services import metrics
+from services.history_search import history_search
+
+logger = logging.getLogger(__name__)
+
+METRICS_GROUP = "chat_history"
+# Flush whenever this many records are pending or the oldest has waited this long.
+FLUSH_MAX_ROWS = 500
+FLUSH_INTERVAL_SECONDS = 0.2
+# Producers wait once this many records are queued.
+MAX_PENDING = 10_000
+FLUSH_RETRIES = 3
+FLUSH_RETRY_DELAY_SECONDS = 1.0
+# Profiles whose fingerprint matches what was last written are not upserted
+# again; fingerprints expire so rows edited elsewhere are eventually re-synced.
+FINGERPRINT_CACHE_SIZE = 50_000
+FINGERPRINT_TTL_SECONDS = 600.0
+_SKIP_WINDOW_SECONDS = 60.0
+
+
+@dataclass(slots=True)
+class HistoryRecord:
+    """One message to persist along with the profile data it carries."""
+
+    user_id: int
+    nick_name: str | None
+    row: dict[str, Any]
+    group_id: int | None = None
+    group_name: str | None = None
+    admin_ids: list[int] | None = None
+
+
+class _FingerprintCache:
+    """Bounded LRU of the profile values last written per user or group."""
+
+    def __init__(self, max_entries: int = FINGERPRINT_CACHE_SIZE) -> None:
+        self._entries: OrderedDict[int, tuple[int, float]] = OrderedDict()
+        self._max_entries = max_entries
+
+    def matches(self, key: int, fingerprint: int, now: float) -> bool:
+        cached = self._entries.get(key)
+        if cached is None or cached[0] != fingerprint or now - cached[1] > FINGERPRINT_TTL_SECONDS:
+            return False
+        self._entries.move_to_end(key)
+        return True
+
+    def store(self, key: int, fingerprint: int, now: float) -> None:
+        self._entries[key] = (fingerprint, now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _group_fingerprint(name: str | None, admin_ids: list[int] | None) -> int:
+    return hash((name, tuple(sorted(admin_ids)) if admin_ids is not None else None))
+
+
+class HistoryWriter:
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[HistoryRecord] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._in_flight: list[HistoryRecord] = []
+        self._user_fingerprints = _FingerprintCache()
+        self._group_fingerprints = _FingerprintCache()
+        self._skipped: deque[tuple[float, int]] = deque()
+
+    def _record_skipped(self, count: int, now: float) -> None:
+        if count:
+            self._skipped.append((now, count))
+            metrics.increment(METRICS_GROUP, "profile_writes_skipped", count)
+        while self._skipped and now - self._skipped[0][0] > _SKIP_WINDOW_SECONDS:
+            self._skipped.popleft()
+
+    def stats(self) -> dict[str, int]:
+        self._record_skipped(0, time.monotonic())
+        return {
+            "pending": self.pending(),
+            "profile_writes_skipped_last_minute": sum(count for _, count in self._skipped),
+            "fingerprints": len(self._user_fingerprints) + len(self._group_fingerprints),
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=MAX_PENDING)
+        self._task = asyncio.create_task(self._run(), name="history-writer")
+        logger.info("Started chat history writer")
+
+    async def stop(self) -> None:
+        """Stop the writer after flushing everything still queued."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        # Upserts are idempotent, so re-writing an interrupted batch is safe.
+        batch, self._in_flight = self._in_flight, []
+        batch.extend(self._drain(FLUSH_MAX_ROWS - len(batch)))
+        while batch:
+            await self._flush(batch)
+            batch = self._drain(FLUSH_MAX_ROWS)
+        logger.info("Stopped chat history writer")
+
+    async def submit(self, record: HistoryRecord) -> None:
+        """Queue ``record``; waits while the queue is full, writes directly when stopped."""
+
+        if not self.running:
+            await self._flush([record])
+            return
+        await self._queue.put(record)
+
+    def _drain(self, limit: int) -> list[HistoryRecord]:
+        records: list[HistoryRecord] = []
+        while len(records) < limit:
+            try:
+                records.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return records
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Collected straight into _in_flight so stop() can flush a partial batch.
+            batch = self._in_flight = [await self._queue.get()]
+            deadline = loop.time() + FLUSH_INTERVAL_SECONDS
+            while len(batch) < FLUSH_MAX_ROWS:
+                batch.extend(self._drain(FLUSH_MAX_ROWS - len(batch)))
+                remaining = deadline - loop.time()
+                if len(batch) >= FLUSH_MAX_ROWS or remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+            self._in_flight = []
+
+    async def _flush(self, records: list[HistoryRecord]) -> None:
+        users: dict[int, str | None] = {}
+        groups: dict[int, tuple[str | None, list[int] | None]] = {}
+        group_rows: list[dict[str, Any]] = []
+        private_rows: list[dict[str, Any]] = []
+        for record in records:
+            users[record.user_id] = record.nick_name
+            if record.group_id is None:
+                private_rows.append(record.row)
+                continue
+            previous_name, previous_admins = groups.get(record.group_id, (None, None))
+            groups[record.group_id] = (
+                record.group_name or previous_name,
+                record.admin_ids if record.admin_ids is not None else previous_admins,
+            )
+            group_rows.append(record.row)
+
+        now = time.monotonic()
+        user_fingerprints = {user_id: hash(nick_name) for user_id, nick_name in users.items()}
+        group_fingerprints = {
+            group_id: _group_fingerprint(*profile) for group_id, profile in groups.items()
+        }
+        changed_users = {
+            user_id: nick_name
+            for user_id, nick_name in users.items()
+            if not self._user_fingerprints.matches(user_id, user_fingerprints[user_id], now)
+        }
+        changed_groups = {
+            group_id: profile
+            for group_id, profile in groups.items()
+            if not self._group_fingerprints.matches(group_id, group_fingerprints[group_id], now)
+        }
+        self._record_skipped(len(users) - len(changed_users) + len(groups) - len(changed_groups), now)
+
+        for attempt in range(1, FLUSH_RETRIES + 1):
+            try:
+                await chat_history_registry.write_chat_batch(
+                    users=changed_users,
+                    groups=changed_groups,
+                    group_rows=group_rows,
+                    private_rows=private_rows,
+                )
+            except Exception:
+                if attempt == FLUSH_RETRIES:
+                    logger.exception(
+                        "Dropping %d chat history record(s) after failed flushes", len(records)
+                    )
+                    metrics.increment(METRICS_GROUP, "dropped", len(records))
+                    return
+                await asyncio.sleep(FLUSH_RETRY_DELAY_SECONDS * attempt)
+            else:
+                break
+
+        history_search.index_rows("group", group_rows)
+        history_search.index_rows("private", private_rows)
+        for user_id in changed_users:
+            self._user_fingerprints.store(user_id, user_fingerprints[user_id], now)
+        for group_id in changed_groups:
+            self._group_fingerprints.store(group_id, group_fingerprints[group_id], now)
+        metrics.increment(METRICS_GROUP, "flushes")
+        metrics.increment(METRICS_GROUP, "rows_written", len(records))
+
+
+history_writer = HistoryWriter()
+metrics.register_provider(METRICS_GROUP, history_writer.stats)
+
+
+__all__ = ["HistoryRecord", "HistoryWriter", "history_writer"]
@@ -3,16 +3,17 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass, field
 from io import BytesIO
-from typing import Sequence
+from pathlib import Path
+from typing import Awaitable, Callable, Mapping, Sequence
 
-from telegram import Bot
+from telegram import Bot, InputMediaDocument, InputMediaPhoto, Message
 from telegram.error import TelegramError
 
 from models import Illustration
 from registries import config_registry, illust_registry
-from services.file_service import get_file
+from services.file_service import get_file_path
 from services.pixiv_service import pixiv
-from services.storage_service import use as use_storage
+from services.storage_service import Storage, use as use_storage
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,7 @@ class ImportedPage:
     storage_url: str
     compressed_file_id: str | None
     original_file_id: str | None
+    reused: bool = False
 
 
 @dataclass(slots=True)
@@ -49,7 +51,7 @@ def _unique_chat_ids(chat_ids: Sequence[int] | None) -> list[int]:
 async def _cache_photo_file_id(
     bot: Bot,
     chat_ids: list[int],
-    data: bytes,
+    path: Path,
     filename: str,
     *,
     cleanup: bool,
@@ -57,11 +59,9 @@ async def _cache_photo_file_id(
     last_error: Exception | None = None
     for chat_id in chat_ids:
         try:
-            stream = BytesIO(data)
-            stream.name = filename
             message = await bot.send_photo(
                 chat_id=chat_id,
-                photo=stream,
+                photo=_named_stream(path, filename),
                 disable_notification=True,
             )
         except TelegramError as exc:  # pragma: no cover - network interaction
@@ -83,7 +83,7 @@ async def _cache_photo_file_id(
 async def _cache_document_file_id(
     bot: Bot,
     chat_ids: list[int],
-    data: bytes,
+    path: Path,
     filename: str,
     *,
     cleanup: bool,
@@ -91,11 +91,9 @@ async def _cache_document_file_id(
     last_error: Exception | None = None
     for chat_id in chat_ids:
         try:
-            stream = BytesIO(data)
-            stream.name = filename
             message = await bot.send_document(
                 chat_id=chat_id,
-                document=stream,
+                document=_named_stream(path, filename),
                 disable_notification=True,
             )
         except TelegramError as exc:  # pragma: no cover - network interaction
@@ -114,6 +112,149 @@ async def _cache_document_file_id(
     return None
 
 
+@dataclass(slots=True)
+class _UploadedPage:
+    """A stored page waiting for its batch; the bytes stay in the disk cache."""
+
+    index: int
+    filename: str
+    path: Path
+    storage_url: str
+
+
+MEDIA_GROUP_LIMIT = 10
+
+
+def _named_stream(path: Path, filename: str) -> BytesIO:
+    """Read ``path`` for a single send so only the batch in flight is held in memory."""
+
+    stream = BytesIO(path.read_bytes())
+    stream.name = filename
+    return stream
+
+
+async def _delete_batch(bot: Bot, chat_id: int, messages: Sequence[Message]) -> None:
+    message_ids = [message.message_id for message in messages]
+    if not message_ids:
+        return
+    try:
+        await bot.delete_messages(chat_id=chat_id, message_ids=message_ids)
+    except TelegramError as exc:  # pragma: no cover - best effort cleanup
+        logger.debug("Failed to delete temporary media group messages: %s", exc)
+
+
+async def _send_media_group(
+    bot: Bot,
+    chat_ids: list[int],
+    build_media: Callable[[], list[InputMediaPhoto] | list[InputMediaDocument]],
+    *,
+    cleanup: bool,
+) -> tuple[Sequence[Message] | None, int | None]:
+    last_error: Exception | None = None
+    for chat_id in chat_ids:
+        try:
+            messages = await bot.send_media_group(
+                chat_id=chat_id,
+                media=build_media(),
+                disable_notification=True,
+            )
+        except TelegramError as exc:  # pragma: no cover - network interaction
+            last_error = exc
+            logger.debug("Failed to send media group in chat %s: %s", chat_id, exc)
+            continue
+        if cleanup:
+            await _delete_batch(bot, chat_id, messages)
+        return messages, chat_id
+    if last_error is not None:
+        logger.warning("无法通过媒体组缓存文件 ID: %s", last_error)
+    return None, None
+
+
+async def _cache_file_ids_batch(
+    bot: Bot,
+    chat_ids: list[int],
+    batch: Sequence[_UploadedPage],
+    *,
+    cleanup: bool,
+) -> tuple[list[str | None], list[str | None]]:
+    """Cache photo and document file IDs for up to ``MEDIA_GROUP_LIMIT`` pages.
+
+    Pages are sent as one photo media group and one document media group and
+    the temporary messages are removed with a single ``delete_messages`` call
+    each. Telegram rejects media groups with fewer than two items, and a
+    single oversized photo fails the whole group, so both cases fall back to
+    caching page by page.
+    """
+
+    if len(batch) < 2:
+        return await _cache_file_ids_individually(bot, chat_ids, batch, cleanup=cleanup)
+
+    photo_messages, used_chat = await _send_media_group(
+        bot,
+        chat_ids,
+        lambda: [InputMediaPhoto(media=_named_stream(page.path, page.filename)) for page in batch],
+        cleanup=cleanup,
+    )
+    if photo_messages is None or len(photo_messages) != len(batch):
+        return await _cache_file_ids_individually(bot, chat_ids, batch, cleanup=cleanup)
+
+    photo_ids = [message.photo[-1].file_id if message.photo else None for message in photo_messages]
+
+    doc_chat_order = [used_chat] + [cid for cid in chat_ids if cid != used_chat]
+    document_messages, _ = await _send_media_group(
+        bot,
+        doc_chat_order,
+        lambda: [
+            InputMediaDocument(media=_named_stream(page.path, page.filename), filename=page.filename)
+            for page in batch
+        ],
+        cleanup=cleanup,
+    )
+    if document_messages is None or len(document_messages) != len(batch):
+        document_ids = [
+            await _cache_document_file_id(bot, doc_chat_order, page.path, page.filename, cleanup=cleanup)
+            for page in batch
+        ]
+    else:
+        document_ids = [
+            message.document.file_id if message.document else None for message in document_messages
+        ]
+
+    return photo_ids, document_ids
+
+
+async def _cache_file_ids_individually(
+    bot: Bot,
+    chat_ids: list[int],
+    batch: Sequence[_UploadedPage],
+    *,
+    cleanup: bool,
+) -> tuple[list[str | None], list[str | None]]:
+    photo_ids: list[str | None] = []
+    document_ids: list[str | None] = []
+    for page in batch:
+        compressed_id, used_chat = await _cache_photo_file_id(
+            bot,
+            chat_ids,
+            page.path,
+            page.filename,
+            cleanup=cleanup,
+        )
+        doc_chat_order = chat_ids
+        if used_chat is not None:
+            doc_chat_order = [used_chat] + [cid for cid in chat_ids if cid != used_chat]
+        original_id = await _cache_document_file_id(
+            bot,
+            doc_chat_order,
+            page.path,
+            page.filename,
+            cleanup=cleanup,
+        )
+        photo_ids.append(compressed_id)
+        document_ids.append(original_id)
+    return photo_ids, document_ids
+
+
 def _ensure_list(container: object, length: int) -> list:
     if isinstance(container, list):
         if len(container) < length:
@@ -134,13 +275,54 @@ def _resolve_bool(value: str | bool | None, *, default: bool) -> bool:
     return default
 
 
+async def _reusable_storage_url(
+    storage: Storage,
+    filename: str,
+    sub_folder: str,
+    *,
+    origin_url: str,
+    existing_url: str | None,
+    existing_origin_url: str | None,
+) -> str | None:
+    """Return the stored URL of a page that does not need to be uploaded again.
+
+    A page is reused when the previous import stored it at the location the
+    current backend would use, Pixiv still serves the same original (the
+    origin URL embeds the upload timestamp, so edited pages get a new one)
+    and the object is still present in storage.
+    """
+
+    if not existing_url or existing_origin_url != origin_url:
+        return None
+    try:
+        if existing_url != storage.object_url(filename, sub_folder):
+            return None
+        if not await storage.exists(filename, sub_folder):
+            return None
+    except Exception as exc:  # pragma: no cover - storage interaction
+        logger.warning("Failed to check stored object %s, uploading again: %s", filename, exc)
+        return None
+    return existing_url
+
+
 async def import_illustration(
     pixiv_id: int,
     *,
     bot: Bot | None = None,
     telegram_chat_ids: Sequence[int] | None = None,
     cleanup_messages: bool = True,
+    completed_pages: Mapping[int, ImportedPage] | None = None,
+    on_page_imported: Callable[[ImportedPage], Awaitable[None]] | None = None,
 ) -> IllustrationImportResult:
+    """Fetch a Pixiv work, upload every page to storage and persist it.
+
+    ``completed_pages`` holds pages finished by an earlier, interrupted attempt;
+    they are reused as-is so a resumed import does not upload them again.
+    ``on_page_imported`` is awaited after each newly processed page and is
+    used by the job queue to checkpoint progress. Pages are uploaded to
+    storage one by one and their Telegram file IDs are cached in media-group
+    batches, so the callback fires once per page after its batch completes.
+    """
     if not pixiv.enabled:
         raise RuntimeError("Pixiv 功能未启用")
 
@@ -164,6 +346,15 @@ async def import_illustration(
         existing.original_file_ids if existing else None,
         illust.page_count,
     )
+    existing_file_urls = _ensure_list(
+        list(existing.file_urls) if existing and isinstance(existing.file_urls, list) else None,
+        illust.page_count,
+    )
+    existing_origin_urls = _ensure_list(
+        list(existing.origin_urls) if existing and isinstance(existing.origin_urls, list) else None,
+        illust.page_count,
+    )
+    await storage.ensure_ready()
 
     chat_candidates = _unique_chat_ids(telegram_chat_ids)
 
@@ -171,8 +362,52 @@ async def import_illustration(
     illust.compressed_file_ids = _ensure_list(getattr(illust, "compressed_file_ids", None), illust.page_count)
     illust.original_file_ids = _ensure_list(getattr(illust, "original_file_ids", None), illust.page_count)
 
+    cache_to_telegram = bot is not None and bool(chat_candidates) and telegram_cache_enabled
     pages: list[ImportedPage] = []
+    batch: list[_UploadedPage] = []
+
+    async def _flush_batch() -> None:
+        if not batch:
+            return
+        if cache_to_telegram:
+            compressed_ids, original_ids = await _cache_file_ids_batch(
+                bot,
+                chat_candidates,
+                batch,
+                cleanup=cleanup_messages,
+            )
+        elif not telegram_cache_enabled:
+            compressed_ids = [existing_compressed_ids[entry.index] for entry in batch]
+            original_ids = [existing_original_ids[entry.index] for entry in batch]
+        else:
+            compressed_ids = [None] * len(batch)
+            original_ids = [None] * len(batch)
+
+        for entry, compressed_id, original_id in zip(batch, compressed_ids, original_ids):
+            illust.file_urls[entry.index] = entry.storage_url
+            illust.compressed_file_ids[entry.index] = compressed_id
+            illust.original_file_ids[entry.index] = original_id
+
+            page = ImportedPage(
+                index=entry.index,
+                storage_url=entry.storage_url,
+                compressed_file_id=compressed_id,
+                original_file_id=original_id,
+            )
+            pages.append(page)
+            if on_page_imported is not None:
+                await on_page_imported(page)
+        batch.clear()
+
     for page_index in range(illust.page_count):
+        finished = completed_pages.get(page_index) if completed_pages else None
+        if finished is not None and finished.storage_url:
+            illust.file_urls[page_index] = finished.storage_url
+            illust.compressed_file_ids[page_index] = finished.compressed_file_id
+            illust.original_file_ids[page_index] = finished.original_file_id
+            pages.append(finished)
+            continue
+
         origin_url: str | None = None
         if isinstance(illust.origin_urls, list):
             if page_index < len(illust.origin_urls):
@@ -194,52 +429,53 @@ async def import_illustration(
             ext = f".{ext}"
 
         filename = f"{illust.id}_{page_index:02d}{ext}"
-        file_bytes = await get_file(filename=filename, url=origin_url)
-        if file_bytes is None:
-            raise RuntimeError(f"无法下载第{page_index + 1} 页的图片")
-
-        storage_url = await storage.upload(
-            file_bytes,
+        stored_url = await _reusable_storage_url(
+            storage,
             filename,
-            sub_folder=storage_folder,
+            storage_folder,
+            origin_url=origin_url,
+            existing_url=existing_file_urls[page_index],
+            existing_origin_url=existing_origin_urls[page_index],
         )
-
-        compressed_id: str | None = None
-        original_id: str | None = None
-        if bot is not None and chat_candidates and telegram_cache_enabled:
-            compressed_id, used_chat = await _cache_photo_file_id(
-                bot,
-                chat_candidates,
-                file_bytes,
-                filename,
-                cleanup=cleanup_messages,
-            )
-            doc_chat_order = chat_candidates
-            if used_chat is not None:
-                doc_chat_order = [used_chat] + [cid for cid in chat_candidates if cid != used_chat]
-            original_id = await _cache_document_file_id(
-                bot,
-                doc_chat_order,
-                file_bytes,
-                filename,
-                cleanup=cleanup_messages,
-            )
-        elif not telegram_cache_enabled:
+        if stored_url is not None:
             compressed_id = existing_compressed_ids[page_index]
             original_id = existing_original_ids[page_index]
-
-        illust.file_urls[page_index] = storage_url
-        illust.compressed_file_ids[page_index] = compressed_id
-        illust.original_file_ids[page_index] = original_id
-
-        pages.append(
-            ImportedPage(
+            if not cache_to_telegram or (compressed_id and original_id):
+                illust.file_urls[page_index] = stored_url
+                illust.compressed_file_ids[page_index] = compressed_id
+                illust.original_file_ids[page_index] = original_id
+                page = ImportedPage(
+                    index=page_index,
+                    storage_url=stored_url,
+                    compressed_file_id=compressed_id,
+                    original_file_id=original_id,
+                    reused=True,
+                )
+                pages.append(page)
+                if on_page_imported is not None:
+                    await on_page_imported(page)
+                continue
+
+            # Stored but never cached on Telegram: read our own copy instead of Pixiv.
+            cached_path = await get_file_path(filename=filename, url=stored_url, origin_url=origin_url)
+            storage_url = stored_url
+        else:
+            cached_path = await get_file_path(filename=filename, origin_url=origin_url)
+            storage_url = await storage.upload_file(cached_path, filename, sub_folder=storage_folder)
+
+        batch.append(
+            _UploadedPage(
                 index=page_index,
+                filename=filename,
+                path=cached_path,
                 storage_url=storage_url,
-                compressed_file_id=compressed_id,
-                original_file_id=original_id,
             )
         )
+        if len(batch) >= MEDIA_GROUP_LIMIT:
+            await _flush_batch()
+
+    await _flush_batch()
+    pages.sort(key=lambda item: item.index)
 
     saved = await illust_registry.save_illustration(illust)
     saved.file_urls = illust.file_urls
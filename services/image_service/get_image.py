@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import functools
 import os
 import random
 from typing import Callable, Awaitable
@@ -22,6 +23,7 @@ class ImageResource:
     file_id: str | None
     link: str
     is_original: bool
+    origin_link: str | None = None
 
 
 def _resolve_page_id(illust: Illustration, page_id: int | None, allow_random: bool) -> int:
@@ -36,23 +38,28 @@ def _resolve_page_id(illust: Illustration, page_id: int | None, allow_random: bo
     return page_id
 
 
-def _resolve_link(illust: Illustration, page_id: int) -> str:
-    file_urls = illust.file_urls or []
-    origin_urls = illust.origin_urls or []
+def _page_value(values, page_id: int) -> str | None:
+    if isinstance(values, list):
+        if page_id < len(values) and values[page_id]:
+            return values[page_id]
+        return None
+    if isinstance(values, str) and values:
+        return values
+    return None
 
-    if isinstance(file_urls, list):
-        if page_id < len(file_urls) and file_urls[page_id]:
-            return file_urls[page_id]
-    elif isinstance(file_urls, str) and file_urls:
-        return file_urls
 
-    if isinstance(origin_urls, list):
-        if page_id < len(origin_urls) and origin_urls[page_id]:
-            return origin_urls[page_id]
-    elif isinstance(origin_urls, str) and origin_urls:
-        return origin_urls
+def _resolve_sources(illust: Illustration, page_id: int) -> tuple[str | None, str | None]:
+    """Return ``(storage_url, origin_url)`` for the page."""
 
-    raise FileNotFoundError("没有找到对应页面的图片链接")
+    return _page_value(illust.file_urls or [], page_id), _page_value(illust.origin_urls or [], page_id)
+
+
+def _resolve_link(illust: Illustration, page_id: int) -> str:
+    storage_url, origin_url = _resolve_sources(illust, page_id)
+    link = storage_url or origin_url
+    if link is None:
+        raise FileNotFoundError("没有找到对应页面的图片链接")
+    return link
 
 
 def _resolve_extension(illust: Illustration, page_id: int, link: str) -> str:
@@ -118,9 +125,13 @@ async def get_image_resource(
             raise FileNotFoundError(f"No such illust in database: {pixiv_id}")
         resolved_page_id = _resolve_page_id(illust, page_id, allow_random=False)
         link = _resolve_link(illust, resolved_page_id)
+        _, origin_link = _resolve_sources(illust, resolved_page_id)
         ext = _resolve_extension(illust, resolved_page_id, link)
         filename = f"{illust.id}_{resolved_page_id}{ext}"
-        fetcher = file_service.get_file if origin else file_service.get_image
+        fetcher = functools.partial(
+            file_service.get_file if origin else file_service.get_image,
+            origin_url=origin_link,
+        )
         image = None
         file_id = _resolve_file_id(illust, resolved_page_id, origin=origin)
         return ImageResource(
@@ -132,6 +143,7 @@ async def get_image_resource(
             file_id=file_id,
             link=link,
             is_original=origin,
+            origin_link=origin_link,
         )
 
     if origin:
@@ -143,10 +155,11 @@ async def get_image_resource(
 
     resolved_page_id = _resolve_page_id(illust, page_id, allow_random=True)
     link = _resolve_link(illust, resolved_page_id)
+    _, origin_link = _resolve_sources(illust, resolved_page_id)
     ext = _resolve_extension(illust, resolved_page_id, link)
     filename = f"{illust.id}_{resolved_page_id}{ext}"
     image = None
-    fetcher = file_service.get_image
+    fetcher = functools.partial(file_service.get_image, origin_url=origin_link)
 
     file_id = _resolve_file_id(illust, resolved_page_id, origin=False)
 
@@ -159,4 +172,5 @@ async def get_image_resource(
         file_id=file_id,
         link=link,
         is_original=False,
+        origin_link=origin_link,
     )
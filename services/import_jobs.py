@@ -0,0 +1,149 @@
+"""Background job handlers for Pixiv illustration imports."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict
+from typing import Any, Sequence
+
+from telegram.error import TelegramError
+
+from services.illustration_importer import (
+    IllustrationImportResult,
+    ImportedPage,
+    import_illustration,
+)
+from services.job_queue import JobContext, PermanentJobError, enqueue, job_handler
+from services.pixiv_service import pixiv
+from registries.job_registry import JobInfo
+
+logger = logging.getLogger(__name__)
+
+PIXIV_IMPORT_JOB = "pixiv_import"
+
+
+async def enqueue_pixiv_import(
+    pixiv_id: int,
+    *,
+    telegram_chat_ids: Sequence[int] | None = None,
+    status_chat_id: int | None = None,
+    status_message_id: int | None = None,
+) -> tuple[JobInfo, bool]:
+    """Queue a Pixiv import; an unfinished import of the same work is reused."""
+
+    payload: dict[str, Any] = {
+        "pixiv_id": pixiv_id,
+        "telegram_chat_ids": list(telegram_chat_ids or []),
+        "status_chat_id": status_chat_id,
+        "status_message_id": status_message_id,
+    }
+    return await enqueue(
+        PIXIV_IMPORT_JOB,
+        payload,
+        dedupe_key=f"{PIXIV_IMPORT_JOB}:{pixiv_id}",
+    )
+
+
+def _format_page_summary(
+    index: int, *, storage: bool, photo: bool, document: bool, cache_enabled: bool, reused: bool = False
+) -> str:
+    storage_status = "已存在" if reused else ("成功" if storage else "失败")
+    photo_status = "已缓存" if photo else ("缺失" if cache_enabled else "待发送缓存")
+    document_status = "已缓存" if document else ("缺失" if cache_enabled else "待发送缓存")
+    return (
+        f" - 第{index + 1} 页："
+        f"存储{storage_status}；"
+        f"PhotoID{photo_status}；"
+        f"DocumentID{document_status}"
+    )
+
+
+def format_import_summary(result: IllustrationImportResult) -> str:
+    illustration = result.illustration
+    header = (
+        f"插画 {illustration.title or illustration.id} (Pixiv {illustration.id}) "
+        f"已{'新增' if result.created else '更新'}。"
+    )
+    summary_lines = [header, f"共处理 {len(result.pages)} 张图片。"]
+    reused_count = sum(1 for page in result.pages if page.reused)
+    if reused_count:
+        summary_lines.append(f"其中 {reused_count} 张已存储且未变化，已跳过上传。")
+    if not result.telegram_cache_enabled:
+        summary_lines.append("当前配置为导入阶段不缓存，首次发送时将自动在 Telegram 缓存文件 ID。")
+    for page in result.pages:
+        summary_lines.append(
+            _format_page_summary(
+                page.index,
+                storage=bool(page.storage_url),
+                photo=bool(page.compressed_file_id),
+                document=bool(page.original_file_id),
+                cache_enabled=result.telegram_cache_enabled,
+                reused=page.reused,
+            )
+        )
+    return "\n".join(summary_lines)
+
+
+async def _edit_status(context: JobContext, text: str) -> None:
+    chat_id = context.payload.get("status_chat_id")
+    message_id = context.payload.get("status_message_id")
+    if context.bot is None or not chat_id or not message_id:
+        return
+    try:
+        await context.bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=text)
+    except TelegramError as exc:  # pragma: no cover - network interaction
+        logger.debug("Failed to update import status message for job %s: %s", context.job.id, exc)
+
+
+def _restore_pages(checkpoint: dict[str, Any]) -> dict[int, ImportedPage]:
+    restored: dict[int, ImportedPage] = {}
+    for raw in (checkpoint.get("pages") or {}).values():
+        try:
+            page = ImportedPage(**raw)
+        except TypeError:
+            continue
+        restored[page.index] = page
+    return restored
+
+
+async def _notify_import_failure(context: JobContext, exc: Exception) -> None:
+    await _edit_status(context, f"导入失败：{exc}")
+
+
+@job_handler(PIXIV_IMPORT_JOB, on_failure=_notify_import_failure)
+async def run_pixiv_import(context: JobContext) -> dict[str, Any]:
+    if not pixiv.enabled:
+        raise PermanentJobError("Pixiv 功能未启用")
+
+    try:
+        pixiv_id = int(context.payload["pixiv_id"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise PermanentJobError("任务缺少有效的 Pixiv ID") from exc
+
+    checkpoint_pages: dict[str, Any] = dict(context.checkpoint.get("pages") or {})
+
+    async def _checkpoint(page: ImportedPage) -> None:
+        checkpoint_pages[str(page.index)] = asdict(page)
+        await context.save_checkpoint(pages=checkpoint_pages)
+
+    if context.job.attempts > 1:
+        await _edit_status(
+            context,
+            f"正在重试导入 Pixiv {pixiv_id}（第 {context.job.attempts} 次尝试，"
+            f"已完成 {len(checkpoint_pages)} 页）…",
+        )
+
+    result = await import_illustration(
+        pixiv_id,
+        bot=context.bot,
+        telegram_chat_ids=context.payload.get("telegram_chat_ids") or [],
+        completed_pages=_restore_pages(context.checkpoint),
+        on_page_imported=_checkpoint,
+    )
+
+    await _edit_status(context, format_import_summary(result))
+    return {
+        "illustration_id": str(result.illustration.id),
+        "created": result.created,
+        "pages": len(result.pages),
+    }
@@ -0,0 +1,257 @@
+"""Database-backed background job queue with a leasing worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import socket
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from telegram import Bot
+
+from registries import job_registry
+from registries.job_registry import JobInfo
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 300
+HEARTBEAT_SECONDS = 60
+IDLE_POLL_SECONDS = 5.0
+RETRY_BASE_SECONDS = 10.0
+RETRY_MAX_SECONDS = 15 * 60.0
+
+
+class PermanentJobError(Exception):
+    """Raised by job handlers when retrying cannot succeed."""
+
+
+@dataclass(slots=True)
+class JobContext:
+    """State handed to a job handler for a single attempt."""
+
+    job: JobInfo
+    worker_id: str
+    bot: Bot | None
+    checkpoint: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        return self.job.payload
+
+    async def save_checkpoint(self, **values: Any) -> None:
+        """Merge ``values`` into the checkpoint and persist it immediately."""
+
+        self.checkpoint.update(values)
+        saved = await job_registry.save_checkpoint(self.job.id, self.worker_id, self.checkpoint)
+        if not saved:
+            logger.warning("Lost lease on job %s while saving checkpoint", self.job.id)
+
+
+JobHandler = Callable[[JobContext], Awaitable[dict[str, Any] | None]]
+JobFailureHook = Callable[[JobContext, Exception], Awaitable[None]]
+
+_handlers: dict[str, JobHandler] = {}
+_failure_hooks: dict[str, JobFailureHook] = {}
+
+
+def job_handler(kind: str, *, on_failure: JobFailureHook | None = None) -> Callable[[JobHandler], JobHandler]:
+    """Register ``func`` as the handler for jobs of ``kind``.
+
+    ``on_failure`` is awaited once the job has exhausted its attempts or raised
+    :class:`PermanentJobError`.
+    """
+
+    def register(func: JobHandler) -> JobHandler:
+        if kind in _handlers:
+            raise ValueError(f"Job handler for {kind!r} is already registered")
+        _handlers[kind] = func
+        if on_failure is not None:
+            _failure_hooks[kind] = on_failure
+        return func
+
+    return register
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given attempt count."""
+
+    exponent = max(0, attempts - 1)
+    delay = min(RETRY_BASE_SECONDS * (2 ** exponent), RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class JobWorkerPool:
+    """Run registered job handlers on a fixed number of asyncio workers."""
+
+    def __init__(self) -> None:
+        self._workers: list[asyncio.Task[None]] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._bot_provider: Callable[[], Bot | None] = lambda: None
+        self._identity = f"{socket.gethostname()}:{os.getpid()}"
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self, worker_count: int, *, bot_provider: Callable[[], Bot | None] | None = None) -> None:
+        if self._workers:
+            return
+        if bot_provider is not None:
+            self._bot_provider = bot_provider
+        self._stopping = False
+        count = max(1, worker_count)
+        for index in range(count):
+            worker_id = f"{self._identity}:{index}"
+            self._workers.append(asyncio.create_task(self._run(worker_id), name=f"job-worker-{index}"))
+        logger.info("Started %d background job worker(s)", count)
+
+    async def stop(self) -> None:
+        if not self._workers:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._workers.clear()
+        logger.info("Stopped background job workers")
+
+    def notify(self) -> None:
+        """Wake idle workers so a freshly enqueued job starts without polling delay."""
+
+        self._wakeup.set()
+
+    async def _run(self, worker_id: str) -> None:
+        while not self._stopping:
+            # Clear before leasing so a notify() that races with the query is not lost.
+            self._wakeup.clear()
+            try:
+                jobs = await job_registry.lease_jobs(
+                    list(_handlers),
+                    worker_id,
+                    limit=1,
+                    lease_seconds=LEASE_SECONDS,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to lease background jobs")
+                jobs = []
+
+            if not jobs:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=IDLE_POLL_SECONDS)
+                continue
+
+            for job in jobs:
+                await self._execute(job, worker_id)
+
+    async def _execute(self, job: JobInfo, worker_id: str) -> None:
+        handler = _handlers.get(job.kind)
+        context = JobContext(
+            job=job,
+            worker_id=worker_id,
+            bot=self._bot_provider(),
+            checkpoint=dict(job.checkpoint),
+        )
+        if handler is None:
+            await job_registry.fail_job(
+                job.id, worker_id, f"No handler registered for {job.kind!r}", retry_in_seconds=None
+            )
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, worker_id))
+        try:
+            result = await handler(context)
+        except asyncio.CancelledError:
+            # Leave the lease to expire so another worker resumes from the checkpoint.
+            raise
+        except Exception as exc:
+            await self._handle_failure(context, exc)
+        else:
+            await job_registry.complete_job(job.id, worker_id, result)
+            logger.info("Background job %s (%s) completed", job.id, job.kind)
+        finally:
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+
+    async def _handle_failure(self, context: JobContext, exc: Exception) -> None:
+        job = context.job
+        permanent = isinstance(exc, PermanentJobError) or job.attempts >= job.max_attempts
+        retry_in = None if permanent else retry_delay(job.attempts)
+        logger.warning(
+            "Background job %s (%s) attempt %d/%d failed: %s",
+            job.id,
+            job.kind,
+            job.attempts,
+            job.max_attempts,
+            exc,
+            exc_info=not isinstance(exc, PermanentJobError),
+        )
+        try:
+            await job_registry.fail_job(job.id, context.worker_id, str(exc), retry_in_seconds=retry_in)
+        except Exception:
+            logger.exception("Failed to record failure for background job %s", job.id)
+
+        hook = _failure_hooks.get(job.kind)
+        if permanent and hook is not None:
+            try:
+                await hook(context, exc)
+            except Exception:
+                logger.exception("Failure hook for background job %s raised", job.id)
+
+    async def _heartbeat(self, job_id: int, worker_id: str) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            try:
+                renewed = await job_registry.renew_lease(job_id, worker_id, lease_seconds=LEASE_SECONDS)
+            except Exception:
+                logger.exception("Failed to renew lease for background job %s", job_id)
+                continue
+            if not renewed:
+                logger.warning("Lease for background job %s was lost", job_id)
+                return
+
+
+job_worker_pool = JobWorkerPool()
+
+
+async def enqueue(
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    dedupe_key: str | None = None,
+    max_attempts: int = 5,
+    delay_seconds: float = 0,
+) -> tuple[JobInfo, bool]:
+    """Persist a job and wake the local worker pool."""
+
+    job, created = await job_registry.enqueue_job(
+        kind,
+        payload,
+        dedupe_key=dedupe_key,
+        max_attempts=max_attempts,
+        delay_seconds=delay_seconds,
+    )
+    if created:
+        job_worker_pool.notify()
+    return job, created
+
+
+__all__ = [
+    "JobContext",
+    "JobWorkerPool",
+    "PermanentJobError",
+    "enqueue",
+    "job_handler",
+    "job_worker_pool",
+    "retry_delay",
+]
@@ -5,14 +5,13 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable, Sequence
+from typing import Sequence
 
 from telegram import Chat, Message, Update, User as TgUser
 from telegram.ext import ContextTypes
 
 from defines import MessageType
-from models import Group, GroupChatHistory, PrivateChatHistory, User
-from registries import engine
+from services.history_writer import HistoryRecord, history_writer
 from services.telegram_cache import get_cached_admin_ids
 from utils import is_group_type
 
@@ -88,44 +87,28 @@ async def _store_group_message(
     bot_send: bool,
     admin_ids: Sequence[int] | None,
 ) -> None:
-    async with engine.new_session() as session:
-        db_user = await session.get(User, user.id)
-        if db_user is None:
-            db_user = User(id=user.id)
-            session.add(db_user)
-            logger.debug("Created new user record user_id=%s during group message logging", user.id)
-        _sync_user_profile(db_user, user)
-
-        db_group = await session.get(Group, chat.id)
-        if db_group is None:
-            db_group = Group(id=chat.id)
-            session.add(db_group)
-            logger.debug("Created new group record chat_id=%s during message logging", chat.id)
-        _sync_group_profile(db_group, chat, admin_ids)
-
-        await session.merge(
-            GroupChatHistory(
-                message_id=message.message_id,
-                group_id=chat.id,
-                user_id=db_user.id,
-                type=parsed.message_type,
-                bot_send=bot_send,
-                file_id=parsed.file_id,
-                text=parsed.text,
-                key_board=parsed.keyboard,
-                sent_at=message.date,
-            )
-        )
-
-        await session.commit()
-        logger.debug(
-            "Persisted group message chat_id=%s message_id=%s type=%s bot_send=%s text=%s",
-            chat.id,
-            message.message_id,
-            parsed.message_type,
-            bot_send,
-            _preview_text(parsed.text),
+    await history_writer.submit(
+        HistoryRecord(
+            user_id=user.id,
+            nick_name=_extract_user_display_name(user),
+            group_id=chat.id,
+            group_name=chat.title or None,
+            admin_ids=list(admin_ids) if admin_ids is not None else None,
+            row={
+                **_history_values(message, parsed, bot_send),
+                "group_id": chat.id,
+                "user_id": user.id,
+            },
         )
+    )
+    logger.debug(
+        "Queued group message chat_id=%s message_id=%s type=%s bot_send=%s text=%s",
+        chat.id,
+        message.message_id,
+        parsed.message_type,
+        bot_send,
+        _preview_text(parsed.text),
+    )
 
 
 async def _store_private_message(
@@ -135,57 +118,35 @@ async def _store_private_message(
     parsed: ParsedMessage,
     bot_send: bool,
 ) -> None:
-    async with engine.new_session() as session:
-        db_user = await session.get(User, user.id)
-        if db_user is None:
-            db_user = User(id=user.id)
-            session.add(db_user)
-            logger.debug("Created new user record user_id=%s during private message logging", user.id)
-        _sync_user_profile(db_user, user)
-
-        await session.merge(
-            PrivateChatHistory(
-                message_id=message.message_id,
-                user_id=db_user.id,
-                type=parsed.message_type,
-                bot_send=bot_send,
-                file_id=parsed.file_id,
-                text=parsed.text,
-                key_board=parsed.keyboard,
-                sent_at=message.date,
-            )
+    await history_writer.submit(
+        HistoryRecord(
+            user_id=user.id,
+            nick_name=_extract_user_display_name(user),
+            row={**_history_values(message, parsed, bot_send), "user_id": user.id},
         )
+    )
+    logger.debug(
+        "Queued private message user_id=%s message_id=%s type=%s bot_send=%s text=%s",
+        user.id,
+        message.message_id,
+        parsed.message_type,
+        bot_send,
+        _preview_text(parsed.text),
+    )
 
-        await session.commit()
-        logger.debug(
-            "Persisted private message user_id=%s message_id=%s type=%s bot_send=%s text=%s",
-            user.id,
-            message.message_id,
-            parsed.message_type,
-            bot_send,
-            _preview_text(parsed.text),
-        )
-
-
-def _sync_user_profile(db_user: User, tg_user: TgUser) -> None:
-    """Ensure the stored user profile mirrors the latest Telegram data."""
-
-    nickname = _extract_user_display_name(tg_user)
-    if nickname != db_user.nick_name:
-        logger.debug("Updating nickname for user_id=%s to %r", db_user.id, nickname)
-        db_user.nick_name = nickname
-
-
-def _sync_group_profile(db_group: Group, chat: Chat, admin_ids: Sequence[int] | None) -> None:
-    """Update stored group metadata based on the latest chat information."""
 
-    if chat.title and chat.title != db_group.name:
-        logger.debug("Updating group %s title to %r", db_group.id, chat.title)
-        db_group.name = chat.title
+def _history_values(message: Message, parsed: ParsedMessage, bot_send: bool) -> dict:
+    """Column values shared by group and private history rows."""
 
-    if admin_ids is not None and _admin_list_changed(db_group.admin_ids, admin_ids):
-        logger.debug("Updating group %s admin ids to %s", db_group.id, list(admin_ids))
-        db_group.admin_ids = list(admin_ids)
+    return {
+        "message_id": message.message_id,
+        "type": parsed.message_type,
+        "bot_send": bot_send,
+        "file_id": parsed.file_id,
+        "text": parsed.text,
+        "key_board": parsed.keyboard,
+        "sent_at": message.date,
+    }
 
 
 def _parse_message(message: Message) -> ParsedMessage | None:
@@ -337,9 +298,3 @@ async def _get_admin_ids(context: ContextTypes.DEFAULT_TYPE, chat_id: int) -> li
     if admin_ids is None:
         logger.debug("Admin IDs unavailable for chat %s", chat_id)
     return admin_ids
-
-
-def _admin_list_changed(existing: Iterable[int] | None, new_list: Sequence[int]) -> bool:
-    existing_sorted = sorted(existing or [])
-    new_sorted = sorted(new_list)
-    return existing_sorted != new_sorted
@@ -0,0 +1,48 @@
+"""In-process counters and gauges exposed through ``/api/metrics``."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_counters: defaultdict[str, defaultdict[str, int]] = defaultdict(lambda: defaultdict(int))
+_providers: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def increment(group: str, key: str, amount: int = 1) -> None:
+    """Add ``amount`` to the counter ``key`` within ``group``."""
+
+    with _lock:
+        _counters[group][key] += amount
+
+
+def register_provider(group: str, provider: Callable[[], dict[str, Any]]) -> None:
+    """Expose values computed on demand (queue depths, cache sizes, ...) under ``group``."""
+
+    _providers[group] = provider
+
+
+def counters(group: str) -> dict[str, int]:
+    with _lock:
+        return dict(_counters.get(group, {}))
+
+
+def snapshot() -> dict[str, dict[str, Any]]:
+    with _lock:
+        result: dict[str, dict[str, Any]] = {group: dict(values) for group, values in _counters.items()}
+    for group, provider in list(_providers.items()):
+        try:
+            values = provider()
+        except Exception:
+            logger.exception("Metrics provider %s failed", group)
+            continue
+        result.setdefault(group, {}).update(values)
+    return result
+
+
+__all__ = ["counters", "increment", "register_provider", "snapshot"]
@@ -1,7 +1,8 @@
 import logging
 import re
 from dataclasses import dataclass
-from typing import Awaitable, Callable
+from datetime import date, datetime, timezone
+from typing import Awaitable, Callable, Sequence
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
@@ -224,6 +225,244 @@ def _build_comment_clause(comment: str | None) -> str:
     return f" COMMENT '{comment.replace("'", "''")}'"
 
 
+HISTORY_TABLES = ("group_chat_history", "private_chat_history")
+PARTITION_MONTHS_AHEAD = 2
+_MAX_PARTITION = "pmax"
+# TO_DAYS() counts from year 0; Python ordinals start at 0001-01-01.
+_TO_DAYS_OFFSET = 365
+
+
+@dataclass(frozen=True)
+class TablePartition:
+    name: str
+    # Exclusive upper bound of ``sent_at``; ``None`` for the MAXVALUE partition.
+    upper_bound: date | None
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_clause(month: date) -> str:
+    upper = _add_months(month, 1)
+    return (
+        f"PARTITION p{month:%Y%m} "
+        f"VALUES LESS THAN (TO_DAYS('{upper.isoformat()}'))"
+    )
+
+
+def _history_table(table_suffix: str) -> str:
+    if table_suffix not in HISTORY_TABLES:
+        raise ValueError(f"Unknown history table: {table_suffix!r}")
+    return f"{file_config.db_prefix}{table_suffix}"
+
+
+async def _list_partitions(conn: AsyncConnection, table_name: str) -> list[TablePartition]:
+    result = await conn.execute(
+        text(
+            """
+            SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = :schema
+              AND TABLE_NAME = :table
+              AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+            """
+        ),
+        {"schema": file_config.db_name, "table": table_name},
+    )
+    partitions: list[TablePartition] = []
+    for name, description in result.all():
+        upper_bound = None
+        if description and str(description).upper() != "MAXVALUE":
+            upper_bound = date.fromordinal(int(description) - _TO_DAYS_OFFSET)
+        partitions.append(TablePartition(name=name, upper_bound=upper_bound))
+    return partitions
+
+
+async def _primary_key_columns(conn: AsyncConnection, table_name: str) -> list[str]:
+    result = await conn.execute(
+        text(
+            """
+            SELECT COLUMN_NAME
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = :schema
+              AND TABLE_NAME = :table
+              AND INDEX_NAME = 'PRIMARY'
+            ORDER BY SEQ_IN_INDEX
+            """
+        ),
+        {"schema": file_config.db_name, "table": table_name},
+    )
+    return [row[0] for row in result.all()]
+
+
+async def _partition_history_tables(conn: AsyncConnection) -> None:
+    current_month = _month_start(datetime.now(timezone.utc).date())
+
+    for table_suffix in HISTORY_TABLES:
+        table_name = _history_table(table_suffix)
+        quoted_table = _quote(table_name)
+        if await _list_partitions(conn, table_name):
+            continue
+
+        key_columns = await _primary_key_columns(conn, table_name)
+        if not key_columns:
+            logger.debug("Table %s not found while partitioning; skipping", table_name)
+            continue
+        if "sent_at" not in key_columns:
+            # Every unique key of a partitioned table must contain the partition column.
+            columns = ", ".join(_quote(column) for column in [*key_columns, "sent_at"])
+            await conn.execute(
+                text(f"ALTER TABLE {quoted_table} DROP PRIMARY KEY, ADD PRIMARY KEY ({columns})")
+            )
+
+        oldest = (await conn.execute(text(f"SELECT MIN(sent_at) FROM {quoted_table}"))).scalar()
+        month = _month_start(oldest.date()) if oldest is not None else current_month
+        clauses: list[str] = []
+        while month <= _add_months(current_month, PARTITION_MONTHS_AHEAD):
+            clauses.append(_partition_clause(month))
+            month = _add_months(month, 1)
+        clauses.append(f"PARTITION {_MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+        await conn.execute(
+            text(
+                f"ALTER TABLE {quoted_table} PARTITION BY RANGE (TO_DAYS(sent_at)) "
+                f"({', '.join(clauses)})"
+            )
+        )
+        logger.info("Partitioned %s into %d monthly partitions", table_name, len(clauses) - 1)
+
+
+async def ensure_history_partitions(
+    async_engine: AsyncEngine, months_ahead: int = PARTITION_MONTHS_AHEAD
+) -> None:
+    """Split the MAXVALUE partition so monthly partitions exist ``months_ahead`` ahead."""
+
+    target = _add_months(_month_start(datetime.now(timezone.utc).date()), months_ahead + 1)
+    async with async_engine.begin() as conn:
+        for table_suffix in HISTORY_TABLES:
+            table_name = _history_table(table_suffix)
+            partitions = await _list_partitions(conn, table_name)
+            bounded = [partition.upper_bound for partition in partitions if partition.upper_bound]
+            if not bounded or partitions[-1].name != _MAX_PARTITION:
+                continue
+            month = max(bounded)
+            clauses: list[str] = []
+            while month < target:
+                clauses.append(_partition_clause(month))
+                month = _add_months(month, 1)
+            if not clauses:
+                continue
+            clauses.append(f"PARTITION {_MAX_PARTITION} VALUES LESS THAN MAXVALUE")
+            await conn.execute(
+                text(
+                    f"ALTER TABLE {_quote(table_name)} REORGANIZE PARTITION {_MAX_PARTITION} "
+                    f"INTO ({', '.join(clauses)})"
+                )
+            )
+            logger.info("Added %d partition(s) to %s", len(clauses) - 1, table_name)
+
+
+async def list_history_partitions(async_engine: AsyncEngine, table_suffix: str) -> list[TablePartition]:
+    async with async_engine.connect() as conn:
+        return await _list_partitions(conn, _history_table(table_suffix))
+
+
+async def drop_history_partitions(
+    async_engine: AsyncEngine, table_suffix: str, names: Sequence[str]
+) -> None:
+    if not names:
+        return
+    partitions = ", ".join(_quote(name) for name in names)
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            text(f"ALTER TABLE {_quote(_history_table(table_suffix))} DROP PARTITION {partitions}")
+        )
+
+
+async def _add_handler_updated_at(conn: AsyncConnection) -> None:
+    table_name = f"{file_config.db_prefix}active_message_handler"
+    result = await conn.execute(
+        text(
+            """
+            SELECT COUNT(*)
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = :schema
+              AND TABLE_NAME = :table
+              AND COLUMN_NAME = 'updated_at'
+            """
+        ),
+        {"schema": file_config.db_name, "table": table_name},
+    )
+    if not result.scalar():
+        await conn.execute(
+            text(
+                f"ALTER TABLE {_quote(table_name)} "
+                "ADD COLUMN `updated_at` DATETIME NULL COMMENT '状态最后写入的时间'"
+            )
+        )
+    # Prompts pending at upgrade time start their expiry window now.
+    await conn.execute(
+        text(f"UPDATE {_quote(table_name)} SET `updated_at` = UTC_TIMESTAMP() WHERE `updated_at` IS NULL")
+    )
+
+
+async def _unique_active_dedupe_key(conn: AsyncConnection) -> None:
+    table_name = f"{file_config.db_prefix}background_jobs"
+    quoted_table = _quote(table_name)
+    result = await conn.execute(
+        text(
+            """
+            SELECT COUNT(*)
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = :schema
+              AND TABLE_NAME = :table
+              AND COLUMN_NAME = 'active_dedupe_key'
+            """
+        ),
+        {"schema": file_config.db_name, "table": table_name},
+    )
+    if result.scalar():
+        return
+
+    # Duplicates enqueued by the old check-then-insert race would violate the index.
+    await conn.execute(
+        text(
+            f"""
+            UPDATE {quoted_table} AS jobs
+            JOIN (
+                SELECT dedupe_key, MIN(id) AS keep_id
+                FROM {quoted_table}
+                WHERE dedupe_key IS NOT NULL AND status IN ('PENDING', 'RUNNING')
+                GROUP BY dedupe_key
+                HAVING COUNT(*) > 1
+            ) AS duplicates
+              ON jobs.dedupe_key = duplicates.dedupe_key AND jobs.id <> duplicates.keep_id
+            SET jobs.status = 'FAILED',
+                jobs.last_error = '重复的未完成任务',
+                jobs.finished_at = UTC_TIMESTAMP()
+            WHERE jobs.status IN ('PENDING', 'RUNNING')
+            """
+        )
+    )
+    await conn.execute(
+        text(
+            f"""
+            ALTER TABLE {quoted_table}
+            ADD COLUMN `active_dedupe_key` VARCHAR(128)
+                GENERATED ALWAYS AS (IF(status IN ('PENDING', 'RUNNING'), dedupe_key, NULL)) STORED
+                COMMENT '未完成任务的去重键',
+            ADD UNIQUE INDEX `uq_background_jobs_active_dedupe_key` (`active_dedupe_key`)
+            """
+        )
+    )
+
+
 _MIGRATIONS: tuple[Migration, ...] = (
     Migration(
         version=1,
@@ -235,4 +474,19 @@ _MIGRATIONS: tuple[Migration, ...] = (
         name="Remove AUTO_INCREMENT from Telegram ID columns",
         handler=_remove_auto_increment_flags,
     ),
+    Migration(
+        version=3,
+        name="Partition chat history by month",
+        handler=_partition_history_tables,
+    ),
+    Migration(
+        version=4,
+        name="Track when active message handler state was written",
+        handler=_add_handler_updated_at,
+    ),
+    Migration(
+        version=5,
+        name="Enforce one unfinished background job per dedupe key",
+        handler=_unique_active_dedupe_key,
+    ),
 )
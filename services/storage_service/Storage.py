@@ -2,6 +2,18 @@ from __future__ import annotations
 
 import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiofiles
+
+
+@dataclass(slots=True)
+class StorageObjectStat:
+    """Metadata describing an object persisted by a storage provider."""
+
+    url: str
+    size: int | None = None
 
 
 class Storage(ABC):
@@ -26,6 +38,11 @@ class Storage(ABC):
             return
         await self.get_config()
 
+    def invalidate_config(self) -> None:
+        """Reload the configuration on next use; connections are kept unless it changed."""
+
+        self._configured = False
+
     @abstractmethod
     async def _load_config(self) -> None:
         """Fetch provider-specific configuration data."""
@@ -34,6 +51,47 @@ class Storage(ABC):
     async def upload(self, file: bytes, filename: str, sub_folder: str | None = None) -> str:
         """Persist a file and return a public URL for the uploaded object."""
 
+    async def upload_file(self, path: Path, filename: str, sub_folder: str | None = None) -> str:
+        """Persist a file from local disk; providers may override this to stream it."""
+
+        async with aiofiles.open(path, "rb") as fp:
+            data = await fp.read()
+        return await self.upload(data, filename, sub_folder)
+
+    async def close(self) -> None:
+        """Release pooled connections or threads held by the provider."""
+
+    @abstractmethod
+    def object_url(self, filename: str, sub_folder: str | None = None) -> str:
+        """Return the URL :meth:`upload` reports for the given object.
+
+        Requires the configuration to be loaded via :meth:`ensure_ready`.
+        """
+
+    def object_key(self, url: str) -> str | None:
+        """Invert :meth:`object_url`, returning ``sub_folder/filename`` for ``url``.
+
+        Returns ``None`` when ``url`` was not produced by this provider.
+        """
+
+        marker = "__object_key__"
+        prefix = self.object_url(marker)[: -len(marker)]
+        if not url.startswith(prefix):
+            return None
+        return url[len(prefix):] or None
+
+    def read_url(self, url: str) -> str:
+        """Return a URL clients can GET for ``url``, e.g. a presigned one."""
+
+        return url
+
+    @abstractmethod
+    async def stat(self, filename: str, sub_folder: str | None = None) -> StorageObjectStat | None:
+        """Return object metadata, or ``None`` when the object does not exist."""
+
+    async def exists(self, filename: str, sub_folder: str | None = None) -> bool:
+        return await self.stat(filename, sub_folder) is not None
+
     @staticmethod
     def normalize_sub_folder(sub_folder: str | None) -> str:
         if not sub_folder:
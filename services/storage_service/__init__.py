@@ -1,6 +1,9 @@
-﻿from .Storage import Storage
+﻿from .Storage import Storage, StorageObjectStat
 from .backblaze import BackBlaze, backblaze
 from .local import LocalStorage, local_storage
 from .webdav import WebDavStorage, webdav_storage
-from .use import use
+from .s3 import S3Storage, s3_storage
+from .replicated import ReplicatedStorage
+from . import replication
+from .use import use, close_all, invalidate, invalidate_for_key, is_storage_config_key
 from .config_defaults import ensure_storage_config_defaults
@@ -1,22 +1,59 @@
 from __future__ import annotations
 
-from b2sdk.v2 import InMemoryAccountInfo, B2Api, FileVersion, Bucket
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from b2sdk.v2 import InMemoryAccountInfo, B2Api, FileVersion, Bucket, UploadSourceBytes, WriteIntent
+from b2sdk.v2.exception import FileNotPresent, InvalidAuthToken
 
 from registries import config_registry
-from .Storage import Storage
+from .Storage import Storage, StorageObjectStat
+
+_T = TypeVar("_T")
+
+# Blocking b2sdk calls (authorization, uploads, metadata lookups) run here so
+# the event loop never waits on Backblaze. Large-file parts are additionally
+# fanned out by b2sdk's own upload workers.
+IO_THREADS = 4
+UPLOAD_PART_WORKERS = 4
+
+# Originals above the threshold go through the large-file API and are uploaded
+# as parallel parts. B2 rejects parts smaller than 5 MB (except the last one).
+LARGE_FILE_THRESHOLD = 16 * 1024 * 1024
+LARGE_FILE_PART_SIZE = 8 * 1024 * 1024
+B2_MIN_PART_SIZE = 5 * 1000 * 1000
 
 
 class BackBlaze(Storage):
     def __init__(self) -> None:
         super().__init__("backblaze")
         self.info = InMemoryAccountInfo()
-        self.b2_api = B2Api(self.info)
+        self.b2_api = B2Api(self.info, max_upload_workers=UPLOAD_PART_WORKERS)
         self.app_id: str | None = None
         self.app_key: str | None = None
         self.bucket_name: str | None = None
         self.bucket: Bucket | None = None
         self.base_path: str | None = None
         self.base_url: str | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._authorized_as: tuple[str, str] | None = None
+        self._reauthorize_lock = asyncio.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="backblaze")
+        return self._executor
+
+    async def _run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+
+    async def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     async def _load_config(self) -> None:
         config = await config_registry.get_backblaze_config()
@@ -36,26 +73,84 @@ class BackBlaze(Storage):
         if missing:
             raise RuntimeError(f"Backblaze configuration missing values: {', '.join(missing)}")
 
-        self.b2_api.authorize_account("production", self.app_id, self.app_key)
-        self.bucket = self.b2_api.get_bucket_by_name(self.bucket_name)
+        # Reloading the configuration keeps the authorized session unless the
+        # credentials changed; b2sdk renews expired tokens on its own.
+        credentials = (self.app_id, self.app_key)
+        if self._authorized_as != credentials:
+            await self._authorize()
+        elif self.bucket is None or self.bucket.name != self.bucket_name:
+            self.bucket = await self._run(self.b2_api.get_bucket_by_name, self.bucket_name)
 
-    async def upload(self, file: bytes, filename: str, sub_folder: str | None = None) -> str:
-        await self.ensure_ready()
+    async def _authorize(self) -> None:
+        assert self.app_id is not None and self.app_key is not None and self.bucket_name is not None
+        self._authorized_as = None
+        self.bucket = None
+        await self._run(self.b2_api.authorize_account, "production", self.app_id, self.app_key)
+        self.bucket = await self._run(self.b2_api.get_bucket_by_name, self.bucket_name)
+        self._authorized_as = (self.app_id, self.app_key)
 
+    async def _call(self, func: Callable[[Bucket], _T]) -> _T:
+        """Run ``func(bucket)`` off the loop, re-authorizing once if the token was rejected."""
+
+        await self.ensure_ready()
         if self.bucket is None:
             raise RuntimeError("Backblaze bucket is not configured")
+
+        bucket = self.bucket
+        try:
+            return await self._run(func, bucket)
+        except InvalidAuthToken:
+            async with self._reauthorize_lock:
+                if self.bucket is bucket:
+                    await self._authorize()
+            if self.bucket is None:
+                raise RuntimeError("Backblaze bucket is not configured")
+            return await self._run(func, self.bucket)
+
+    def object_url(self, filename: str, sub_folder: str | None = None) -> str:
         if self.base_url is None:
             raise RuntimeError("Backblaze base URL is not configured")
-
         object_name = self.build_object_path(self.base_path, filename, sub_folder)
-        info = {"msg": "Automatic upload by py-acgimg-bot"}
-        file_version: FileVersion = self.bucket.upload_bytes(
-            data_bytes=file,
+        return f"{self.base_url}/{object_name}"
+
+    @staticmethod
+    def _upload_to_bucket(bucket: Bucket, data: bytes, object_name: str, info: dict[str, str]) -> FileVersion:
+        if len(data) <= LARGE_FILE_THRESHOLD:
+            return bucket.upload_bytes(data_bytes=data, file_name=object_name, file_info=info)
+        return bucket.create_file(
+            [WriteIntent(UploadSourceBytes(data))],
             file_name=object_name,
             file_info=info,
+            recommended_upload_part_size=LARGE_FILE_PART_SIZE,
+            min_part_size=B2_MIN_PART_SIZE,
+        )
+
+    async def upload(self, file: bytes, filename: str, sub_folder: str | None = None) -> str:
+        await self.ensure_ready()
+
+        if self.base_url is None:
+            raise RuntimeError("Backblaze base URL is not configured")
+
+        object_name = self.build_object_path(self.base_path, filename, sub_folder)
+        info = {"msg": "Automatic upload by py-acgimg-bot"}
+        file_version: FileVersion = await self._call(
+            lambda bucket: self._upload_to_bucket(bucket, file, object_name, info)
         )
         assert file_version is not None
-        return f"{self.base_url}/{object_name}"
+        return self.object_url(filename, sub_folder)
+
+    async def stat(self, filename: str, sub_folder: str | None = None) -> StorageObjectStat | None:
+        await self.ensure_ready()
+
+        object_name = self.build_object_path(self.base_path, filename, sub_folder)
+        try:
+            download_version = await self._call(lambda bucket: bucket.get_file_info_by_name(object_name))
+        except FileNotPresent:
+            return None
+        return StorageObjectStat(
+            url=self.object_url(filename, sub_folder),
+            size=download_version.size,
+        )
 
 
 backblaze = BackBlaze()
@@ -2,6 +2,7 @@
 
 STORAGE_CONFIG_DEFAULTS: dict[str, str] = {
     'storage_service_use': 'local',
+    'storage_replicas': '',
     'backblaze_app_id': '',
     'backblaze_app_key': '',
     'backblaze_bucket_name': '',
@@ -12,8 +13,18 @@ STORAGE_CONFIG_DEFAULTS: dict[str, str] = {
     'webdav_password': '',
     'webdav_base_path': '',
     'webdav_public_url': '',
+    's3_endpoint': '',
+    's3_region': 'us-east-1',
+    's3_access_key': '',
+    's3_secret_key': '',
+    's3_bucket': '',
+    's3_base_path': '',
+    's3_public_url': '',
+    's3_path_style': 'true',
+    's3_presign_seconds': '0',
     'local_storage_root': 'storage',
     'local_storage_base_url': '',
+    'storage_send_by_url': 'true',
 }
 
 
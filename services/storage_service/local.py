@@ -1,11 +1,11 @@
-from __future__ import annotations
+﻿from __future__ import annotations
 
 from pathlib import Path
 
 import aiofiles
 
 from registries import config_registry
-from .Storage import Storage
+from .Storage import Storage, StorageObjectStat
 
 
 class LocalStorage(Storage):
@@ -21,8 +21,7 @@ class LocalStorage(Storage):
         self.base_url = config.base_url
         self.root_path.mkdir(parents=True, exist_ok=True)
 
-    async def upload(self, file: bytes, filename: str, sub_folder: str | None = None) -> str:
-        await self.ensure_ready()
+    def _resolve_destination(self, filename: str, sub_folder: str | None) -> Path:
         if self.root_path is None:
             raise RuntimeError("Local storage root path is not configured")
 
@@ -30,16 +29,34 @@ class LocalStorage(Storage):
         destination_dir = self.root_path
         if folder:
             destination_dir = self.root_path.joinpath(*folder.rstrip("/").split("/"))
-            destination_dir.mkdir(parents=True, exist_ok=True)
-
-        destination_path = destination_dir / filename
-        async with aiofiles.open(destination_path, "wb") as fp:
-            await fp.write(file)
+        return destination_dir / filename
 
+    def object_url(self, filename: str, sub_folder: str | None = None) -> str:
+        destination_path = self._resolve_destination(filename, sub_folder)
         relative_path = destination_path.relative_to(self.root_path).as_posix()
         if self.base_url:
             return f"{self.base_url.rstrip('/')}/{relative_path}"
         return relative_path
 
+    async def upload(self, file: bytes, filename: str, sub_folder: str | None = None) -> str:
+        await self.ensure_ready()
+
+        destination_path = self._resolve_destination(filename, sub_folder)
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(destination_path, "wb") as fp:
+            await fp.write(file)
+
+        return self.object_url(filename, sub_folder)
+
+    async def stat(self, filename: str, sub_folder: str | None = None) -> StorageObjectStat | None:
+        await self.ensure_ready()
+
+        destination_path = self._resolve_destination(filename, sub_folder)
+        try:
+            result = destination_path.stat()
+        except FileNotFoundError:
+            return None
+        return StorageObjectStat(url=self.object_url(filename, sub_folder), size=result.st_size)
+
 
 local_storage = LocalStorage()
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+from .Storage import Storage, StorageObjectStat
+
+logger = logging.getLogger(__name__)
+
+# Exponentially weighted moving average factor for read latency.
+LATENCY_ALPHA = 0.3
+# Consecutive failures after which a replica is skipped for a cool-down period.
+UNHEALTHY_AFTER_FAILURES = 3
+UNHEALTHY_COOLDOWN_SECONDS = 60.0
+
+
+@dataclass(slots=True)
+class ReplicaHealth:
+    latency: float | None = None
+    failures: int = 0
+    unhealthy_until: float = 0.0
+    configured: bool = True
+
+    def healthy(self, now: float) -> bool:
+        return self.configured and now >= self.unhealthy_until
+
+
+@dataclass(slots=True)
+class ReadCandidate:
+    member: str
+    url: str
+
+
+class ReplicatedStorage(Storage):
+    """Write to a primary provider and mirror every object to secondaries.
+
+    Uploads complete once the primary has the object; copies to the replicas
+    are queued as background jobs. Reads are spread over the replica set,
+    fastest healthy member first, using latencies reported by the readers.
+    """
+
+    def __init__(self, primary: Storage, replicas: Sequence[Storage]) -> None:
+        super().__init__("replicated")
+        self.primary = primary
+        self.replicas = list(replicas)
+        self._health: dict[str, ReplicaHealth] = {
+            member.name: ReplicaHealth() for member in self.members
+        }
+
+    @property
+    def members(self) -> list[Storage]:
+        return [self.primary, *self.replicas]
+
+    @property
+    def active_replicas(self) -> list[Storage]:
+        return [replica for replica in self.replicas if self._health[replica.name].configured]
+
+    def member(self, name: str) -> Storage | None:
+        for candidate in self.members:
+            if candidate.name == name:
+                return candidate
+        return None
+
+    async def _load_config(self) -> None:
+        await self.primary.get_config()
+        for replica in self.replicas:
+            health = self._health[replica.name]
+            try:
+                await replica.get_config()
+            except Exception as exc:
+                # A misconfigured replica must not take the primary down with it.
+                logger.warning("Storage replica %s is not usable: %s", replica.name, exc)
+                health.configured = False
+            else:
+                health.configured = True
+
+    def object_url(self, filename: str, sub_folder: str | None = None) -> str:
+        return self.primary.object_url(filename, sub_folder)
+
+    def object_key(self, url: str) -> str | None:
+        return self.primary.object_key(url)
+
+    def read_url(self, url: str) -> str:
+        return self.primary.read_url(url)
+
+    async def upload(self, file: bytes, filename: str, sub_folder: str | None = None) -> str:
+        await self.ensure_ready()
+        url = await self.primary.upload(file, filename, sub_folder)
+        await self._mirror(filename, sub_folder, url)
+        return url
+
+    async def upload_file(self, path: Path, filename: str, sub_folder: str | None = None) -> str:
+        await self.ensure_ready()
+        url = await self.primary.upload_file(path, filename, sub_folder)
+        await self._mirror(filename, sub_folder, url)
+        return url
+
+    async def stat(self, filename: str, sub_folder: str | None = None) -> StorageObjectStat | None:
+        await self.ensure_ready()
+        return await self.primary.stat(filename, sub_folder)
+
+    async def close(self) -> None:
+        for member in self.members:
+            await member.close()
+
+    async def _mirror(self, filename: str, sub_folder: str | None, url: str) -> None:
+        from .replication import enqueue_mirror
+
+        targets = [replica.name for replica in self.active_replicas]
+        if not targets:
+            return
+        key = self.primary.join_path(self.primary.normalize_sub_folder(sub_folder), filename)
+        try:
+            await enqueue_mirror(key, url, targets)
+        except Exception:
+            # The reconciliation job backfills anything that was not queued.
+            logger.exception("Failed to queue replication of %s", key)
+
+    def read_candidates(self, url: str) -> list[ReadCandidate]:
+        """Return URLs for the object behind ``url``, best replica first."""
+
+        key = self.primary.object_key(url)
+        if key is None:
+            return [ReadCandidate(self.primary.name, self.primary.read_url(url))]
+        sub_folder, _, filename = key.rpartition("/")
+
+        now = time.monotonic()
+        healthy: list[tuple[float, int, ReadCandidate]] = []
+        degraded: list[ReadCandidate] = []
+        for position, member in enumerate(self.members):
+            health = self._health[member.name]
+            if not health.configured:
+                continue
+            candidate = ReadCandidate(
+                member.name,
+                member.read_url(member.object_url(filename, sub_folder or None)),
+            )
+            if not health.healthy(now):
+                degraded.append(candidate)
+                continue
+            # Unmeasured members sort first so every replica gets sampled.
+            latency = health.latency if health.latency is not None else -1.0
+            healthy.append((latency, position, candidate))
+        healthy.sort(key=lambda item: (item[0], item[1]))
+        return [candidate for _, _, candidate in healthy] + degraded
+
+    def record_read(self, member: str, elapsed: float, *, ok: bool) -> None:
+        health = self._health.get(member)
+        if health is None:
+            return
+        if ok:
+            health.failures = 0
+            health.unhealthy_until = 0.0
+            if health.latency is None:
+                health.latency = elapsed
+            else:
+                health.latency = LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * health.latency
+            return
+        health.failures += 1
+        if health.failures >= UNHEALTHY_AFTER_FAILURES:
+            health.unhealthy_until = time.monotonic() + UNHEALTHY_COOLDOWN_SECONDS
+
+    def health_snapshot(self) -> dict[str, dict[str, float | int | bool | None]]:
+        now = time.monotonic()
+        return {
+            name: {
+                "latency_ms": round(health.latency * 1000, 1) if health.latency is not None else None,
+                "failures": health.failures,
+                "healthy": health.healthy(now),
+            }
+            for name, health in self._health.items()
+        }
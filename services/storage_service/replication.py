@@ -0,0 +1,137 @@
+"""Background jobs that copy stored objects to storage replicas."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Sequence
+
+from registries import illust_registry
+from registries.job_registry import JobInfo
+from services.job_queue import JobContext, PermanentJobError, enqueue, job_handler
+
+from .Storage import Storage
+
+logger = logging.getLogger(__name__)
+
+MIRROR_JOB = "storage_mirror"
+RECONCILE_JOB = "storage_reconcile"
+RECONCILE_BATCH_SIZE = 100
+RECONCILE_CONCURRENCY = 4
+
+
+async def enqueue_mirror(key: str, url: str, replicas: Sequence[str]) -> tuple[JobInfo, bool]:
+    return await enqueue(
+        MIRROR_JOB,
+        {"key": key, "url": url, "replicas": list(replicas)},
+        dedupe_key=f"{MIRROR_JOB}:{key}",
+    )
+
+
+async def enqueue_reconcile() -> tuple[JobInfo, bool]:
+    return await enqueue(RECONCILE_JOB, {}, dedupe_key=RECONCILE_JOB, max_attempts=3)
+
+
+async def _replicated_storage():
+    from .replicated import ReplicatedStorage
+    from .use import use
+
+    storage = await use()
+    if not isinstance(storage, ReplicatedStorage):
+        raise PermanentJobError("当前存储未启用副本模式")
+    await storage.ensure_ready()
+    return storage
+
+
+async def _copy_to(replica: Storage, key: str, source_url: str, *, overwrite: bool = False) -> bool:
+    """Copy ``key`` to ``replica``; returns whether it uploaded.
+
+    Without ``overwrite`` an existing replica object is left alone, which is
+    only safe for backfills: page keys are stable, so a re-imported page
+    reuses the key with new content.
+    """
+
+    from services.file_service import get_cached_path, get_file
+
+    sub_folder, _, filename = key.rpartition("/")
+    if not overwrite and await replica.exists(filename, sub_folder or None):
+        return False
+
+    cached_path = get_cached_path(filename)
+    if cached_path is None:
+        # Read from the primary only; pulling from Pixiv is the importer's job.
+        await get_file(filename, source_url)
+        cached_path = get_cached_path(filename)
+    if cached_path is None:
+        raise FileNotFoundError(f"无法读取 {key} 的源文件")
+    await replica.upload_file(cached_path, filename, sub_folder or None)
+    return True
+
+
+@job_handler(MIRROR_JOB)
+async def run_mirror(context: JobContext) -> dict[str, Any]:
+    storage = await _replicated_storage()
+    key = context.payload.get("key")
+    url = context.payload.get("url")
+    if not key or not url:
+        raise PermanentJobError("任务缺少对象信息")
+
+    done: list[str] = list(context.checkpoint.get("done") or [])
+    for name in context.payload.get("replicas") or []:
+        if name in done:
+            continue
+        replica = storage.member(name)
+        if replica is None:
+            logger.info("Skipping replication of %s to removed replica %s", key, name)
+            continue
+        # Mirrors follow a primary write, so the replica copy may be outdated.
+        await _copy_to(replica, key, url, overwrite=True)
+        done.append(name)
+        await context.save_checkpoint(done=done)
+    return {"key": key, "replicas": done}
+
+
+@job_handler(RECONCILE_JOB)
+async def run_reconcile(context: JobContext) -> dict[str, Any]:
+    """Walk every stored page and backfill replicas that are missing it."""
+
+    storage = await _replicated_storage()
+    last_id: str | None = context.checkpoint.get("last_id")
+    copied = int(context.checkpoint.get("copied") or 0)
+    failed = int(context.checkpoint.get("failed") or 0)
+    semaphore = asyncio.Semaphore(RECONCILE_CONCURRENCY)
+
+    async def _reconcile_object(replica: Storage, key: str, url: str) -> bool | None:
+        async with semaphore:
+            try:
+                return await _copy_to(replica, key, url)
+            except Exception as exc:
+                logger.warning("Failed to backfill %s on %s: %s", key, replica.name, exc)
+                return None
+
+    while True:
+        illustrations = await illust_registry.list_illustrations_after(last_id, RECONCILE_BATCH_SIZE)
+        if not illustrations:
+            break
+
+        tasks = []
+        for illust in illustrations:
+            for url in illust.file_urls or []:
+                key = storage.object_key(url) if url else None
+                if key is None:
+                    continue
+                for replica in storage.active_replicas:
+                    tasks.append(_reconcile_object(replica, key, url))
+        for outcome in await asyncio.gather(*tasks):
+            if outcome is None:
+                failed += 1
+            elif outcome:
+                copied += 1
+
+        last_id = str(illustrations[-1].id)
+        await context.save_checkpoint(last_id=last_id, copied=copied, failed=failed)
+
+    return {"copied": copied, "failed": failed}
+
+
+__all__ = ["MIRROR_JOB", "RECONCILE_JOB", "enqueue_mirror", "enqueue_reconcile"]
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+from urllib.parse import quote, unquote, urlsplit
+from xml.etree import ElementTree
+
+import aiofiles
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from yarl import URL
+
+from registries import config_registry
+from .Storage import Storage, StorageObjectStat
+
+logger = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = 16
+REQUEST_TIMEOUT_SECONDS = 120
+STAT_TIMEOUT_SECONDS = 30
+
+# Objects above the threshold are sent as a multipart upload with parts
+# uploaded concurrently. S3 requires every part but the last to be >= 5 MiB.
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+MULTIPART_CONCURRENCY = 4
+
+_UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+_ALGORITHM = "AWS4-HMAC-SHA256"
+_S3_NS = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+PartReader = Callable[[int, int], Awaitable[bytes]]
+
+
+def _quote(value: str, safe: str = "-_.~") -> str:
+    return quote(value, safe=safe)
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).digest()
+
+
+class S3Storage(Storage):
+    """S3-compatible object storage (AWS S3, MinIO, R2, ...) signed with SigV4."""
+
+    def __init__(self) -> None:
+        super().__init__("s3")
+        self.endpoint: str | None = None
+        self.region: str = "us-east-1"
+        self.access_key: str | None = None
+        self.secret_key: str | None = None
+        self.bucket: str | None = None
+        self.base_path: str | None = None
+        self.public_base_url: str | None = None
+        self.path_style = True
+        self.presign_seconds = 0
+        self._session: ClientSession | None = None
+
+    async def _load_config(self) -> None:
+        config = await config_registry.get_s3_config()
+        required = {
+            "endpoint": config.endpoint,
+            "access_key": config.access_key,
+            "secret_key": config.secret_key,
+            "bucket": config.bucket,
+        }
+        missing = [key for key, value in required.items() if not value]
+        if missing:
+            raise RuntimeError(f"S3 configuration missing values: {', '.join(missing)}")
+
+        if (config.endpoint, config.access_key, config.secret_key) != (
+            self.endpoint,
+            self.access_key,
+            self.secret_key,
+        ):
+            await self.close()
+        self.endpoint = config.endpoint
+        self.region = config.region or "us-east-1"
+        self.access_key = config.access_key
+        self.secret_key = config.secret_key
+        self.bucket = config.bucket
+        self.base_path = config.base_path or ""
+        self.public_base_url = config.public_base_url
+        self.path_style = config.path_style
+        self.presign_seconds = config.presign_seconds
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _get_session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(
+                timeout=ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+                connector=TCPConnector(limit=MAX_CONNECTIONS),
+            )
+        return self._session
+
+    # -- addressing -----------------------------------------------------------------
+
+    def _object_name(self, filename: str, sub_folder: str | None) -> str:
+        return self.build_object_path(self.base_path, filename, sub_folder)
+
+    def _bucket_url(self) -> tuple[str, str]:
+        """Return ``(origin, path_prefix)`` for requests against the bucket."""
+
+        if self.endpoint is None or self.bucket is None:
+            raise RuntimeError("S3 endpoint is not configured")
+        parts = urlsplit(self.endpoint)
+        if self.path_style:
+            return f"{parts.scheme}://{parts.netloc}", f"{parts.path.rstrip('/')}/{self.bucket}"
+        return f"{parts.scheme}://{self.bucket}.{parts.netloc}", parts.path.rstrip("/")
+
+    def _endpoint_url(self, object_name: str) -> tuple[str, str]:
+        origin, prefix = self._bucket_url()
+        return origin, f"{prefix}/{_quote(object_name, safe='/-_.~')}"
+
+    def object_url(self, filename: str, sub_folder: str | None = None) -> str:
+        object_name = self._object_name(filename, sub_folder)
+        if self.public_base_url:
+            return f"{self.public_base_url}/{object_name}"
+        origin, path = self._endpoint_url(object_name)
+        return f"{origin}{path}"
+
+    def presigned_url(self, url: str, expires_in: int | None = None) -> str:
+        """Return a time-limited GET URL for an object URL produced by :meth:`object_url`."""
+
+        key = self.object_key(url)
+        if key is None:
+            return url
+        sub_folder, _, filename = unquote(key).rpartition("/")
+        origin, path = self._endpoint_url(self._object_name(filename, sub_folder or None))
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{now:%Y%m%d}/{self.region}/s3/aws4_request"
+        query = {
+            "X-Amz-Algorithm": _ALGORITHM,
+            "X-Amz-Credential": f"{self.access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(expires_in or self.presign_seconds or 3600),
+            "X-Amz-SignedHeaders": "host",
+        }
+        host = urlsplit(origin).netloc
+        canonical_query = self._canonical_query(query)
+        signature = self._signature(
+            "GET",
+            path,
+            canonical_query,
+            {"host": host},
+            _UNSIGNED_PAYLOAD,
+            amz_date,
+            scope,
+        )
+        return f"{origin}{path}?{canonical_query}&X-Amz-Signature={signature}"
+
+    def read_url(self, url: str) -> str:
+        if self.presign_seconds and not self.public_base_url:
+            return self.presigned_url(url)
+        return url
+
+    # -- signing --------------------------------------------------------------------
+
+    @staticmethod
+    def _canonical_query(query: dict[str, str]) -> str:
+        return "&".join(f"{_quote(key)}={_quote(value)}" for key, value in sorted(query.items()))
+
+    def _signature(
+        self,
+        method: str,
+        path: str,
+        canonical_query: str,
+        headers: dict[str, str],
+        payload_hash: str,
+        amz_date: str,
+        scope: str,
+    ) -> str:
+        assert self.secret_key is not None
+        signed_headers = ";".join(sorted(headers))
+        canonical_headers = "".join(f"{name}:{headers[name].strip()}\n" for name in sorted(headers))
+        canonical_request = "\n".join(
+            [method, path, canonical_query, canonical_headers, signed_headers, payload_hash]
+        )
+        string_to_sign = "\n".join(
+            [_ALGORITHM, amz_date, scope, hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()]
+        )
+        key = _hmac(f"AWS4{self.secret_key}".encode("utf-8"), scope.split("/")[0])
+        for component in scope.split("/")[1:]:
+            key = _hmac(key, component)
+        return hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _signed_request(
+        self,
+        method: str,
+        object_name: str,
+        *,
+        query: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        data: bytes | None = None,
+        timeout: ClientTimeout | None = None,
+    ):
+        origin, path = self._endpoint_url(object_name)
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{now:%Y%m%d}/{self.region}/s3/aws4_request"
+
+        signed = {
+            "host": urlsplit(origin).netloc,
+            "x-amz-content-sha256": _UNSIGNED_PAYLOAD,
+            "x-amz-date": amz_date,
+        }
+        for name, value in (headers or {}).items():
+            signed[name.lower()] = value
+        canonical_query = self._canonical_query(query or {})
+        signature = self._signature(
+            method, path, canonical_query, signed, _UNSIGNED_PAYLOAD, amz_date, scope
+        )
+        request_headers = {name: value for name, value in signed.items() if name != "host"}
+        request_headers["Authorization"] = (
+            f"{_ALGORITHM} Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={';'.join(sorted(signed))}, Signature={signature}"
+        )
+        url = URL(f"{origin}{path}" + (f"?{canonical_query}" if canonical_query else ""), encoded=True)
+        return self._get_session().request(
+            method, url, headers=request_headers, data=data, timeout=timeout
+        )
+
+    @staticmethod
+    async def _raise_for_status(response, action: str) -> None:
+        if response.status >= 400:
+            body = await response.text()
+            raise RuntimeError(f"S3 {action} failed ({response.status}): {body}")
+
+    # -- uploads --------------------------------------------------------------------
+
+    async def _put_object(self, object_name: str, data: bytes) -> None:
+        async with self._signed_request("PUT", object_name, data=data) as response:
+            await self._raise_for_status(response, "PUT")
+
+    async def _multipart_upload(self, object_name: str, size: int, read_part: PartReader) -> None:
+        async with self._signed_request("POST", object_name, query={"uploads": ""}) as response:
+            await self._raise_for_status(response, "CreateMultipartUpload")
+            body = await response.text()
+        root = ElementTree.fromstring(body)
+        upload_id = root.findtext(f"{_S3_NS}UploadId") or root.findtext("UploadId")
+        if not upload_id:
+            raise RuntimeError("S3 CreateMultipartUpload returned no UploadId")
+
+        semaphore = asyncio.Semaphore(MULTIPART_CONCURRENCY)
+        offsets = list(range(0, size, MULTIPART_PART_SIZE))
+
+        async def _upload_part(number: int, offset: int) -> tuple[int, str]:
+            async with semaphore:
+                chunk = await read_part(offset, min(MULTIPART_PART_SIZE, size - offset))
+                query = {"partNumber": str(number), "uploadId": upload_id}
+                async with self._signed_request("PUT", object_name, query=query, data=chunk) as response:
+                    await self._raise_for_status(response, f"UploadPart {number}")
+                    return number, response.headers.get("ETag", "")
+
+        tasks = [
+            asyncio.create_task(_upload_part(index + 1, offset))
+            for index, offset in enumerate(offsets)
+        ]
+        try:
+            parts = await asyncio.gather(*tasks)
+            manifest = "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+                for number, etag in sorted(parts)
+            )
+            payload = f"<CompleteMultipartUpload>{manifest}</CompleteMultipartUpload>".encode("utf-8")
+            async with self._signed_request(
+                "POST",
+                object_name,
+                query={"uploadId": upload_id},
+                headers={"content-type": "application/xml"},
+                data=payload,
+            ) as response:
+                await self._raise_for_status(response, "CompleteMultipartUpload")
+                # S3 may report a failed completion with a 200 status and an Error body.
+                body = await response.text()
+                if "<Error>" in body:
+                    raise RuntimeError(f"S3 CompleteMultipartUpload failed: {body}")
+        except Exception:
+            # Stop the remaining parts so nothing is uploaded after the abort.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                async with self._signed_request(
+                    "DELETE", object_name, query={"uploadId": upload_id}
+                ) as response:
+                    if response.status >= 400 and response.status != 404:
+                        logger.warning(
+                            "Aborting multipart upload of %s returned HTTP %s",
+                            object_name,
+                            response.status,
+                        )
+            except Exception as exc:
+                logger.warning("Failed to abort multipart upload of %s: %s", object_name, exc)
+            raise
+
+    async def upload(self, file: bytes, filename: str, sub_folder: str | None = None) -> str:
+        await self.ensure_ready()
+        object_name = self._object_name(filename, sub_folder)
+        if len(file) <= MULTIPART_THRESHOLD:
+            await self._put_object(object_name, file)
+        else:
+            view = memoryview(file)
+
+            async def _read(offset: int, length: int) -> bytes:
+                return bytes(view[offset : offset + length])
+
+            await self._multipart_upload(object_name, len(file), _read)
+        return self.object_url(filename, sub_folder)
+
+    async def upload_file(self, path: Path, filename: str, sub_folder: str | None = None) -> str:
+        size = path.stat().st_size
+        if size <= MULTIPART_THRESHOLD:
+            return await super().upload_file(path, filename, sub_folder)
+
+        await self.ensure_ready()
+        object_name = self._object_name(filename, sub_folder)
+
+        async def _read(offset: int, length: int) -> bytes:
+            async with aiofiles.open(path, "rb") as fp:
+                await fp.seek(offset)
+                return await fp.read(length)
+
+        await self._multipart_upload(object_name, size, _read)
+        return self.object_url(filename, sub_folder)
+
+    async def stat(self, filename: str, sub_folder: str | None = None) -> StorageObjectStat | None:
+        await self.ensure_ready()
+        object_name = self._object_name(filename, sub_folder)
+        async with self._signed_request(
+            "HEAD", object_name, timeout=ClientTimeout(total=STAT_TIMEOUT_SECONDS)
+        ) as response:
+            if response.status == 404:
+                return None
+            if response.status >= 400:
+                raise RuntimeError(f"S3 HEAD failed ({response.status})")
+            return StorageObjectStat(
+                url=self.object_url(filename, sub_folder),
+                size=response.content_length,
+            )
+
+
+s3_storage = S3Storage()
@@ -1,20 +1,90 @@
+import asyncio
+import logging
 from collections.abc import Mapping
 
 from registries import config_registry
+from services import metrics
 from .Storage import Storage
 from .backblaze import backblaze
 from .local import local_storage
+from .replicated import ReplicatedStorage
+from .s3 import s3_storage
 from .webdav import webdav_storage
 
+logger = logging.getLogger(__name__)
 
 _STORAGE_PROVIDERS: Mapping[str, Storage] = {
     "backblaze": backblaze,
     "webdav": webdav_storage,
+    "s3": s3_storage,
     "local": local_storage,
 }
 
+# Replica sets keep latency and health measurements, so they are reused for as
+# long as the configuration selects the same members.
+_replicated: dict[tuple[str, tuple[str, ...]], ReplicatedStorage] = {}
 
-async def use() -> Storage | None:
+
+def _parse_replicas(value: object, primary_key: str) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    keys: list[str] = []
+    for item in str(value).replace(";", ",").split(","):
+        key = item.strip().lower()
+        if not key or key == primary_key or key in keys:
+            continue
+        if key not in _STORAGE_PROVIDERS:
+            # A typo in the optional replica list must not disable the primary.
+            logger.warning("Ignoring unknown storage replica %r", key)
+            continue
+        keys.append(key)
+    return tuple(keys)
+
+
+def _replica_health() -> dict[str, object]:
+    return {
+        f"{'+'.join((primary, *replicas))}": storage.health_snapshot()
+        for (primary, replicas), storage in _replicated.items()
+    }
+
+
+metrics.register_provider("storage_replicas", _replica_health)
+
+
+STORAGE_CONFIG_PREFIXES = ("storage_", "backblaze_", "webdav_", "s3_", "local_storage_")
+
+# The resolved provider is cached until invalidate() is called; ``_resolved``
+# distinguishes "not resolved yet" from "storage disabled" (``None``).
+_active: Storage | None = None
+_resolved = False
+_generation = 0
+_resolve_lock = asyncio.Lock()
+
+
+def is_storage_config_key(key: str) -> bool:
+    return key.startswith(STORAGE_CONFIG_PREFIXES)
+
+
+def invalidate() -> None:
+    """Drop the cached provider and force every provider to reload its config."""
+
+    global _active, _resolved, _generation
+    _active = None
+    _resolved = False
+    _generation += 1
+    for provider in (*_STORAGE_PROVIDERS.values(), *_replicated.values()):
+        provider.invalidate_config()
+    metrics.increment("storage_registry", "invalidations")
+
+
+def invalidate_for_key(key: str) -> None:
+    """Invalidate the registry if ``key`` is a storage setting."""
+
+    if is_storage_config_key(key):
+        invalidate()
+
+
+async def _resolve() -> Storage | None:
     config = await config_registry.get_config("storage_service_use")
     if config is None:
         return None
@@ -24,6 +94,43 @@ async def use() -> Storage | None:
         return None
 
     try:
-        return _STORAGE_PROVIDERS[provider_key]
+        primary = _STORAGE_PROVIDERS[provider_key]
     except KeyError as exc:
         raise Exception(f"Unknown storage service: {provider_key}") from exc
+
+    replica_keys = _parse_replicas(await config_registry.get_config("storage_replicas"), provider_key)
+    if not replica_keys:
+        return primary
+
+    cache_key = (provider_key, replica_keys)
+    storage = _replicated.get(cache_key)
+    if storage is None:
+        storage = ReplicatedStorage(primary, [_STORAGE_PROVIDERS[key] for key in replica_keys])
+        _replicated[cache_key] = storage
+    return storage
+
+
+async def use() -> Storage | None:
+    global _active, _resolved
+    if _resolved:
+        metrics.increment("storage_registry", "hits")
+        return _active
+
+    async with _resolve_lock:
+        if _resolved:
+            metrics.increment("storage_registry", "hits")
+            return _active
+        generation = _generation
+        storage = await _resolve()
+        metrics.increment("storage_registry", "resolves")
+        # An invalidation that raced with the lookup wins; the next call resolves again.
+        if generation == _generation:
+            _active = storage
+            _resolved = True
+            logger.info("Storage provider resolved to %s", storage.name if storage else "disabled")
+        return storage
+
+
+async def close_all() -> None:
+    for provider in _STORAGE_PROVIDERS.values():
+        await provider.close()
@@ -1,9 +1,25 @@
 from __future__ import annotations
 
-from aiohttp import BasicAuth, ClientSession, ClientTimeout
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+from xml.etree import ElementTree
+
+import aiofiles
+from aiohttp import BasicAuth, ClientSession, ClientTimeout, TCPConnector
 
 from registries import config_registry
-from .Storage import Storage
+from .Storage import Storage, StorageObjectStat
+
+
+_PROPFIND_SIZE_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<d:propfind xmlns:d="DAV:"><d:prop><d:getcontentlength/></d:prop></d:propfind>'
+)
+
+MAX_CONNECTIONS = 8
+UPLOAD_TIMEOUT_SECONDS = 60
+STAT_TIMEOUT_SECONDS = 30
+_UPLOAD_CHUNK_SIZE = 256 * 1024
 
 
 class WebDavStorage(Storage):
@@ -14,10 +30,16 @@ class WebDavStorage(Storage):
         self.password: str | None = None
         self.base_path: str | None = None
         self.public_base_url: str | None = None
+        self._session: ClientSession | None = None
+        # Remote collections created or confirmed during this process' lifetime.
+        self._known_directories: set[str] = set()
 
     async def _load_config(self) -> None:
         config = await config_registry.get_webdav_config()
-        self.endpoint = (config.endpoint or "").rstrip("/") or None
+        endpoint = (config.endpoint or "").rstrip("/") or None
+        if (endpoint, config.username, config.password) != (self.endpoint, self.username, self.password):
+            await self.close()
+        self.endpoint = endpoint
         self.username = config.username
         self.password = config.password
         self.base_path = config.base_path or ""
@@ -26,48 +48,167 @@ class WebDavStorage(Storage):
         if self.endpoint is None:
             raise RuntimeError("WebDAV endpoint is not configured")
 
-    async def _ensure_remote_path(self, session: ClientSession, directory: str) -> None:
-        if not directory:
+    async def close(self) -> None:
+        session, self._session = self._session, None
+        self._known_directories.clear()
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _get_session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(
+                auth=self._build_auth(),
+                timeout=ClientTimeout(total=UPLOAD_TIMEOUT_SECONDS),
+                connector=TCPConnector(limit=MAX_CONNECTIONS),
+            )
+        return self._session
+
+    def _forget_directory(self, directory: str) -> None:
+        segments = [segment for segment in directory.split("/") if segment]
+        for length in range(1, len(segments) + 1):
+            self._known_directories.discard("/".join(segments[:length]))
+
+    async def _ensure_remote_path(self, session: ClientSession, directory: str, *, retry: bool = True) -> None:
+        if not directory or directory in self._known_directories:
             return
         segments = [segment for segment in directory.split("/") if segment]
         current_path: list[str] = []
         for segment in segments:
             current_path.append(segment)
-            url = f"{self.endpoint}/{'/'.join(current_path)}"
+            path = "/".join(current_path)
+            if path in self._known_directories:
+                continue
+            url = f"{self.endpoint}/{path}"
             async with session.request("MKCOL", url) as response:
-                if response.status in {201, 301, 405}:
+                if response.status in {200, 201, 204, 301, 405}:
                     # 201 created, 301/405 already exists
+                    self._known_directories.add(path)
                     continue
-                if response.status in {200, 204}:
+                if response.status == 409 and retry:
+                    # A parent we believed to exist is gone; walk the whole path again.
+                    self._forget_directory(directory)
+                    await self._ensure_remote_path(session, directory, retry=False)
+                    return
+                body = await response.text()
+                raise RuntimeError(f"WebDAV MKCOL failed ({response.status}): {body}")
+
+    def _build_auth(self) -> BasicAuth | None:
+        if self.username:
+            return BasicAuth(self.username, self.password or "")
+        return None
+
+    def object_url(self, filename: str, sub_folder: str | None = None) -> str:
+        object_name = self.build_object_path(self.base_path, filename, sub_folder)
+        if self.public_base_url:
+            return f"{self.public_base_url.rstrip('/')}/{object_name}"
+        return f"{self.endpoint}/{object_name}"
+
+    async def _put(
+        self,
+        filename: str,
+        sub_folder: str | None,
+        body: Callable[[], Any],
+        headers: dict[str, str] | None = None,
+    ) -> str:
+        await self.ensure_ready()
+        if self.endpoint is None:
+            raise RuntimeError("WebDAV endpoint is not configured")
+
+        object_name = self.build_object_path(self.base_path, filename, sub_folder)
+        directory = object_name.rsplit("/", 1)[0] if "/" in object_name else ""
+        upload_url = f"{self.endpoint}/{object_name}"
+        session = self._get_session()
+
+        for attempt in range(2):
+            await self._ensure_remote_path(session, directory)
+            async with session.put(upload_url, data=body(), headers=headers) as response:
+                if response.status == 409 and attempt == 0:
+                    # The target collection disappeared behind our back.
+                    self._forget_directory(directory)
                     continue
                 if response.status >= 400:
-                    body = await response.text()
-                    raise RuntimeError(f"WebDAV MKCOL failed ({response.status}): {body}")
+                    text = await response.text()
+                    raise RuntimeError(f"WebDAV upload failed ({response.status}): {text}")
+                break
+
+        return self.object_url(filename, sub_folder)
 
     async def upload(self, file: bytes, filename: str, sub_folder: str | None = None) -> str:
+        return await self._put(filename, sub_folder, lambda: file)
+
+    async def upload_file(self, path: Path, filename: str, sub_folder: str | None = None) -> str:
+        size = path.stat().st_size
+        return await self._put(
+            filename,
+            sub_folder,
+            lambda: _iter_file(path),
+            headers={"Content-Length": str(size)},
+        )
+
+    async def stat(self, filename: str, sub_folder: str | None = None) -> StorageObjectStat | None:
         await self.ensure_ready()
         if self.endpoint is None:
             raise RuntimeError("WebDAV endpoint is not configured")
 
         object_name = self.build_object_path(self.base_path, filename, sub_folder)
-        directory = object_name.rsplit("/", 1)[0] if "/" in object_name else ""
+        object_url = f"{self.endpoint}/{object_name}"
 
-        auth = None
-        if self.username:
-            auth = BasicAuth(self.username, self.password or "")
+        session = self._get_session()
+        timeout = ClientTimeout(total=STAT_TIMEOUT_SECONDS)
+        async with session.head(object_url, timeout=timeout) as response:
+            if response.status == 404:
+                return None
+            if response.status < 400:
+                return StorageObjectStat(
+                    url=self.object_url(filename, sub_folder),
+                    size=response.content_length,
+                )
+            if response.status not in {405, 501}:
+                body = await response.text()
+                raise RuntimeError(f"WebDAV HEAD failed ({response.status}): {body}")
 
-        timeout = ClientTimeout(total=60)
-        async with ClientSession(auth=auth, timeout=timeout) as session:
-            await self._ensure_remote_path(session, directory)
-            upload_url = f"{self.endpoint}/{object_name}"
-            async with session.put(upload_url, data=file) as response:
-                if response.status >= 400:
-                    body = await response.text()
-                    raise RuntimeError(f"WebDAV upload failed ({response.status}): {body}")
+        # Some servers do not allow HEAD on resources; PROPFIND is mandatory in WebDAV.
+        async with session.request(
+            "PROPFIND",
+            object_url,
+            headers={"Depth": "0"},
+            data=_PROPFIND_SIZE_BODY,
+            timeout=timeout,
+        ) as response:
+            if response.status == 404:
+                return None
+            if response.status >= 400:
+                body = await response.text()
+                raise RuntimeError(f"WebDAV PROPFIND failed ({response.status}): {body}")
+            body = await response.text()
 
-        if self.public_base_url:
-            return f"{self.public_base_url.rstrip('/')}/{object_name}"
-        return upload_url
+        return StorageObjectStat(
+            url=self.object_url(filename, sub_folder),
+            size=_parse_content_length(body),
+        )
+
+
+async def _iter_file(path: Path) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as fp:
+        while True:
+            chunk = await fp.read(_UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _parse_content_length(body: str) -> int | None:
+    try:
+        root = ElementTree.fromstring(body)
+    except ElementTree.ParseError:
+        return None
+    node = root.find(".//{DAV:}getcontentlength")
+    if node is None or not node.text:
+        return None
+    try:
+        return int(node.text.strip())
+    except ValueError:
+        return None
 
 
 webdav_storage = WebDavStorage()
@@ -1,19 +1,25 @@
-"""Caching helpers for expensive Telegram Bot API calls."""
+"""Caching helpers for expensive Telegram Bot API calls and other hot lookups."""
 
 from __future__ import annotations
 
 import asyncio
 import logging
-import pickle
-from dataclasses import dataclass
+import json
+import struct
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Protocol
+from typing import Any, Awaitable, Callable, Mapping, Protocol, Sequence
 
 from telegram import Bot
 from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 
 from registries import config_registry
+from services import metrics
 
 try:  # pragma: no cover - optional dependency
     from redis.asyncio import Redis  # type: ignore
@@ -42,6 +48,12 @@ class CacheBackend(Protocol):
     async def set(self, key: str, entry: CacheEntry, ttl: int) -> None:
         ...
 
+    async def get_many(self, keys: Sequence[str]) -> dict[str, CacheEntry]:
+        ...
+
+    async def set_many(self, entries: Mapping[str, CacheEntry], ttl: int) -> None:
+        ...
+
     async def delete(self, key: str) -> None:
         ...
 
@@ -49,36 +61,220 @@ class CacheBackend(Protocol):
         ...
 
 
-class InMemoryCacheBackend:
-    """A simple asyncio-safe in-memory cache backend."""
+# Redis payload: version byte, expires_at and stored_at as float64 epoch
+# seconds, then the value as compact JSON. Values must be JSON serializable.
+_PAYLOAD_VERSION = 1
+_PAYLOAD_HEADER = struct.Struct("!Bdd")
+
+
+def encode_entry(entry: CacheEntry) -> bytes:
+    body = json.dumps(entry.value, separators=(",", ":"), ensure_ascii=False).encode()
+    return _PAYLOAD_HEADER.pack(
+        _PAYLOAD_VERSION,
+        entry.expires_at.timestamp(),
+        entry.stored_at.timestamp(),
+    ) + body
+
+
+def decode_entry(payload: bytes) -> CacheEntry:
+    if len(payload) < _PAYLOAD_HEADER.size or payload[0] != _PAYLOAD_VERSION:
+        raise ValueError("unsupported cache payload version")
+    _, expires_at, stored_at = _PAYLOAD_HEADER.unpack_from(payload)
+    return CacheEntry(
+        value=json.loads(payload[_PAYLOAD_HEADER.size:]),
+        expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+        stored_at=datetime.fromtimestamp(stored_at, timezone.utc),
+    )
+
+
+# Bounds for the in-memory backend; both limits are split evenly across shards.
+MEMORY_CACHE_MAX_ENTRIES = 10_000
+MEMORY_CACHE_MAX_BYTES = 32 * 1024 * 1024
+MEMORY_CACHE_SHARDS = 16
+MEMORY_CACHE_SWEEP_INTERVAL_SECONDS = 60.0
+
+
+def _estimate_size(value: Any) -> int:
+    """Cheap, approximate footprint of a cached value in bytes."""
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    return size
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class _CacheShard:
+    __slots__ = ("lock", "entries", "sizes", "bytes")
 
     def __init__(self) -> None:
-        self._data: dict[str, CacheEntry] = {}
-        self._lock = asyncio.Lock()
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.sizes: dict[str, int] = {}
+        self.bytes = 0
+
+    def pop(self, key: str) -> CacheEntry | None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= self.sizes.pop(key, 0)
+        return entry
+
+
+class InMemoryCacheBackend:
+    """A bounded, sharded LRU cache kept in process memory.
+
+    Keys are spread over shards by hash, each with its own lock, LRU order and
+    share of the entry/byte budget. Entries stay around until well past their
+    TTL so callers can fall back to stale values; a background sweeper drops
+    them once that leeway has passed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+        max_bytes: int = MEMORY_CACHE_MAX_BYTES,
+        shards: int = MEMORY_CACHE_SHARDS,
+        sweep_interval: float = MEMORY_CACHE_SWEEP_INTERVAL_SECONDS,
+    ) -> None:
+        shard_count = max(shards, 1)
+        self._shards = [_CacheShard() for _ in range(shard_count)]
+        self._shard_max_entries = max(max_entries // shard_count, 1)
+        self._shard_max_bytes = max(max_bytes // shard_count, 1)
+        self._sweep_interval = sweep_interval
+        self._sweeper: asyncio.Task[None] | None = None
+        self._stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def _shard(self, key: str) -> _CacheShard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _count(self, field: str, amount: int = 1) -> None:
+        if amount:
+            with self._stats_lock:
+                setattr(self._stats, field, getattr(self._stats, field) + amount)
+
+    @staticmethod
+    def _is_expired(entry: CacheEntry, now: datetime) -> bool:
+        return entry.expires_at + timedelta(seconds=entry_ttl_leeway(entry)) < now
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        try:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever())
+        except RuntimeError:  # pragma: no cover - no running loop
+            self._sweeper = None
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            try:
+                self.sweep()
+            except Exception:  # pragma: no cover - keep the sweeper alive
+                logger.exception("Failed to sweep expired cache entries")
+
+    def sweep(self) -> int:
+        """Drop entries that are past their TTL leeway; returns how many were removed."""
+
+        now = datetime.now(timezone.utc)
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [key for key, entry in shard.entries.items() if self._is_expired(entry, now)]
+                for key in expired:
+                    shard.pop(key)
+            removed += len(expired)
+        self._count("expirations", removed)
+        return removed
 
     async def get(self, key: str) -> CacheEntry | None:
-        async with self._lock:
-            entry = self._data.get(key)
-            if entry is None:
-                return None
-            now = datetime.now(timezone.utc)
-            if entry.expires_at + timedelta(seconds=entry_ttl_leeway(entry)) < now:
-                # Entry is far beyond its TTL, remove it entirely.
-                self._data.pop(key, None)
-                return None
-            return entry
+        shard = self._shard(key)
+        expired = False
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                if self._is_expired(entry, datetime.now(timezone.utc)):
+                    # Entry is far beyond its TTL, remove it entirely.
+                    shard.pop(key)
+                    entry = None
+                    expired = True
+                else:
+                    shard.entries.move_to_end(key)
+        if expired:
+            self._count("expirations")
+        self._count("hits" if entry is not None else "misses")
+        return entry
 
     async def set(self, key: str, entry: CacheEntry, ttl: int) -> None:
-        async with self._lock:
-            self._data[key] = entry
+        size = _estimate_size(key) + _estimate_size(entry.value)
+        shard = self._shard(key)
+        evicted = 0
+        with shard.lock:
+            shard.pop(key)
+            shard.entries[key] = entry
+            shard.sizes[key] = size
+            shard.bytes += size
+            while len(shard.entries) > 1 and (
+                len(shard.entries) > self._shard_max_entries or shard.bytes > self._shard_max_bytes
+            ):
+                oldest = next(iter(shard.entries))
+                shard.pop(oldest)
+                evicted += 1
+        self._count("evictions", evicted)
+        self._ensure_sweeper()
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, CacheEntry]:
+        entries: dict[str, CacheEntry] = {}
+        for key in keys:
+            entry = await self.get(key)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+    async def set_many(self, entries: Mapping[str, CacheEntry], ttl: int) -> None:
+        for key, entry in entries.items():
+            await self.set(key, entry, ttl)
 
     async def delete(self, key: str) -> None:
-        async with self._lock:
-            self._data.pop(key, None)
+        shard = self._shard(key)
+        with shard.lock:
+            shard.pop(key)
+
+    def stats(self) -> dict[str, int | float]:
+        entries = sum(len(shard.entries) for shard in self._shards)
+        size = sum(shard.bytes for shard in self._shards)
+        with self._stats_lock:
+            stats = CacheStats(**asdict(self._stats))
+        lookups = stats.hits + stats.misses
+        return {
+            **asdict(stats),
+            "entries": entries,
+            "bytes": size,
+            "hit_ratio": round(stats.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.sizes.clear()
+                shard.bytes = 0
 
-    async def close(self) -> None:  # pragma: no cover - nothing to cleanup
-        async with self._lock:
-            self._data.clear()
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        await self.clear()
 
 
 class RedisCacheBackend:
@@ -91,22 +287,53 @@ class RedisCacheBackend:
             raise ValueError("Redis URL must be provided for redis cache backend")
         self._redis = Redis.from_url(url, decode_responses=False)
 
+    @property
+    def redis(self) -> Any:
+        return self._redis
+
+    async def _decode(self, key: str, payload: bytes) -> CacheEntry | None:
+        try:
+            return decode_entry(payload)
+        except Exception:
+            # Corrupted or written by an older release (pickle); treat as a miss.
+            logger.warning("Discarding undecodable cache entry for key %s", key)
+            await self._redis.delete(key)
+            return None
+
+    @staticmethod
+    def _expiry(ttl: int) -> int:
+        # Keep entries past their TTL so stale values can still be served.
+        return max(ttl * 3, ttl + 300)
+
     async def get(self, key: str) -> CacheEntry | None:
         payload = await self._redis.get(key)
         if payload is None:
             return None
-        try:
-            entry: CacheEntry = pickle.loads(payload)
-        except Exception:  # pragma: no cover - corrupted payload
-            logger.exception("Failed to deserialize cache entry for key %s", key)
-            await self._redis.delete(key)
-            return None
-        return entry
+        return await self._decode(key, payload)
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, CacheEntry]:
+        if not keys:
+            return {}
+        payloads = await self._redis.mget(list(keys))
+        entries: dict[str, CacheEntry] = {}
+        for key, payload in zip(keys, payloads):
+            if payload is None:
+                continue
+            entry = await self._decode(key, payload)
+            if entry is not None:
+                entries[key] = entry
+        return entries
 
     async def set(self, key: str, entry: CacheEntry, ttl: int) -> None:
-        payload = pickle.dumps(entry)
-        ttl_with_slack = max(ttl * 3, ttl + 300)
-        await self._redis.set(key, payload, ex=ttl_with_slack)
+        await self._redis.set(key, encode_entry(entry), ex=self._expiry(ttl))
+
+    async def set_many(self, entries: Mapping[str, CacheEntry], ttl: int) -> None:
+        if not entries:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, entry in entries.items():
+                pipe.set(key, encode_entry(entry), ex=self._expiry(ttl))
+            await pipe.execute()
 
     async def delete(self, key: str) -> None:
         await self._redis.delete(key)
@@ -115,6 +342,128 @@ class RedisCacheBackend:
         await self._redis.close()
 
 
+# The in-process tier only short-circuits Redis for a little while; pub/sub
+# invalidations are best effort, so this also bounds staleness after a lost one.
+L1_MAX_ENTRIES = 2_000
+L1_TTL_SECONDS = 30
+INVALIDATION_CHANNEL = "telegram-cache:invalidate"
+_INVALIDATION_RETRY_SECONDS = 5.0
+
+
+class TieredCacheBackend:
+    """In-process L1 in front of a shared Redis L2.
+
+    Writes and deletes go to Redis first, then publish the key on
+    ``INVALIDATION_CHANNEL`` so every worker drops its L1 copy.
+    """
+
+    def __init__(self, l2: RedisCacheBackend, *, l1: InMemoryCacheBackend | None = None) -> None:
+        self._l2 = l2
+        self._l1 = l1 or InMemoryCacheBackend(max_entries=L1_MAX_ENTRIES)
+        self._origin = uuid.uuid4().hex
+        self._listener: asyncio.Task[None] | None = None
+
+    @property
+    def l1(self) -> InMemoryCacheBackend:
+        return self._l1
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._l2.redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything published while we were not subscribed is lost.
+                await self._l1.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    origin, _, key = message["data"].decode().partition(" ")
+                    if origin != self._origin:
+                        await self._l1.delete(key)
+                        metrics.increment("telegram_cache", "l1_remote_invalidations")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Cache invalidation listener disconnected: %s", exc)
+                await asyncio.sleep(_INVALIDATION_RETRY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:  # pragma: no cover - best effort cleanup
+                    pass
+
+    async def _publish(self, key: str) -> None:
+        try:
+            await self._l2.redis.publish(INVALIDATION_CHANNEL, f"{self._origin} {key}")
+        except Exception as exc:
+            logger.warning("Failed to publish cache invalidation for %s: %s", key, exc)
+
+    async def get(self, key: str) -> CacheEntry | None:
+        self._ensure_listener()
+        now = datetime.now(timezone.utc)
+        cached = await self._l1.get(key)
+        if cached is not None and cached.is_valid(now=now):
+            return cached.value
+        entry = await self._l2.get(key)
+        if entry is not None:
+            await self._store_l1(key, entry, now)
+        return entry
+
+    async def _store_l1(self, key: str, entry: CacheEntry, now: datetime) -> None:
+        ttl = min(L1_TTL_SECONDS, max(int((entry.expires_at - now).total_seconds()), 0))
+        if ttl <= 0:
+            return
+        wrapper = CacheEntry(value=entry, expires_at=now + timedelta(seconds=ttl), stored_at=now)
+        await self._l1.set(key, wrapper, ttl)
+
+    async def set(self, key: str, entry: CacheEntry, ttl: int) -> None:
+        self._ensure_listener()
+        await self._l2.set(key, entry, ttl)
+        await self._store_l1(key, entry, datetime.now(timezone.utc))
+        await self._publish(key)
+
+    async def get_many(self, keys: Sequence[str]) -> dict[str, CacheEntry]:
+        self._ensure_listener()
+        now = datetime.now(timezone.utc)
+        entries: dict[str, CacheEntry] = {}
+        for key, cached in (await self._l1.get_many(keys)).items():
+            if cached.is_valid(now=now):
+                entries[key] = cached.value
+        missing = [key for key in keys if key not in entries]
+        for key, entry in (await self._l2.get_many(missing)).items():
+            entries[key] = entry
+            await self._store_l1(key, entry, now)
+        return entries
+
+    async def set_many(self, entries: Mapping[str, CacheEntry], ttl: int) -> None:
+        self._ensure_listener()
+        await self._l2.set_many(entries, ttl)
+        now = datetime.now(timezone.utc)
+        for key, entry in entries.items():
+            await self._store_l1(key, entry, now)
+            await self._publish(key)
+
+    async def delete(self, key: str) -> None:
+        self._ensure_listener()
+        await self._l1.delete(key)
+        await self._l2.delete(key)
+        await self._publish(key)
+
+    def stats(self) -> dict[str, int | float]:
+        return {f"l1_{name}": value for name, value in self._l1.stats().items()}
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self._l1.close()
+        await self._l2.close()
+
+
 def entry_ttl_leeway(entry: CacheEntry) -> int:
     """Provide additional time-to-live slack for cache eviction checks."""
 
@@ -132,6 +481,8 @@ class TelegramCacheManager:
 
     async def _ensure_backend(self) -> tuple[CacheBackend, config_registry.TelegramCacheConfig]:
         config = await config_registry.get_telegram_cache_config()
+        if self._backend is not None and self._config == config:
+            return self._backend, config
         async with self._lock:
             if self._backend is not None and self._config == config:
                 return self._backend, config
@@ -151,7 +502,7 @@ class TelegramCacheManager:
         backend_name = config.backend
         if backend_name == "redis":
             try:
-                return RedisCacheBackend(config.redis_url or "")
+                return TieredCacheBackend(RedisCacheBackend(config.redis_url or ""))
             except Exception as exc:
                 logger.warning(
                     "Falling back to in-memory cache backend because Redis backend failed: %s",
@@ -176,15 +527,196 @@ class TelegramCacheManager:
 telegram_cache_manager = TelegramCacheManager()
 
 
+def _cache_stats() -> dict[str, Any]:
+    backend = telegram_cache_manager._backend
+    if isinstance(backend, InMemoryCacheBackend):
+        return {"backend": "memory", **backend.stats()}
+    if isinstance(backend, TieredCacheBackend):
+        return {"backend": "redis", **backend.stats()}
+    return {"backend": None}
+
+
+metrics.register_provider("telegram_cache", _cache_stats)
+
+
+def _build_lookup_key(namespace: str, key: object) -> str:
+    return f"lookup:{namespace}:{key}"
+
+
+def _to_cacheable(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (list, tuple)):
+        return [_to_cacheable(item) for item in value]
+    return value
+
+
+async def cached_value(
+    namespace: str,
+    key: object,
+    loader: Callable[[], Awaitable[Any]],
+    *,
+    ttl_seconds: int | None = None,
+    decode: Callable[[Any], Any] | None = None,
+) -> Any:
+    """Return ``loader()``'s result through the shared cache.
+
+    Dataclasses are cached as plain dicts; pass ``decode`` to rebuild them
+    from the cached form. Call :func:`invalidate_value` after changing the
+    underlying data so every worker drops its copy.
+    """
+
+    backend, config = await telegram_cache_manager.get_backend()
+    cache_key = _build_lookup_key(namespace, key)
+    now = datetime.now(timezone.utc)
+    entry = await backend.get(cache_key)
+    if entry is not None and entry.is_valid(now=now):
+        return decode(entry.value) if decode else entry.value
+
+    value = await loader()
+    await _store_value(backend, cache_key, value, ttl_seconds or config.ttl_seconds, now)
+    return value
+
+
+async def _store_value(
+    backend: CacheBackend, cache_key: str, value: Any, ttl: int, now: datetime
+) -> None:
+    entry = CacheEntry(
+        value=_to_cacheable(value),
+        expires_at=now + timedelta(seconds=ttl),
+        stored_at=now,
+    )
+    await backend.set(cache_key, entry, ttl)
+
+
+async def store_value(
+    namespace: str, key: object, value: Any, *, ttl_seconds: int | None = None
+) -> None:
+    """Write ``value`` through to the cache used by :func:`cached_value`."""
+
+    backend, config = await telegram_cache_manager.get_backend()
+    await _store_value(
+        backend,
+        _build_lookup_key(namespace, key),
+        value,
+        ttl_seconds or config.ttl_seconds,
+        datetime.now(timezone.utc),
+    )
+
+
+async def invalidate_value(namespace: str, key: object) -> None:
+    backend, _ = await telegram_cache_manager.get_backend()
+    await backend.delete(_build_lookup_key(namespace, key))
+
+
 def _build_admin_cache_key(chat_id: int) -> str:
     return f"telegram:chat:{chat_id}:admins"
 
 
+# Failed refreshes keep serving the stale list and retry after an exponential backoff.
+ADMIN_REFRESH_BACKOFF_SECONDS = 15
+ADMIN_REFRESH_MAX_BACKOFF_SECONDS = 600
+
+_admin_refreshes: dict[int, asyncio.Task[list[int] | None]] = {}
+_admin_refresh_failures: dict[int, int] = {}
+# Chats whose admin set changed while a full refresh was in flight.
+_admin_changed_during_refresh: set[int] = set()
+
+
+async def _refresh_admin_ids(
+    bot: Bot,
+    chat_id: int,
+    backend: CacheBackend,
+    ttl_seconds: int,
+    stale: CacheEntry | None,
+) -> list[int] | None:
+    key = _build_admin_cache_key(chat_id)
+    try:
+        admins = await bot.get_chat_administrators(chat_id)
+    except TelegramError as exc:
+        metrics.increment("telegram_cache", "admin_refresh_errors")
+        if chat_id in _admin_changed_during_refresh:
+            # A chat_member update invalidated ``stale``; never write it back.
+            _admin_changed_during_refresh.discard(chat_id)
+            logger.warning("Failed to fetch administrators for chat %s: %s", chat_id, exc)
+            return None
+        if stale is None:
+            logger.warning("Failed to fetch administrators for chat %s: %s", chat_id, exc)
+            return None
+        failures = _admin_refresh_failures.get(chat_id, 0) + 1
+        _admin_refresh_failures[chat_id] = failures
+        backoff = min(
+            ADMIN_REFRESH_BACKOFF_SECONDS * 2 ** (failures - 1),
+            ADMIN_REFRESH_MAX_BACKOFF_SECONDS,
+        )
+        logger.debug(
+            "Using stale cached admin list for chat %s for %ss due to Telegram error: %s",
+            chat_id,
+            backoff,
+            exc,
+        )
+        now = datetime.now(timezone.utc)
+        extended = CacheEntry(
+            value=stale.value,
+            expires_at=now + timedelta(seconds=backoff),
+            stored_at=stale.stored_at,
+        )
+        await backend.set(key, extended, backoff)
+        return list(stale.value)
+
+    _admin_refresh_failures.pop(chat_id, None)
+    admin_ids = [member.user.id for member in admins if member.user]
+    if chat_id in _admin_changed_during_refresh:
+        # The list may predate a chat_member update; let the next lookup refetch.
+        _admin_changed_during_refresh.discard(chat_id)
+        return admin_ids
+    now = datetime.now(timezone.utc)
+    new_entry = CacheEntry(
+        value=admin_ids,
+        expires_at=now + timedelta(seconds=ttl_seconds),
+        stored_at=now,
+    )
+    await backend.set(key, new_entry, ttl_seconds)
+    metrics.increment("telegram_cache", "admin_refreshes")
+    return admin_ids
+
+
+def _start_admin_refresh(
+    bot: Bot,
+    chat_id: int,
+    backend: CacheBackend,
+    ttl_seconds: int,
+    stale: CacheEntry | None,
+) -> asyncio.Task[list[int] | None]:
+    """Return the in-flight refresh for ``chat_id``, starting one if needed."""
+
+    task = _admin_refreshes.get(chat_id)
+    if task is not None and not task.done():
+        return task
+    task = asyncio.create_task(_refresh_admin_ids(bot, chat_id, backend, ttl_seconds, stale))
+    _admin_refreshes[chat_id] = task
+
+    def _forget(done: asyncio.Task[list[int] | None]) -> None:
+        if _admin_refreshes.get(chat_id) is done:
+            del _admin_refreshes[chat_id]
+        if not done.cancelled() and done.exception() is not None:
+            logger.warning(
+                "Refreshing administrators for chat %s failed: %s", chat_id, done.exception()
+            )
+
+    task.add_done_callback(_forget)
+    return task
+
+
 async def get_cached_admin_ids(
     context: ContextTypes.DEFAULT_TYPE,
     chat_id: int,
 ) -> list[int] | None:
-    """Return administrator IDs using the configured cache backend."""
+    """Return administrator IDs using the configured cache backend.
+
+    Expired entries are served as-is while a single background refresh per
+    chat runs; callers without any cached entry share one in-flight request.
+    """
 
     bot: Bot | None = context.bot
     if bot is None:
@@ -192,39 +724,50 @@ async def get_cached_admin_ids(
         return None
 
     backend, config = await telegram_cache_manager.get_backend()
+    ttl_seconds = max(config.ttl_seconds, 30)
 
-    key = _build_admin_cache_key(chat_id)
-    entry = await backend.get(key)
-    now = datetime.now(timezone.utc)
+    entry = await backend.get(_build_admin_cache_key(chat_id))
+    if entry and entry.is_valid(now=datetime.now(timezone.utc)):
+        return list(entry.value)
 
-    if entry and entry.is_valid(now=now):
+    task = _start_admin_refresh(bot, chat_id, backend, ttl_seconds, entry)
+    if entry:
+        metrics.increment("telegram_cache", "admin_stale_served")
         return list(entry.value)
 
+    # Shielded so one cancelled caller does not abort the request others wait on.
     try:
-        admins = await bot.get_chat_administrators(chat_id)
-    except TelegramError as exc:
-        if entry:
-            logger.debug(
-                "Using stale cached admin list for chat %s due to Telegram error: %s",
-                chat_id,
-                exc,
-            )
-            return list(entry.value)
-        logger.warning("Failed to fetch administrators for chat %s: %s", chat_id, exc)
+        admin_ids = await asyncio.shield(task)
+    except Exception:
         return None
+    return list(admin_ids) if admin_ids is not None else None
 
-    admin_ids = [member.user.id for member in admins if member.user]
 
-    ttl_seconds = max(config.ttl_seconds, 30)
-    expires_at = now + timedelta(seconds=ttl_seconds)
-    new_entry = CacheEntry(value=admin_ids, expires_at=expires_at, stored_at=now)
-    await backend.set(key, new_entry, ttl_seconds)
+async def apply_admin_change(chat_id: int, user_id: int, *, is_admin: bool) -> None:
+    """Patch the cached administrator set after a promote/demote/leave update."""
 
-    return admin_ids
+    backend, _ = await telegram_cache_manager.get_backend()
+    key = _build_admin_cache_key(chat_id)
+    if chat_id in _admin_refreshes:
+        _admin_changed_during_refresh.add(chat_id)
+        await backend.delete(key)
+        return
+
+    entry = await backend.get(key)
+    if entry is None:
+        return
+    admin_ids = [admin_id for admin_id in entry.value if admin_id != user_id]
+    if is_admin:
+        admin_ids.append(user_id)
+    ttl = max(int((entry.expires_at - datetime.now(timezone.utc)).total_seconds()), 1)
+    patched = CacheEntry(value=admin_ids, expires_at=entry.expires_at, stored_at=entry.stored_at)
+    await backend.set(key, patched, ttl)
+    metrics.increment("telegram_cache", "admin_incremental_updates")
 
 
 async def invalidate_chat_admins(chat_id: int) -> None:
     """Invalidate cached administrator IDs for the specified chat."""
 
+    _admin_refresh_failures.pop(chat_id, None)
     backend, _ = await telegram_cache_manager.get_backend()
     await backend.delete(_build_admin_cache_key(chat_id))
@@ -0,0 +1,116 @@
+"""Deliver images to Telegram by public storage URL with an upload fallback.
+
+When the active storage backend exposes objects under a public base URL,
+Telegram can fetch the file itself, so the bot neither downloads the bytes
+nor re-uploads them. Every send is counted per delivery mode in the
+``telegram_delivery`` metrics group.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Awaitable, Callable
+from urllib.parse import urlparse
+
+from telegram import Message
+from telegram.error import BadRequest
+
+from registries import config_registry
+from services import metrics
+from services.storage_service import use as use_storage
+
+logger = logging.getLogger(__name__)
+
+METRICS_GROUP = "telegram_delivery"
+MODE_FILE_ID = "file_id"
+MODE_URL = "url"
+MODE_UPLOAD = "upload"
+
+CONFIG_KEY = "storage_send_by_url"
+
+# sendDocument only accepts URLs for a few file types. Extensions Telegram
+# refused as documents skip straight to uploading for the process lifetime;
+# photo rejections are usually per file (size limits) and are not remembered.
+_rejected: set[tuple[str, str]] = set()
+
+
+def record(kind: str, mode: str) -> None:
+    metrics.increment(METRICS_GROUP, f"{kind}_{mode}")
+
+
+def _is_public(link: str) -> bool:
+    parsed = urlparse(link)
+    if parsed.scheme not in {"http", "https"} or not parsed.hostname:
+        return False
+    # Pixiv's CDN rejects requests without its Referer header, Telegram cannot fetch it.
+    host = parsed.hostname
+    return host != "pximg.net" and not host.endswith(".pximg.net")
+
+
+def _extension(link: str) -> str:
+    return os.path.splitext(urlparse(link).path)[1].lower()
+
+
+async def delivery_url(link: str | None, *, kind: str) -> str | None:
+    """Return ``link`` if Telegram should be asked to fetch it directly."""
+
+    if not link:
+        return None
+    value = await config_registry.get_config(CONFIG_KEY)
+    if value is not None and str(value).strip().lower() in {"false", "0", "no", "off"}:
+        return None
+    link = await _readable_url(link)
+    if not _is_public(link) or (kind, _extension(link)) in _rejected:
+        return None
+    return link
+
+
+async def _readable_url(link: str) -> str:
+    """Map a stored object URL to one Telegram can fetch, e.g. a presigned S3 URL."""
+
+    try:
+        storage = await use_storage()
+        if storage is None:
+            return link
+        await storage.ensure_ready()
+        if storage.object_key(link) is None:
+            return link
+        return storage.read_url(link)
+    except Exception as exc:
+        logger.debug("Could not resolve a readable URL for %s: %s", link, exc)
+        return link
+
+
+async def send_via_url(
+    send: Callable[[str], Awaitable[Message]],
+    url: str,
+    *,
+    kind: str,
+) -> Message | None:
+    """Try ``send(url)``; return ``None`` so the caller falls back to uploading.
+
+    Only ``BadRequest`` means Telegram refused the URL. Timeouts and network
+    errors propagate unchanged and are not remembered as rejections.
+    """
+
+    try:
+        message = await send(url)
+    except BadRequest as exc:
+        logger.warning("Telegram rejected %s URL %s, falling back to upload: %s", kind, url, exc)
+        metrics.increment(METRICS_GROUP, f"{kind}_url_rejected")
+        if kind == "document":
+            _rejected.add((kind, _extension(url)))
+        return None
+    record(kind, MODE_URL)
+    return message
+
+
+__all__ = [
+    "MODE_FILE_ID",
+    "MODE_UPLOAD",
+    "MODE_URL",
+    "delivery_url",
+    "record",
+    "send_via_url",
+]
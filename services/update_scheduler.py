@@ -0,0 +1,143 @@
+"""Telegram update processor that keeps each chat in order and runs chats in parallel."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+METRICS_GROUP = "update_scheduler"
+# Wait-time percentiles are computed over this many recent updates.
+WAIT_WINDOW = 1024
+
+
+@dataclass(slots=True)
+class _ChatQueue:
+    pending: deque[tuple[Awaitable[Any], asyncio.Future[None], float]] = field(default_factory=deque)
+    runner: asyncio.Task[None] | None = None
+
+
+def _ordering_key(update: object) -> Hashable | None:
+    """Updates sharing a key run one at a time in arrival order; ``None`` runs unordered."""
+
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat is not None:
+        return ("chat", update.effective_chat.id)
+    if update.effective_user is not None:
+        # Inline queries and similar updates have no chat; keep each user in order.
+        return ("user", update.effective_user.id)
+    return None
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Process updates of one chat strictly in order and different chats concurrently.
+
+    Each chat gets a FIFO queue drained by its own task. At most ``workers``
+    updates execute at once across all chats; the slot is released between
+    updates so one busy chat cannot starve the others. Queues are dropped as
+    soon as they run empty. ``max_pending`` bounds the updates admitted
+    (queued or running) before the fetcher waits.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        super().__init__(max(max_pending, workers))
+        self._workers = workers
+        self._slots = asyncio.Semaphore(workers)
+        self._running = 0
+        self._chats: dict[Hashable, _ChatQueue] = {}
+        self._waits: deque[float] = deque(maxlen=WAIT_WINDOW)
+
+    async def initialize(self) -> None:
+        metrics.register_provider(METRICS_GROUP, self.stats)
+
+    async def shutdown(self) -> None:
+        chats, self._chats = self._chats, {}
+        for chat in chats.values():
+            if chat.runner is not None:
+                chat.runner.cancel()
+            for coroutine, future, _ in chat.pending:
+                if asyncio.iscoroutine(coroutine):
+                    coroutine.close()
+                future.cancel()
+            chat.pending.clear()
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = _ordering_key(update)
+        if key is None:
+            await self._run(coroutine, time.monotonic())
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        chat = self._chats.get(key)
+        if chat is None:
+            chat = self._chats[key] = _ChatQueue()
+        chat.pending.append((coroutine, future, time.monotonic()))
+        if chat.runner is None:
+            chat.runner = asyncio.create_task(self._drain(key, chat), name=f"updates-{key[0]}-{key[1]}")
+        # Holding the admission slot until the update ran is what applies backpressure.
+        await future
+
+    async def _drain(self, key: Hashable, chat: _ChatQueue) -> None:
+        try:
+            while chat.pending:
+                coroutine, future, enqueued_at = chat.pending.popleft()
+                try:
+                    await self._run(coroutine, enqueued_at)
+                except asyncio.CancelledError:
+                    if asyncio.iscoroutine(coroutine):
+                        coroutine.close()
+                    future.cancel()
+                    raise
+                except Exception as exc:
+                    # The submitter may have been cancelled while the update waited.
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(None)
+        finally:
+            chat.runner = None
+            if not chat.pending and self._chats.get(key) is chat:
+                del self._chats[key]
+
+    async def _run(self, coroutine: Awaitable[Any], enqueued_at: float) -> None:
+        async with self._slots:
+            self._waits.append(time.monotonic() - enqueued_at)
+            self._running += 1
+            try:
+                await coroutine
+            finally:
+                self._running -= 1
+                metrics.increment(METRICS_GROUP, "processed")
+
+    def stats(self) -> dict[str, Any]:
+        depths = [len(chat.pending) for chat in self._chats.values()]
+        values: dict[str, Any] = {
+            "workers": self._workers,
+            "running": self._running,
+            "active_chats": len(depths),
+            "queued": sum(depths),
+            "max_chat_depth": max(depths, default=0),
+        }
+        waits = sorted(self._waits)
+        if waits:
+            values["wait_p50_ms"] = round(waits[len(waits) // 2] * 1000, 2)
+            values["wait_p95_ms"] = round(waits[int(len(waits) * 0.95)] * 1000, 2)
+        return values
+
+
+__all__ = ["ChatOrderedUpdateProcessor"]